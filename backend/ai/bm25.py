@@ -0,0 +1,97 @@
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Words that appear in every rep document or question and carry no ranking signal
+STOP_WORDS = frozenset(
+    "a an and are as at be by deal deals for from has have how in is it me of on or rep reps sales "
+    "the their to was what which who with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.casefold()) if token not in STOP_WORDS]
+
+
+def _as_numpy(values: array) -> np.ndarray:
+    return np.frombuffer(values, dtype=np.int64) if values else np.zeros(0, dtype=np.int64)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of texts, with an inverted index of NumPy postings so a
+    search only touches the documents containing the query terms.
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the inverted index
+
+        Args:
+            texts: Texts to index; search results refer to their positions
+            k1: Term frequency saturation
+            b: Length normalization strength
+        """
+        self.size = len(texts)
+        # Flat (term, position, count) triples instead of per-term lists of tuples, so building
+        # the index doesn't leave a worker holding millions of small objects
+        self._terms: Dict[str, int] = {}
+        term_ids = array("q")
+        text_positions = array("q")
+        counts = array("q")
+        lengths = np.zeros(self.size, dtype=np.float64)
+        for position, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[position] = len(tokens)
+            for term, count in Counter(tokens).items():
+                term_ids.append(self._terms.setdefault(term, len(self._terms)))
+                text_positions.append(position)
+                counts.append(count)
+
+        average_length = lengths.mean() if self.size and lengths.mean() > 0 else 1.0
+        length_norm = k1 * (1 - b + b * lengths / average_length)
+
+        # Postings sorted by term (stable, so positions stay ascending within a term); term i owns
+        # the slice offsets[i]:offsets[i + 1]
+        term_ids = _as_numpy(term_ids)
+        order = np.argsort(term_ids, kind="stable")
+        document_frequency = np.bincount(term_ids, minlength=len(self._terms))
+        self._offsets = np.concatenate(([0], np.cumsum(document_frequency)))
+        self._positions = _as_numpy(text_positions)[order]
+        tf = _as_numpy(counts)[order].astype(np.float64)
+
+        # Precompute each posting's BM25 weight so a search is a sum over postings
+        idf = np.log(1 + (self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+        self._weights = idf[term_ids[order]] * tf * (k1 + 1) / (tf + length_norm[self._positions])
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """
+        Rank the indexed texts against a query
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            List[Tuple[int, float]]: (position, score) of the best matches, best first
+        """
+        slices = [
+            slice(self._offsets[term], self._offsets[term + 1])
+            for term in (self._terms.get(token) for token in set(tokenize(query)))
+            if term is not None
+        ]
+        if not slices or k <= 0:
+            return []
+
+        positions, inverse = np.unique(np.concatenate([self._positions[s] for s in slices]), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate([self._weights[s] for s in slices]))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(positions[i]), float(scores[i])) for i in top]
@@ -0,0 +1,157 @@
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from cachetools import LRUCache, TTLCache
+from langchain_core.embeddings import Embeddings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for exact matching: case, surrounding punctuation and whitespace."""
+    return _WHITESPACE.sub(" ", question.casefold()).strip(" ?!.")
+
+
+class AnswerCache:
+    """
+    Two-tier cache of AI answers, both tiers with LRU and TTL eviction.
+
+    - The exact tier is keyed on the normalized question and the rep context.
+    - The semantic tier embeds the question with the service's embedding model and reuses
+      an answer for the same rep context whose question vector is at least `threshold`
+      cosine-similar.
+
+    Entries are also keyed on the data snapshot version, and the cache is cleared whenever
+    the snapshot changes, so an answer is never served for data it was not computed from.
+
+    Lookups run on the event loop while the refresh clears the cache from a worker thread,
+    so the tiers are only touched under a lock, which is never held while embedding.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_entries: int,
+        ttl: float,
+        semantic_threshold: float,
+        semantic_enabled: bool = True,
+    ):
+        self.embeddings = embeddings
+        self.semantic_threshold = semantic_threshold
+        self.semantic_enabled = semantic_enabled
+        self._exact: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._semantic: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl)
+        # A missed question is embedded once for the lookup and reused when its answer is stored
+        self._question_vectors: LRUCache = LRUCache(maxsize=max_entries)
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(question: str, rep_context_id: Optional[int], version: str) -> Tuple[str, Optional[int], str]:
+        return normalize_question(question), rep_context_id, version
+
+    async def _embed(self, question: str) -> np.ndarray:
+        with self._lock:
+            vector = self._question_vectors.get(question)
+        if vector is None:
+            vector = self._remember(question, await self.embeddings.aembed_query(question))
+        return vector
+
+    def _remember(self, question: str, vector: List[float]) -> np.ndarray:
+        vector = np.asarray(vector)
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else vector
+        with self._lock:
+            self._question_vectors[question] = vector
+        return vector
+
+    def add_question_vectors(self, vectors: Dict[str, List[float]]) -> None:
+        """
+        Provide the embeddings of questions about to be looked up, e.g. computed in one
+        batch, so the lookups do not embed them one by one
+
+        Args:
+            vectors: Embedding of each normalized question (see normalize_question), by
+                normalized question
+        """
+        for question, vector in vectors.items():
+            self._remember(question, vector)
+
+    async def get(self, question: str, rep_context_id: Optional[int], version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer, first exactly and then semantically
+
+        Args:
+            question: Question as asked
+            rep_context_id: Sales rep the question was asked about, if any
+            version: Version of the data snapshot the answer must come from
+
+        Returns:
+            Optional[Dict]: Cached result, or None on a miss
+        """
+        key = self._key(question, rep_context_id, version)
+        with self._lock:
+            result = self._exact.get(key)
+            if result is not None:
+                self.exact_hits += 1
+                return result
+            search_semantic = self.semantic_enabled and bool(self._semantic)
+
+        if search_semantic:
+            vector = await self._embed(key[0])
+            with self._lock:
+                candidates = [
+                    (entry_vector, entry_result)
+                    for (_, entry_rep, entry_version), (entry_vector, entry_result) in list(self._semantic.items())
+                    if entry_rep == rep_context_id and entry_version == version
+                ]
+            if candidates:
+                similarities = np.stack([entry_vector for entry_vector, _ in candidates]) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.semantic_threshold:
+                    with self._lock:
+                        self.semantic_hits += 1
+                    return candidates[best][1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, question: str, rep_context_id: Optional[int], version: str, result: Dict[str, Any]) -> None:
+        """
+        Store an answer in both tiers
+
+        Args:
+            question: Question as asked
+            rep_context_id: Sales rep the question was asked about, if any
+            version: Version of the data snapshot the answer was computed from
+            result: Result to cache
+        """
+        key = self._key(question, rep_context_id, version)
+        with self._lock:
+            self._exact[key] = result
+        if self.semantic_enabled:
+            vector = await self._embed(key[0])
+            with self._lock:
+                self._semantic[key] = (vector, result)
+
+    def clear(self) -> None:
+        """Drop every cached answer, e.g. after the data snapshot changed."""
+        with self._lock:
+            self._exact.clear()
+            self._semantic.clear()
+            self._question_vectors.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "exact_entries": len(self._exact),
+                "semantic_entries": len(self._semantic),
+            }
@@ -0,0 +1,48 @@
+import time
+from typing import Any, Dict, List
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from backend.metrics.timing import record_stage
+
+
+class StageTimer(BaseCallbackHandler):
+    """
+    Records every LLM call, from its start to its last token, as the "llm" stage of the
+    request making it, and every agent tool call as its "agent_tool" stage. Attach with
+    `runnable.with_config(callbacks=[StageTimer()])`.
+    """
+
+    # Called in the caller's task instead of a worker thread, so the stage is recorded
+    # for the right request
+    run_inline = True
+
+    def __init__(self):
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finished("llm", run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finished("llm", run_id)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finished("agent_tool", run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finished("agent_tool", run_id)
+
+    def _finished(self, name: str, run_id: UUID) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            record_stage(name, time.perf_counter() - started)
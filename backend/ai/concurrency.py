@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from backend.metrics.timing import stage
+
+
+class AIServiceOverloaded(Exception):
+    """Raised when an AI request cannot get an LLM slot: the wait queue is full or the wait timed out."""
+
+    def __init__(self, message: str, queue_full: bool):
+        super().__init__(message)
+        self.queue_full = queue_full
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of concurrent LLM calls, with a bounded queue of waiting requests.
+
+    Requests beyond `max_concurrent` wait for a slot; once `max_queued` requests are already
+    waiting, new ones are rejected immediately so callers get backpressure instead of an
+    ever-growing backlog.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot. Must be paired with release().
+
+        Raises:
+            AIServiceOverloaded: If the queue is full or no slot freed up within queue_timeout
+        """
+        if self._active + self._waiting >= self.max_concurrent + self.max_queued:
+            raise AIServiceOverloaded("Too many AI requests are waiting", queue_full=True)
+
+        self._waiting += 1
+        try:
+            with stage("llm_queue"):
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise AIServiceOverloaded("Timed out waiting for an AI slot", queue_full=False)
+        finally:
+            self._waiting -= 1
+        self._active += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,145 @@
+import asyncio
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from sklearn.feature_extraction.text import HashingVectorizer
+
+EMBEDDING_BACKENDS = ("huggingface", "hashing")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Lexical embeddings from hashed word and word-bigram counts, L2-normalized.
+
+    Needs no model download or fitting, starts in milliseconds and produces the same
+    vector for the same text in every process, so the persistent index stays valid.
+    Similarity is purely lexical: good for names, clients, regions and statuses,
+    weaker than a sentence model on paraphrases.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+        self._vectorizer = HashingVectorizer(
+            n_features=dimensions,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm="l2",
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._vectorizer.transform(texts).toarray().astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def create_embeddings(backend: str, model_name: str, dimensions: int) -> Tuple[Embeddings, str]:
+    """
+    Create the configured embedding backend
+
+    Args:
+        backend: One of EMBEDDING_BACKENDS
+        model_name: Sentence-transformers model for the huggingface backend
+        dimensions: Vector size for the hashing backend
+
+    Returns:
+        Tuple[Embeddings, str]: The embeddings and a name identifying the vector space,
+            used to keep the indexes of different backends apart
+    """
+    if backend == "huggingface":
+        # Imported here so the lightweight backends never load torch
+        from langchain_huggingface import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=model_name), model_name
+    if backend == "hashing":
+        return HashingEmbeddings(dimensions), f"hashing-{dimensions}"
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    Wraps an embedding model so that concurrent async query embeddings are coalesced.
+
+    `aembed_query` calls are collected for up to `max_wait_ms`, or until `max_batch_size`
+    queries are pending, and then embedded with a single batched forward pass in
+    `executor`. Each caller gets its own vector back. Document embedding and the sync
+    `embed_query` go straight to the wrapped model.
+
+    The batch is embedded with `embed_documents`, which matches `embed_query` for
+    symmetric models such as all-MiniLM-L6-v2.
+    """
+
+    def __init__(
+        self,
+        base: Embeddings,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[Executor] = None,
+    ):
+        self.base = base
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_sizes: Counter = Counter()
+        # The loop only keeps weak references to tasks; a batch in flight must not be collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.base.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._embed_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        self._batch_sizes[len(batch)] += 1
+        try:
+            vectors = await loop.run_in_executor(self.executor, self.base.embed_documents, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get batching statistics
+
+        Returns:
+            Dict: Number of batches and queries, and a histogram of batch sizes
+        """
+        return {
+            "batches": sum(self._batch_sizes.values()),
+            "queries": sum(size * count for size, count in self._batch_sizes.items()),
+            "batch_size_histogram": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+        }
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+from typing import List, Sequence
+
+from chromadb import Collection
+from pydantic import BaseModel
+from langchain_core.documents import Document
+from langchain_chroma import Chroma
+
+logger = logging.getLogger(__name__)
+
+# Chroma rejects upserts above its max batch size, so large syncs are split.
+UPSERT_BATCH_SIZE = 1000
+
+
+class IndexSyncResult(BaseModel):
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def document_content_hash(document: Document) -> str:
+    """Hash the content and metadata of a document so changes can be detected without re-embedding."""
+    payload = json.dumps(
+        {"content": document.page_content, "metadata": document.metadata},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sync_vector_store(vector_store: Chroma, documents: List[Document]) -> IndexSyncResult:
+    """
+    Bring a persistent vector store in line with the given documents.
+
+    Every document must carry a stable `id`. Only documents whose content hash differs from
+    the stored one are (re-)embedded, and stored ids that are no longer present are deleted,
+    so a restart on unchanged data costs a metadata read instead of a full re-embedding.
+    """
+    stored = vector_store.get(include=["metadatas"])
+    stored_hashes = {
+        doc_id: (metadata or {}).get("content_hash")
+        for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+    }
+
+    result = IndexSyncResult()
+    to_upsert = []
+    for document in documents:
+        content_hash = document_content_hash(document)
+        stored_hash = stored_hashes.get(document.id)
+        if stored_hash == content_hash:
+            result.unchanged += 1
+            continue
+
+        if stored_hash is None:
+            result.added += 1
+        else:
+            result.updated += 1
+        to_upsert.append(Document(
+            id=document.id,
+            page_content=document.page_content,
+            metadata={**document.metadata, "content_hash": content_hash},
+        ))
+
+    stale_ids = stored_hashes.keys() - {document.id for document in documents}
+    if stale_ids:
+        vector_store.delete(ids=list(stale_ids))
+        result.removed = len(stale_ids)
+
+    for start in range(0, len(to_upsert), UPSERT_BATCH_SIZE):
+        batch = to_upsert[start:start + UPSERT_BATCH_SIZE]
+        vector_store.add_documents(batch, ids=[document.id for document in batch])
+
+    logger.info("Vector index synced: %s", result.model_dump())
+    return result
+
+
+def copy_unchanged_vectors(target: Collection, sources: Sequence[Collection], documents: List[Document]) -> int:
+    """
+    Copy the stored vectors of documents whose content hash is unchanged from other
+    collections of the same embedding space into `target`, so that syncing it afterwards
+    only embeds new or changed documents.
+
+    Returns:
+        int: Number of documents copied
+    """
+    stored = target.get(include=["metadatas"])
+    present = {
+        doc_id: (metadata or {}).get("content_hash") for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+    }
+    wanted = {
+        document.id: content_hash
+        for document in documents
+        if present.get(document.id) != (content_hash := document_content_hash(document))
+    }
+
+    copied = 0
+    for source in sources:
+        if not wanted:
+            break
+        found = source.get(ids=list(wanted), include=["embeddings", "metadatas", "documents"])
+        reusable = [
+            index for index, (doc_id, metadata) in enumerate(zip(found["ids"], found["metadatas"]))
+            if (metadata or {}).get("content_hash") == wanted[doc_id]
+        ]
+        for start in range(0, len(reusable), UPSERT_BATCH_SIZE):
+            batch = reusable[start:start + UPSERT_BATCH_SIZE]
+            target.upsert(
+                ids=[found["ids"][index] for index in batch],
+                embeddings=[found["embeddings"][index] for index in batch],
+                metadatas=[found["metadatas"][index] for index in batch],
+                documents=[found["documents"][index] for index in batch],
+            )
+        for index in reusable:
+            del wanted[found["ids"][index]]
+        copied += len(reusable)
+
+    if copied:
+        logger.info("Vector index seeded with %d unchanged documents", copied)
+    return copied
@@ -0,0 +1,104 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from backend.data.compact import RepRecord
+from backend.data.columnar import CLOSED_WON, CLOSED_LOST, IN_PROGRESS
+from .matching import NameMatcher
+from .utils import SalesAnalyticsTools
+
+# Questions asking for reasons, advice or interpretation need the LLM even when they name
+# a rep and a metric ("Why is Alice's win rate so low?")
+_OPEN_ENDED = re.compile(
+    r"\b(why|how come|explain|explains|explanation|reason|reasons|should|recommend|recommendation|"
+    r"suggest|advice|advise|improve|what if)\b")
+_COMPARE = re.compile(r"\b(compare|compared|comparison|comparing|versus|vs|better than|worse than)\b")
+_COUNT = re.compile(r"\b(how many|count|number of)\b")
+_PERFORMANCE = re.compile(
+    r"\b(performance|perform|performing|doing|stats|statistics|summary|metrics|win rate|how is|how's)\b")
+_STATUSES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\b(closed[\s-]+won|won|win|wins|winning)\b"), CLOSED_WON),
+    (re.compile(r"\b(closed[\s-]+lost|lost|lose|loses|losing)\b"), CLOSED_LOST),
+    (re.compile(r"\b(in[\s-]+progress|open|ongoing|pending|active)\b"), IN_PROGRESS),
+]
+
+
+class IntentMatch(BaseModel):
+    tool: str
+    answer: str
+    rep_ids: List[int]
+
+
+class QueryIntentRouter:
+    """
+    Recognizes questions that the analytics tools answer exactly (one rep's performance,
+    a comparison of two reps, a rep's deal count by status) so they can be answered
+    without retrieval or an LLM call. Only plain lookups are answered this way; anything
+    else, including questions asking why or what to do, is left to the RAG chain.
+    """
+
+    def __init__(self, analytics_tools: SalesAnalyticsTools):
+        self.analytics_tools = analytics_tools
+        data = analytics_tools.data
+        rep_ids_by_name: Dict[str, int] = {}
+        for name, rep_id in zip(data.rep_names(), data.rep_id.tolist()):
+            rep_ids_by_name.setdefault(" ".join(name.casefold().split()), rep_id)
+        self._name_matcher: NameMatcher[int] = NameMatcher(rep_ids_by_name.items())
+
+    def find_reps(self, text: str) -> List[RepRecord]:
+        """Find the reps named in a text, in order of first mention."""
+        # Names are matched whole-word on single spaces, as they are indexed
+        rep_ids = dict.fromkeys(self._name_matcher.find_longest(" ".join(text.split())))
+        return [self.analytics_tools.get_rep_by_id(rep_id) for rep_id in rep_ids]
+
+    def route(self, question: str, rep_context_id: Optional[int] = None) -> Optional[IntentMatch]:
+        """
+        Answer a question directly from the analytics tools if it matches a known intent
+
+        Args:
+            question: Question as asked
+            rep_context_id: Sales rep the question was asked about, if any; used when the
+                question names fewer reps than the intent needs
+
+        Returns:
+            Optional[IntentMatch]: The tool answer, or None if the question needs the LLM
+        """
+        text = question.casefold()
+        if _OPEN_ENDED.search(text):
+            return None
+        named = self.find_reps(text)
+        context_rep = self.analytics_tools.get_rep_by_id(rep_context_id) if rep_context_id is not None else None
+
+        if _COMPARE.search(text):
+            reps = named
+            if len(reps) == 1 and context_rep is not None and context_rep not in reps:
+                reps = [context_rep] + reps
+            if len(reps) != 2:
+                return None
+            return IntentMatch(
+                tool="compare_reps",
+                answer=self.analytics_tools.compare_reps(reps[0].name, reps[1].name),
+                rep_ids=[reps[0].id, reps[1].id],
+            )
+
+        if len(named) > 1 or (not named and context_rep is None):
+            return None
+        rep = named[0] if named else context_rep
+
+        if _COUNT.search(text):
+            statuses = [status for pattern, status in _STATUSES if pattern.search(text)]
+            if len(statuses) == 1:
+                return IntentMatch(
+                    tool="count_deals_by_status",
+                    answer=self.analytics_tools.count_deals_by_status(rep.name, statuses[0]),
+                    rep_ids=[rep.id],
+                )
+            return None
+
+        if _PERFORMANCE.search(text):
+            return IntentMatch(
+                tool="get_rep_performance",
+                answer=self.analytics_tools.get_rep_performance(rep.name),
+                rep_ids=[rep.id],
+            )
+        return None
@@ -0,0 +1,112 @@
+from collections import deque
+from typing import Dict, Generic, Iterable, List, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class NameMatcher(Generic[T]):
+    """
+    Aho-Corasick automaton over a set of names, built once, that finds every name occurring
+    in a text in a single pass, in time linear in the text length (plus the matches).
+    Matching is case-insensitive and only whole words count, so "Al" does not match "Alice".
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, T]]):
+        """
+        Build the automaton
+
+        Args:
+            names: (name, value) pairs; a name may map to several values
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, T]]] = [[]]
+
+        for name, value in names:
+            key = name.casefold().strip()
+            if not key:
+                continue
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((len(key), value))
+
+        # Breadth-first pass to link each state to its longest proper suffix state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, int, T]]:
+        """
+        Find all whole-word occurrences of the names in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List[Tuple[int, int, T]]: (start, end, value) of every match, in order of their end
+        """
+        text = text.casefold()
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._outputs[state]:
+                start = position - length + 1
+                end = position + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    matches.append((start, end, value))
+        return matches
+
+    def find_values(self, text: str) -> List[T]:
+        """
+        Get the distinct values of the names occurring in a text, in order of first match
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List[T]: Matched values
+        """
+        seen: Set[T] = set()
+        values = []
+        for _, _, value in self.find(text):
+            if value not in seen:
+                seen.add(value)
+                values.append(value)
+        return values
+
+    def find_longest(self, text: str) -> List[T]:
+        """
+        Get the values of the longest names occurring in a text, without overlaps: at each
+        position the longest name wins ("mary ann" over "mary"), in order of occurrence
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List[T]: Matched values, repeated if a name occurs several times
+        """
+        values = []
+        covered = 0
+        for start, end, value in sorted(self.find(text), key=lambda match: (match[0], match[0] - match[1])):
+            if start >= covered:
+                values.append(value)
+                covered = end
+        return values
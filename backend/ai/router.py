@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Query, Depends
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Query, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from .service import get_rag_chatbot_service
 from backend.data.service import SalesRepService
-from .schemas import QueryRequest, QueryResponse
-router = APIRouter()
+from .schemas import QueryRequest, QueryResponse, BatchQueryRequest, BatchAnswer, BatchQueryResponse, AnswerCacheStats, EmbeddingBatchStats
+from .embeddings import BatchingEmbeddings
+from .concurrency import AIServiceOverloaded
+from backend.metrics.timing import TimedRoute
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/")
@@ -10,6 +18,139 @@ async def ask_question(q: QueryRequest, rag_chatbot_service=Depends(get_rag_chat
     """
     Returns AI responses.
     """
-    resp = await rag_chatbot_service.query(q.message)
+    try:
+        resp = await rag_chatbot_service.query(q.message, q.rep_context_id)
+    except AIServiceOverloaded as e:
+        raise _overloaded_error(e)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI response timed out")
     resp = QueryResponse(**resp)
     return resp
+
+
+@router.post("/stream")
+async def stream_question(q: QueryRequest, rag_chatbot_service=Depends(get_rag_chatbot_service)):
+    """
+    Streams the AI response as Server-Sent Events: a `context` event with the retrieved
+    sales rep metadata, `token` events as the answer is generated, then `done`
+    (or `error` if generation fails midway).
+    """
+    direct = rag_chatbot_service.answer_directly(q.message, q.rep_context_id)
+    if direct is not None:
+        async def direct_stream():
+            yield _format_sse("context", [{"rep_id": rep_id, "path": "tool", "tool": direct["tool"]} for rep_id in direct["rep_ids"]])
+            yield _format_sse("token", direct["answer"])
+            yield _format_sse("done", {})
+
+        return StreamingResponse(
+            direct_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    limiter = rag_chatbot_service.llm_limiter
+    try:
+        await limiter.acquire()
+    except AIServiceOverloaded as e:
+        raise _overloaded_error(e)
+
+    released = False
+
+    def release_slot():
+        # Called from the stream and again as a background task, which also runs when the
+        # client disconnects before the stream ever started
+        nonlocal released
+        if not released:
+            released = True
+            limiter.release()
+
+    async def event_stream():
+        try:
+            async for event, data in rag_chatbot_service.stream_query(q.message, q.rep_context_id):
+                yield _format_sse(event, data)
+        except asyncio.TimeoutError:
+            yield _format_sse("error", {"detail": "AI response timed out"})
+            return
+        except Exception as e:
+            yield _format_sse("error", {"detail": str(e)})
+            return
+        finally:
+            release_slot()
+        yield _format_sse("done", {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_slot),
+    )
+
+
+@router.post("/batch", response_model=BatchQueryResponse)
+async def ask_questions(
+    batch: BatchQueryRequest,
+    stream: bool = Query(False, description="Stream each answer as a Server-Sent Event as soon as it is ready"),
+    rag_chatbot_service=Depends(get_rag_chatbot_service),
+):
+    """
+    Answers many questions at once, sharing embedding, retrieval and LLM work between them.
+    A failed question gets an `error` instead of failing the batch. Answers are returned
+    in request order, or with `stream=true` sent as `answer` (or `error`) events in the
+    order they finish, then `done`.
+    """
+    if len(batch.questions) > rag_chatbot_service.batch_max_questions:
+        raise HTTPException(
+            status_code=400, detail=f"At most {rag_chatbot_service.batch_max_questions} questions per batch")
+    answers = rag_chatbot_service.query_batch([(q.message, q.rep_context_id) for q in batch.questions])
+
+    if not stream:
+        ordered = [None] * len(batch.questions)
+        async for index, result in answers:
+            ordered[index] = _batch_answer(index, result)
+        return BatchQueryResponse(answers=ordered)
+
+    async def event_stream():
+        async for index, result in answers:
+            answer = _batch_answer(index, result)
+            yield _format_sse("error" if answer.error else "answer", answer.model_dump(exclude_none=True))
+        yield _format_sse("done", {})
+
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/cache", response_model=AnswerCacheStats)
+async def get_cache_stats(rag_chatbot_service=Depends(get_rag_chatbot_service)):
+    """
+    Returns hit and miss counts of the AI answer cache.
+    """
+    if not rag_chatbot_service.answer_cache:
+        raise HTTPException(status_code=404, detail="AI answer cache is disabled")
+    return rag_chatbot_service.answer_cache.stats()
+
+
+@router.get("/embeddings", response_model=EmbeddingBatchStats)
+async def get_embedding_stats(rag_chatbot_service=Depends(get_rag_chatbot_service)):
+    """
+    Returns the batch-size histogram of query embeddings.
+    """
+    if not isinstance(rag_chatbot_service.embeddings, BatchingEmbeddings):
+        raise HTTPException(status_code=404, detail="Query embedding batching is disabled")
+    return rag_chatbot_service.embeddings.stats()
+
+
+def _overloaded_error(e: AIServiceOverloaded) -> HTTPException:
+    # A full queue is the client's cue to back off; a queue timeout means we are saturated
+    status_code = 429 if e.queue_full else 503
+    return HTTPException(status_code=status_code, detail=str(e), headers={"Retry-After": "5"})
+
+
+def _batch_answer(index: int, result) -> BatchAnswer:
+    if isinstance(result, AIServiceOverloaded):
+        return BatchAnswer(index=index, error="AI service is overloaded")
+    if isinstance(result, asyncio.TimeoutError):
+        return BatchAnswer(index=index, error="AI response timed out")
+    if isinstance(result, Exception):
+        return BatchAnswer(index=index, error=str(result))
+    return BatchAnswer(index=index, answer=result["answer"], path=result["path"], tool=result.get("tool"))
+
+
+def _format_sse(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
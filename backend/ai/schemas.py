@@ -1,9 +1,26 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
 class QueryResponse(BaseModel):
     answer: str
+    # How the answer was produced: "tool" (direct analytics lookup), "cache", "llm" or "agent"
+    path: str = "llm"
+    tool: Optional[str] = None
+
+
+class AnswerCacheStats(BaseModel):
+    exact_hits: int
+    semantic_hits: int
+    misses: int
+    exact_entries: int
+    semantic_entries: int
+
+
+class EmbeddingBatchStats(BaseModel):
+    batches: int
+    queries: int
+    batch_size_histogram: Dict[str, int]
 
 
 class QueryRequest(BaseModel):
@@ -12,6 +29,25 @@ class QueryRequest(BaseModel):
     rep_context_id: Optional[int] = Field(..., description="The ID of the sales rep context to use")
 
 
+class BatchQueryRequest(BaseModel):
+    questions: List[QueryRequest] = Field(..., min_length=1, description="Questions to answer, each with its own rep context")
+
+
+class BatchAnswer(BaseModel):
+    # Position of the question in the request
+    index: int
+    answer: Optional[str] = None
+    path: Optional[str] = None
+    tool: Optional[str] = None
+    # Set instead of the answer when this question failed
+    error: Optional[str] = None
+
+
+class BatchQueryResponse(BaseModel):
+    # In request order
+    answers: List[BatchAnswer]
+
+
 # Define schema models for tool arguments
 class ToolSchema_RepName(BaseModel):
     rep_name: str = Field(..., description="The name of the sales rep")
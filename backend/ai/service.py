@@ -1,50 +1,234 @@
 from backend.config import get_env_settings
 from backend.data.service import SalesRepService
-from fastapi import Depends
-from backend.data.service import get_sales_rep_service
-from .utils import SalesRepDocumentProcessor, SalesAnalyticsTools, SalesAnalyticsRetriever
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from backend.data.service import get_sales_data_snapshot, get_sales_data_store
+from backend.data.snapshot import SalesDataSnapshot
+from .utils import SalesRepDocumentProcessor, SalesAnalyticsTools, SalesAnalyticsRetriever, fit_documents_to_token_budget
+from .index import copy_unchanged_vectors, sync_vector_store
+from .concurrency import ConcurrencyLimiter
+from .cache import AnswerCache, normalize_question
+from .intent import QueryIntentRouter
+from .embeddings import BatchingEmbeddings, create_embeddings
+from .vectors import MappedVectorStore, vectors_meta
+from .callbacks import StageTimer
+from backend.metrics.timing import stage
 
 from langchain_core.documents import Document
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.vectorstores import VectorStore
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import create_retrieval_chain
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_text_splitters import CharacterTextSplitter
 from langchain_chroma import Chroma
-from langchain_core.prompts import PromptTemplate, ChatPromptTemplate, MessagesPlaceholder, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+import chromadb
+from langchain_core.prompts import PromptTemplate, ChatPromptTemplate, MessagesPlaceholder
 from langchain.chains.combine_documents import create_stuff_documents_chain
-from langchain.agents import create_structured_chat_agent, AgentExecutor
+from langchain.agents import create_tool_calling_agent, AgentExecutor
+import asyncio
+import logging
 import os
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceState(NamedTuple):
+    """
+    Everything the service derives from one data snapshot. `refresh` builds a new one and
+    publishes it with a single assignment, so a request that reads the state once works
+    on one snapshot throughout, and caches its answer under that snapshot's version.
+    """
+    version: str
+    documents: List[Document]
+    vector_store: VectorStore
+    # Chroma collection behind vector_store, None when searching the snapshot file's vectors
+    vector_collection: Optional[str]
+    retriever: SalesAnalyticsRetriever
+    analytics_tools: SalesAnalyticsTools
+    intent_router: QueryIntentRouter
+    rag_chain: Runnable
+    # Only built with AI_AGENT_ENABLED
+    agent_executor: Optional[Runnable]
 
 
 class RAGChatBotService:
     def __init__(self, sales_rep_service: SalesRepService, llm=None):
-        self.sales_data = sales_rep_service.get_all_sales_reps()
+        settings = get_env_settings()
+        self.llm = llm or ChatGoogleGenerativeAI(model="gemini-2.0-flash-001", temperature=0.2, api_key=settings.GEMINI_API_KEY)
+        # The chains call the LLM through this, so each call is timed as the "llm" stage
+        self.timed_llm = self.llm.with_config(callbacks=[StageTimer()])
 
-        self.llm = llm or ChatGoogleGenerativeAI(model="gemini-2.0-flash-001", temperature=0.2, api_key=get_env_settings().GEMINI_API_KEY)
+        # Bound concurrent LLM calls and keep CPU-bound retrieval work off the event loop
+        self.llm_limiter = ConcurrencyLimiter(
+            max_concurrent=settings.AI_MAX_CONCURRENT_REQUESTS,
+            max_queued=settings.AI_MAX_QUEUED_REQUESTS,
+            queue_timeout=settings.AI_QUEUE_TIMEOUT_SECONDS,
+        )
+        self.request_timeout = settings.AI_REQUEST_TIMEOUT_SECONDS
+        self.document_chunk_size = settings.AI_DOCUMENT_CHUNK_SIZE
+        self.context_max_tokens = settings.AI_CONTEXT_MAX_TOKENS
+        self.batch_max_questions = settings.AI_BATCH_MAX_QUESTIONS
+        self.batch_max_concurrency = settings.AI_BATCH_MAX_CONCURRENCY
+        self.agent_enabled = settings.AI_AGENT_ENABLED
+        self.agent_max_iterations = settings.AI_AGENT_MAX_ITERATIONS
+        self.retrieval_executor = ThreadPoolExecutor(
+            max_workers=settings.AI_EMBEDDING_THREADS, thread_name_prefix="ai-retrieval")
 
-        # Process documents
-        self.documents = SalesRepDocumentProcessor.create_documents_from_sales_data(self.sales_data)
+        # Create embeddings model, coalescing concurrent query embeddings into batches
+        self.embeddings, embedding_space = create_embeddings(
+            settings.AI_EMBEDDING_BACKEND, settings.AI_EMBEDDING_MODEL, settings.AI_EMBEDDING_DIMENSIONS)
+        if settings.AI_EMBEDDING_BATCHING:
+            self.embeddings = BatchingEmbeddings(
+                self.embeddings,
+                max_batch_size=settings.AI_EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=settings.AI_EMBEDDING_BATCH_MAX_WAIT_MS,
+                executor=self.retrieval_executor,
+            )
+
+        # The persistent vector store is only opened when the snapshot has no usable vectors
+        self.embedding_space = embedding_space
+        self.index_dir = settings.AI_INDEX_DIR
+        self.chroma_client: Optional[chromadb.ClientAPI] = None
+        self._state: Optional[ServiceState] = None
+
+        self.answer_cache = None
+        if settings.AI_CACHE_ENABLED:
+            self.answer_cache = AnswerCache(
+                embeddings=self.embeddings,
+                max_entries=settings.AI_CACHE_MAX_ENTRIES,
+                ttl=settings.AI_CACHE_TTL_SECONDS,
+                semantic_threshold=settings.AI_CACHE_SEMANTIC_THRESHOLD,
+                semantic_enabled=settings.AI_CACHE_SEMANTIC_ENABLED,
+            )
 
-        # Create embeddings model
-        self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        self._setup_document_chain()
+        self.refresh(sales_rep_service)
 
-        # Create vector store
-        self.vectore_store = Chroma.from_documents(documents=self.documents, embedding=self.embeddings)
+    def refresh(self, sales_rep_service: SalesRepService):
+        """
+        Point the service at a (new) data snapshot. Only rep documents whose content changed
+        are re-embedded, none when the snapshot file carries their vectors; the retriever,
+        chain and agent are rebuilt around the new data and swapped in together.
+        """
+        # Everything reads the snapshot's compact columns; Pydantic models are only built a
+        # batch at a time for the documents
+        snapshot = sales_rep_service.snapshot
+
+        # Process documents
+        with stage("documents"):
+            documents = SalesRepDocumentProcessor.create_documents_from_sales_data(
+                snapshot.data, snapshot.stats, self.document_chunk_size)
+        vector_store, vector_collection = self._open_vector_store(snapshot, documents)
 
         # Create custom retriever
-        self.retriever = SalesAnalyticsRetriever(sales_data=self.sales_data, vector_store=self.vectore_store)
+        retriever = SalesAnalyticsRetriever(
+            data=snapshot.data,
+            vector_store=vector_store,
+            documents=documents,
+            executor=self.retrieval_executor,
+        )
 
         # Create analytics tools
-        self.analytics_tools = SalesAnalyticsTools(self.sales_data)
+        analytics_tools = SalesAnalyticsTools(snapshot.data, snapshot.stats)
+
+        previous = self._state
+        self._state = ServiceState(
+            version=snapshot.version,
+            documents=documents,
+            vector_store=vector_store,
+            vector_collection=vector_collection,
+            retriever=retriever,
+            analytics_tools=analytics_tools,
+            # Questions the tools answer exactly skip retrieval and the LLM
+            intent_router=QueryIntentRouter(analytics_tools),
+            rag_chain=self._setup_rag_chain(retriever),
+            # The agent needs a chat model with tool calling
+            agent_executor=self._setup_agent(analytics_tools) if self.agent_enabled else None,
+        )
+
+        # Cached answers were computed from the previous data. Requests still working on
+        # it cache theirs under its version, which lookups no longer ask for.
+        if self.answer_cache:
+            self.answer_cache.clear()
+
+        # Requests still working on the previous state may search its collection, so it is
+        # only dropped on the next refresh
+        if self.chroma_client is not None:
+            keep = {vector_collection, previous.vector_collection if previous else None}
+            for name in self._vector_collections():
+                if name not in keep:
+                    self.chroma_client.delete_collection(name)
 
-        # setup RAG chain
-        self._setup_rag_chain()
+    @property
+    def state(self) -> ServiceState:
+        """The current snapshot's state; read it once per request."""
+        return self._state
 
-        # setup agent
-        self._setup_agent()
+    @property
+    def snapshot_version(self) -> str:
+        return self._state.version
 
-    def _setup_rag_chain(self):
+    @property
+    def retriever(self) -> SalesAnalyticsRetriever:
+        return self._state.retriever
+
+    def _open_vector_store(
+        self, snapshot: SalesDataSnapshot, documents: List[Document],
+    ) -> Tuple[VectorStore, Optional[str]]:
+        """
+        Search the mapped document vectors of the snapshot file when they were built with
+        this worker's embedding model and chunk size; otherwise open the snapshot version's
+        collection of the persistent vector store. A new collection gets the vectors of
+        unchanged documents from the other collections, and only new or changed documents
+        are embedded, so the collections of states still in use never change.
+
+        Returns:
+            Tuple[VectorStore, Optional[str]]: The store, and its Chroma collection if any
+        """
+        vectors = snapshot.vectors
+        if vectors is not None:
+            if vectors.meta == vectors_meta(self.embedding_space, self.document_chunk_size):
+                try:
+                    return MappedVectorStore(self.embeddings, vectors, documents), None
+                except ValueError as e:
+                    logger.warning("Not using the snapshot file's vectors: %s", e)
+            else:
+                logger.warning(
+                    "Not using the snapshot file's vectors, built for %s instead of %s",
+                    vectors.meta, vectors_meta(self.embedding_space, self.document_chunk_size))
+
+        if self.chroma_client is None:
+            self.chroma_client = chromadb.PersistentClient(path=self.index_dir)
+        name = f"sales_reps_{self.embedding_space}_{snapshot.version[:16]}"
+        vector_store = Chroma(collection_name=name, embedding_function=self.embeddings, client=self.chroma_client)
+        with stage("vector_index"):
+            copy_unchanged_vectors(
+                self.chroma_client.get_collection(name, embedding_function=None),
+                [
+                    self.chroma_client.get_collection(other, embedding_function=None)
+                    for other in self._vector_collections() if other != name
+                ],
+                documents,
+            )
+            sync_vector_store(vector_store, documents)
+        return vector_store, name
+
+    def _vector_collections(self) -> List[str]:
+        """
+        Names of the persistent collections of this worker's embedding space, including the
+        single unversioned one indexes were kept in before
+        """
+        unversioned = f"sales_reps_{self.embedding_space}"
+        return [
+            name for name in self.chroma_client.list_collections()
+            if name == unversioned or name.startswith(f"{unversioned}_")
+        ]
+
+    def _setup_document_chain(self):
         prompt_template = """
         You are a sales analytics assistant with access to sales representatives data.
         Answer the question based on the following sales representative(s) information:
@@ -58,48 +242,310 @@ class RAGChatBotService:
         """
 
         prompt = PromptTemplate.from_template(prompt_template)
-        document_chain = create_stuff_documents_chain(self.llm, prompt)
-        self.rag_chain = create_retrieval_chain(self.retriever, document_chain)
+        self.document_chain = create_stuff_documents_chain(self.timed_llm, prompt)
+        # Answers batched questions from the context retrieved for all of them beforehand
+        self.batch_answer_chain = RunnableLambda(self._answer_from_context)
 
-    def _setup_agent(self):
-        tools = self.analytics_tools.get_tools()
-        system_template = """
-You are a sales analytics assistant that helps analyze sales rep performance data.
-You have access to the following tools:
+    def _setup_rag_chain(self, retriever: SalesAnalyticsRetriever) -> Runnable:
+        # Takes the whole chain input so a rep_context_id can scope retrieval
+        retrieval = RunnableLambda(partial(self._retrieve, retriever), afunc=partial(self._aretrieve, retriever))
+        return create_retrieval_chain(retrieval, self.document_chain)
+
+    def _retrieve(self, retriever: SalesAnalyticsRetriever, inputs: dict, config: RunnableConfig) -> List[Document]:
+        """
+        Retrieve for the chain: from the rep in context only when `rep_context_id` is set,
+        from the whole corpus otherwise, within the context token budget.
+        """
+        rep_context_id = inputs.get("rep_context_id")
+        documents = None
+        with stage("retrieval"):
+            if rep_context_id is not None:
+                documents = retriever.get_rep_documents(inputs["input"], rep_context_id)
+            if documents is None:
+                documents = retriever.invoke(inputs["input"], config)
+            return fit_documents_to_token_budget(documents, self.context_max_tokens)
 
-{tools}
+    async def _aretrieve(self, retriever: SalesAnalyticsRetriever, inputs: dict, config: RunnableConfig) -> List[Document]:
+        rep_context_id = inputs.get("rep_context_id")
+        documents = None
+        with stage("retrieval"):
+            if rep_context_id is not None:
+                documents = await retriever.aget_rep_documents(inputs["input"], rep_context_id)
+            if documents is None:
+                documents = await retriever.ainvoke(inputs["input"], config)
+            return fit_documents_to_token_budget(documents, self.context_max_tokens)
 
-Use these tools to provide accurate information about sales reps, their deals, and clients.
-Always use the appropriate tool from: {tool_names}
+    async def _aretrieve_for(
+        self, retriever: SalesAnalyticsRetriever, question: str, rep_context_id: Optional[int], query_vector: List[float],
+    ) -> List[Document]:
+        """
+        Same as _aretrieve, for a question whose embedding was computed with the rest of its batch.
+        """
+        documents = None
+        with stage("retrieval"):
+            if rep_context_id is not None:
+                documents = await retriever.aget_rep_documents(question, rep_context_id, query_vector)
+            if documents is None:
+                documents = await retriever.asearch_documents(question, query_vector)
+            return fit_documents_to_token_budget(documents, self.context_max_tokens)
 
-For comparison questions, make sure to use the comparison tool rather than making separate queries.
+    async def _answer_from_context(self, inputs: dict, config: RunnableConfig) -> str:
+        async with self.llm_limiter.slot():
+            return await asyncio.wait_for(self.document_chain.ainvoke(inputs, config), self.request_timeout)
+
+    def _setup_agent(self, analytics_tools: SalesAnalyticsTools) -> Runnable:
+        tools = analytics_tools.get_tools()
+        system_template = """
+You are a sales analytics assistant that helps analyze sales rep performance data.
+Use the tools to look up sales reps' performance, deals and comparisons; they return JSON.
+When a question is about several reps or needs several lookups, request all the tool
+calls you need at once instead of one after the other.
 When providing financial data, format values with dollar signs and commas.
 If calculating or comparing metrics, show your reasoning clearly."""
 
         agent_prompt = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(system_template),
-            HumanMessagePromptTemplate.from_template("{input}"),
+            ("system", system_template),
+            ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
         ])
 
-        agent = create_structured_chat_agent(self.llm, tools, prompt=agent_prompt)
-        self.agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
+        agent = create_tool_calling_agent(self.llm, tools, agent_prompt)
+        # Times the agent's LLM and tool calls as stages instead of printing them
+        return AgentExecutor(
+            agent=agent, tools=tools, max_iterations=self.agent_max_iterations,
+        ).with_config(callbacks=[StageTimer()])
+
+    async def _ask_agent(self, state: ServiceState, question: str, rep_context_id: Optional[int]) -> dict:
+        rep = state.analytics_tools.get_rep_by_id(rep_context_id) if rep_context_id is not None else None
+        agent_input = question if rep is None else f"(Asked about sales rep {rep.name}) {question}"
+        result = await state.agent_executor.ainvoke({"input": agent_input})
+        return {"input": question, "answer": result["output"]}
+
+    def answer_directly(
+        self, question: str, rep_context_id: Optional[int] = None, state: Optional[ServiceState] = None,
+    ) -> Optional[dict]:
+        """
+        Answer metric lookups (a rep's performance, a comparison of two reps, a rep's deal
+        count by status) straight from the analytics tools, without retrieval or the LLM.
+
+        Args:
+            state: State to answer from, the current one by default
+
+        Returns:
+            Optional[dict]: The answer, or None if the question needs the RAG chain
+        """
+        state = state or self._state
+        with stage("tools"):
+            match = state.intent_router.route(question, rep_context_id)
+        if match is None:
+            return None
+        return {"input": question, "answer": match.answer, "path": "tool", "tool": match.tool, "rep_ids": match.rep_ids}
+
+    async def query(self, question: str, rep_context_id: Optional[int] = None) -> dict:
+        """
+        Answer a question directly from the analytics tools when possible, then from the
+        answer cache, or else through the RAG chain after waiting for an LLM slot. When
+        `rep_context_id` is set, the chain only retrieves that rep's documents (and those of
+        reps named in the question).
+
+        With AI_AGENT_ENABLED, the tool-calling agent answers instead of the RAG chain,
+        holding the LLM slot for all of its turns.
+
+        Raises:
+            AIServiceOverloaded: If no LLM slot is available
+            asyncio.TimeoutError: If answering takes longer than the request timeout
+        """
+        state = self._state
+        direct = self.answer_directly(question, rep_context_id, state)
+        if direct is not None:
+            return direct
 
-    async def query(self, question: str) -> dict:
-        # Analyze the query to determine if it needs specific tools
-        query = question.lower()
+        snapshot_version = state.version
+        if self.answer_cache:
+            with stage("answer_cache"):
+                cached = await self.answer_cache.get(question, rep_context_id, snapshot_version)
+            if cached is not None:
+                return {**cached, "path": "cache"}
 
-        # if "compare" in query and any(rep.name.lower() in query for rep in self.sales_data.salesReps):
-        #     print("Using comparison tool")
-        #     return self.agent_executor.invoke({"input": question})
+        async with self.llm_limiter.slot():
+            if self.agent_enabled:
+                result = await asyncio.wait_for(self._ask_agent(state, question, rep_context_id), self.request_timeout)
+                result["path"] = "agent"
+            else:
+                result = await asyncio.wait_for(
+                    state.rag_chain.ainvoke({"input": question, "rep_context_id": rep_context_id}), self.request_timeout)
+                result["path"] = "llm"
 
-        # Default to RAG for general queries
-        result = self.rag_chain.invoke({"input": question})
+        if self.answer_cache:
+            await self.answer_cache.put(question, rep_context_id, snapshot_version, result)
         return result
 
+    async def query_batch(
+        self, questions: Sequence[Tuple[str, Optional[int]]],
+    ) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """
+        Answer many questions together, yielding (index, result) pairs as each answer is
+        ready, where the result is what `query` returns for that question or the exception
+        it failed with. Repeated questions are answered once.
+
+        Questions the tools or the cache do not answer are embedded in a single pass, their
+        retrievals run concurrently, and the LLM calls go through the answer chain's batch
+        API, at most AI_BATCH_MAX_CONCURRENCY at a time, each in an LLM slot.
+
+        Args:
+            questions: (question, rep_context_id) pairs, see `query`
+        """
+        state = self._state
+        pending: Dict[Tuple[str, Optional[int]], List[int]] = {}
+        for index, key in enumerate(questions):
+            pending.setdefault(key, []).append(index)
+
+        def answered(key: Tuple[str, Optional[int]], result: Union[dict, Exception]) -> List[Tuple[int, Union[dict, Exception]]]:
+            return [(index, result) for index in pending.pop(key)]
+
+        for key in list(pending):
+            try:
+                direct = self.answer_directly(*key, state)
+            except Exception as e:
+                direct = e
+            if direct is not None:
+                for item in answered(key, direct):
+                    yield item
+        if not pending:
+            return
+
+        snapshot_version = state.version
+        texts = list(dict.fromkeys(question for question, _ in pending))
+        cache_texts = []
+        if self.answer_cache and self.answer_cache.semantic_enabled:
+            cache_texts = [text for text in dict.fromkeys(map(normalize_question, texts)) if text not in texts]
+        loop = asyncio.get_running_loop()
+        try:
+            with stage("embed"):
+                vectors = await loop.run_in_executor(
+                    self.retrieval_executor, self.embeddings.embed_documents, texts + cache_texts)
+        except Exception as e:
+            for key in list(pending):
+                for item in answered(key, e):
+                    yield item
+            return
+        vectors_by_text = dict(zip(texts + cache_texts, vectors))
+
+        if self.answer_cache:
+            if self.answer_cache.semantic_enabled:
+                self.answer_cache.add_question_vectors(
+                    {normalize_question(text): vectors_by_text[normalize_question(text)] for text in texts})
+            for question, rep_context_id in list(pending):
+                with stage("answer_cache"):
+                    cached = await self.answer_cache.get(question, rep_context_id, snapshot_version)
+                if cached is not None:
+                    for item in answered((question, rep_context_id), {**cached, "path": "cache"}):
+                        yield item
+
+        keys = list(pending)
+        contexts = await asyncio.gather(
+            *(self._aretrieve_for(state.retriever, question, rep_context_id, vectors_by_text[question]) for question, rep_context_id in keys),
+            return_exceptions=True)
+        inputs, input_keys = [], []
+        for key, context in zip(keys, contexts):
+            if isinstance(context, Exception):
+                for item in answered(key, context):
+                    yield item
+            else:
+                inputs.append({"input": key[0], "rep_context_id": key[1], "context": context})
+                input_keys.append(key)
+
+        answers = self.batch_answer_chain.abatch_as_completed(
+            inputs, config={"max_concurrency": self.batch_max_concurrency}, return_exceptions=True)
+        async for position, answer in answers:
+            key = input_keys[position]
+            if isinstance(answer, Exception):
+                result = answer
+            else:
+                result = {**inputs[position], "answer": answer, "path": "llm"}
+                if self.answer_cache:
+                    await self.answer_cache.put(key[0], key[1], snapshot_version, result)
+            for item in answered(key, result):
+                yield item
+
+    async def stream_query(self, question: str, rep_context_id: Optional[int] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream the answer to a question as (event, data) pairs: one "context" event with the
+        metadata of the retrieved documents as soon as retrieval finishes, then a "token"
+        event per chunk produced by the LLM. With `rep_context_id`, retrieval is limited to
+        that rep (see `query`).
+
+        The caller must hold an LLM slot (see `llm_limiter`) while consuming the stream.
+
+        Raises:
+            asyncio.TimeoutError: If the stream is not finished within the request timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_timeout
+        chunks = aiter(self._state.rag_chain.astream({"input": question, "rep_context_id": rep_context_id}))
+        while True:
+            try:
+                chunk = await asyncio.wait_for(anext(chunks), max(deadline - loop.time(), 0))
+            except StopAsyncIteration:
+                break
+            if "context" in chunk:
+                yield "context", [
+                    {key: value for key, value in document.metadata.items() if key != "content_hash"}
+                    for document in chunk["context"]
+                ]
+            if chunk.get("answer"):
+                yield "token", chunk["answer"]
+
+
+async def startup_rag_chatbot_service(app: FastAPI) -> None:
+    """
+    Build the shared RAGChatBotService for this worker and store it on the app state.
+
+    The embedding model and vector index are loaded in a worker thread so the event loop
+    keeps serving the data routes meanwhile. When AI_WARMUP_QUERY is set, it is run through
+    the retriever once so the first real question does not pay for lazy initialization.
+    The service then follows every sales data reload.
+    """
+    store = get_sales_data_store()
+    try:
+        # The vector index is built from the whole data set: read from the SQLite database with
+        # the sqlite backend, so the chatbot answers from the same import as the data API
+        service = await run_in_threadpool(
+            RAGChatBotService, sales_rep_service=SalesRepService(get_sales_data_snapshot()))
+
+        async def on_sales_data_change(previous: SalesDataSnapshot, snapshot: SalesDataSnapshot):
+            await run_in_threadpool(service.refresh, SalesRepService(snapshot))
+
+        store.add_listener(on_sales_data_change)
+        # The data may have been reloaded while the service was being built
+        if store.snapshot.version != service.snapshot_version:
+            await run_in_threadpool(service.refresh, SalesRepService(store.snapshot))
+
+        warmup_query = get_env_settings().AI_WARMUP_QUERY
+        if warmup_query:
+            await run_in_threadpool(service.retriever.invoke, warmup_query)
+    except Exception as e:
+        logger.exception("Failed to build the RAG chatbot service")
+        app.state.rag_chatbot_error = str(e)
+        return
+
+    app.state.rag_chatbot_service = service
+    logger.info("RAG chatbot service is ready")
+
+
+def is_rag_chatbot_service_ready(app: FastAPI) -> bool:
+    """
+    Check whether the shared RAGChatBotService has finished loading.
+    """
+    return getattr(app.state, "rag_chatbot_service", None) is not None
+
 
-async def get_rag_chatbot_service(sales_rep_sevice=Depends(get_sales_rep_service)):
+def get_rag_chatbot_service(request: Request) -> RAGChatBotService:
     """
-    Dependency to get the RAGChatBotService instance.
+    Dependency to get the shared RAGChatBotService instance.
     """
-    return RAGChatBotService(sales_rep_service=sales_rep_sevice)
+    service = getattr(request.app.state, "rag_chatbot_service", None)
+    if service is None:
+        raise HTTPException(
+            status_code=503, detail="AI service is not ready yet", headers={"Retry-After": "5"})
+    return service
@@ -1,177 +1,479 @@
-from typing import List, Optional, Any
-from pydantic import BaseModel
-from backend.data.schemas import SalesRep, Deal, Client, SalesData
+import asyncio
+from collections import Counter
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, List, Optional, Any
+from pydantic import BaseModel, PrivateAttr
+import numpy as np
+from backend.data.compact import CompactSalesData, RepRecord
+from backend.data.schemas import SalesRep, Deal, Client, RepStats
+from backend.data.stats import RepStatsTable
+from backend.metrics.timing import stage
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
-from langchain_core.callbacks import CallbackManagerForRetrieverRun
-from langchain_core.tools import tool, Tool
-from .schemas import ToolSchema_RepName, ToolSchema_CompareReps
+from langchain_core.vectorstores import VectorStore
+from langchain_core.callbacks import CallbackManagerForRetrieverRun, AsyncCallbackManagerForRetrieverRun
+from langchain_core.tools import tool, StructuredTool
+from .bm25 import BM25Index
+from .matching import NameMatcher
+from .schemas import ToolSchema_RepName, ToolSchema_CompareReps, ToolSchema_RepDealStatus
 
 
-class SalesRepDocumentProcessor:
-    """Helper class to process sales rep data into LangChain documents."""
+# Rough characters-per-token ratio used to estimate prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+# Reps turned into Pydantic models at a time while building documents, so the models of
+# the whole data set never exist at once
+DOCUMENT_BATCH_SIZE = 1024
 
-    @staticmethod
-    def format_deals(deals: List[Deal]) -> str:
-        """Format deals into a string representation."""
-        if not deals:
-            return "No deals available."
 
-        result = ""
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
 
-        for deal in deals:
-            result += f"- Client: {deal.client}, Value: {deal.value}, Status: {deal.status}\n"
 
-        return result
+def fit_documents_to_token_budget(documents: List[Document], max_tokens: int) -> List[Document]:
+    """
+    Keep documents in rank order while their estimated size fits the token budget. The first
+    document that does not fit is cut at a line boundary and ends the list, so the prompt
+    stays bounded however large the retrieved documents are.
+    """
+    fitted = []
+    remaining = max_tokens
+    for document in documents:
+        tokens = estimate_tokens(document.page_content)
+        if tokens <= remaining:
+            fitted.append(document)
+            remaining -= tokens
+            continue
+
+        content = document.page_content[:remaining * CHARS_PER_TOKEN]
+        content = content[:content.rfind("\n") + 1]
+        if content:
+            fitted.append(Document(id=document.id, page_content=content, metadata=document.metadata))
+        break
+    return fitted
 
-    @staticmethod
-    def format_clients(clients: List[Client]) -> str:
-        """Format clients into a readable text representation."""
-        if not clients:
-            return "No clients available."
 
-        result = ""
+class SalesRepDocumentProcessor:
+    """
+    Helper class to process sales rep data into LangChain documents.
 
-        for client in clients:
-            result += f"- Name: {client.name}, Industry: {client.industry}, Contact: {client.contact}\n"
+    Every rep gets a compact summary document with its aggregates. Identical deals are
+    collapsed into one counted line, and a rep with more deal or client lines than
+    `chunk_size` gets them in separate chunk documents instead of in the summary.
+    """
 
-        return result
+    @staticmethod
+    def format_deals(deals: List[Deal]) -> List[str]:
+        """Format deals into lines, one per distinct (client, value, status) with its count."""
+        counts = Counter((deal.client, deal.value, deal.status) for deal in deals)
+        return [
+            f"- {client}, {value}, {status}" + (f" (x{count})" if count > 1 else "")
+            for (client, value, status), count in counts.items()
+        ]
 
-    @classmethod
-    def create_document_from_rep(cls, rep: SalesRep) -> str:
-        """Convert a single rep model to a LangChain document."""
-        metadata = {
+    @staticmethod
+    def format_clients(clients: List[Client]) -> List[str]:
+        """Format clients into lines, skipping duplicates."""
+        return list(dict.fromkeys(
+            f"- {client.name}, {client.industry}, {client.contact}" for client in clients
+        ))
+
+    @staticmethod
+    def document_id(rep: SalesRep) -> str:
+        """Stable id of a rep's summary document in the vector index."""
+        return f"rep-{rep.id}"
+
+    @staticmethod
+    def _metadata(rep: SalesRep, document_type: str) -> dict:
+        return {
             "rep_id": rep.id,
             "rep_name": rep.name,
             "rep_role": rep.role,
             "rep_region": rep.region,
-            "document_type": "sales_rep",
+            "document_type": document_type,
         }
 
-        content = f"""
-        Sales Rep: {rep.name}
-        ID: {rep.id}
-        Role: {rep.role}
-        Region: {rep.region}
-        Skills: {', '.join(rep.skills)}
-        
-        Deals:
-        {cls.format_deals(rep.deals)}
-        
-        Clients:
-        {cls.format_clients(rep.clients)}
-        """
+    @classmethod
+    def create_documents_from_rep(cls, rep: SalesRep, stats: RepStats, chunk_size: int) -> List[Document]:
+        """Convert a single rep model to its summary document and deal/client chunks."""
+        deal_lines = cls.format_deals(rep.deals)
+        client_lines = cls.format_clients(rep.clients)
+        chunked = len(deal_lines) > chunk_size or len(client_lines) > chunk_size
+
+        summary = [
+            f"Sales Rep: {rep.name} (ID {rep.id})",
+            f"Role: {rep.role}",
+            f"Region: {rep.region}",
+            f"Skills: {', '.join(rep.skills)}",
+            f"Deals: {stats.total_deals} total, {stats.won_deals} Closed Won, {stats.lost_deals} Closed Lost, "
+            f"{stats.in_progress_deals} In Progress; win rate {stats.win_rate:.1f}%",
+            f"Value: {stats.won_value} won, {stats.pipeline_value} in pipeline, {stats.total_value} total",
+            f"Clients: {stats.client_count}",
+        ]
+        if chunked:
+            summary.append("Deal and client details are listed in separate documents.")
+        else:
+            summary += ["", "Deals (client, value, status):", *(deal_lines or ["No deals available."])]
+            summary += ["", "Clients (name, industry, contact):", *(client_lines or ["No clients available."])]
+
+        documents = [Document(
+            id=cls.document_id(rep), page_content="\n".join(summary), metadata=cls._metadata(rep, "sales_rep"))]
+        if chunked:
+            documents += cls._chunk(rep, "deals", "Deals (client, value, status)", deal_lines, chunk_size)
+            documents += cls._chunk(rep, "clients", "Clients (name, industry, contact)", client_lines, chunk_size)
+        return documents
 
-        return Document(page_content=content, metadata=metadata)
+    @classmethod
+    def _chunk(cls, rep: SalesRep, kind: str, title: str, lines: List[str], chunk_size: int) -> List[Document]:
+        chunk_count = -(-len(lines) // chunk_size)
+        return [
+            Document(
+                id=f"{cls.document_id(rep)}-{kind}-{number + 1}",
+                page_content="\n".join([
+                    f"{title} of {rep.name} (ID {rep.id}), part {number + 1} of {chunk_count}:",
+                    *lines[number * chunk_size:(number + 1) * chunk_size],
+                ]),
+                metadata=cls._metadata(rep, kind),
+            )
+            for number in range(chunk_count)
+        ]
 
     @classmethod
-    def create_documents_from_sales_data(cls, sales_data: SalesData) -> List[Document]:
-        """Convert all sales reps in sales data to LangChain documents"""
-        return [cls.create_document_from_rep(rep) for rep in sales_data.salesReps]
+    def create_documents_from_sales_data(
+        cls, data: CompactSalesData, rep_stats: RepStatsTable, chunk_size: int
+    ) -> List[Document]:
+        """Convert all sales reps in sales data to LangChain documents, DOCUMENT_BATCH_SIZE reps at a time"""
+        documents = []
+        for start in range(0, len(data), DOCUMENT_BATCH_SIZE):
+            for rep in data.rep_models(np.arange(start, min(start + DOCUMENT_BATCH_SIZE, len(data)))):
+                documents += cls.create_documents_from_rep(rep, rep_stats.get(rep.id), chunk_size)
+        return documents
 
 
 class SalesAnalyticsRetriever(BaseRetriever, BaseModel):
     """
-    Custom retriever to fetch documents based on sales data. 
-    Combines vector search with direct Pydantic model access.
+    Custom retriever to fetch documents based on sales data.
+    Fuses vector search, BM25 keyword search and exact rep/client name matches with
+    reciprocal rank fusion, and always includes the reps named in the question.
     """
-    sales_data: SalesData
-    vector_store: Chroma
+    # Compact data of the snapshot, for the rep and client names
+    data: CompactSalesData
+    # Chroma, or the mapped vectors of a snapshot file (see vectors.MappedVectorStore)
+    vector_store: VectorStore
+    # The documents indexed in the vector store; results are served from these objects
+    documents: List[Document]
+    # Bounded pool for the CPU-bound query embedding and vector search on the async path
+    executor: Optional[Executor] = None
+    k: int = 5
+    rrf_k: int = 60
+
+    _documents_by_id: Dict[str, Document] = PrivateAttr()
+    _documents_by_rep: Dict[int, List[Document]] = PrivateAttr()
+    _bm25: BM25Index = PrivateAttr()
+    _name_matcher: NameMatcher = PrivateAttr()
+    _rep_ids_by_client: Dict[str, List[int]] = PrivateAttr()
 
     class Config:
         arbitrary_types_allowed = True
 
+    def model_post_init(self, __context: Any) -> None:
+        self._documents_by_id = {document.id: document for document in self.documents}
+        self._documents_by_rep = {}
+        for document in self.documents:
+            self._documents_by_rep.setdefault(document.metadata["rep_id"], []).append(document)
+        self._bm25 = BM25Index([document.page_content for document in self.documents])
+
+        # Reps having a client either as a deal's client or in their client list, in data order
+        data = self.data
+        client_rep_counts = np.diff(data.rep_client_offsets)
+        client_codes = np.concatenate([data.deal_client, data.client_name]).astype(np.int64)
+        rep_positions = np.concatenate([
+            data.deal_rep_index, np.repeat(np.arange(len(data)), client_rep_counts)]).astype(np.int64)
+        pairs = np.unique(client_codes * len(data) + rep_positions)
+        client_codes, rep_positions = np.divmod(pairs, len(data)) if len(data) else (pairs, pairs)
+        rep_ids = data.rep_id[rep_positions].tolist()
+        bounds = np.flatnonzero(np.diff(client_codes)) + 1
+        self._rep_ids_by_client = {}
+        for start, end in zip([0, *bounds.tolist()], [*bounds.tolist(), len(pairs)]):
+            self._rep_ids_by_client[data.client_names[int(client_codes[start])]] = rep_ids[start:end]
+        self._name_matcher = NameMatcher(
+            [(name, ("rep", rep_id)) for name, rep_id in zip(data.rep_names(), data.rep_id.tolist())]
+            + [(client, ("client", client)) for client in self._rep_ids_by_client]
+        )
+
     def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
         """
-        Get relevant documents based on the query using both vector search and model access
+        Get relevant documents based on the query using vector search, keyword search and name matches
+        """
+        vector_docs = self._search(query, k=self.k)
+        with stage("fuse"):
+            return self._fuse(query, vector_docs)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        """
+        Same as _get_relevant_documents, with the query embedded through the async (batched)
+        embedding path and the vector search, keyword search and fusion run in the
+        retriever's executor, so none of them blocks the event loop
+        """
+        return await self.asearch_documents(query)
+
+    async def asearch_documents(self, query: str, query_vector: Optional[List[float]] = None) -> List[Document]:
+        """
+        Retrieve for a query whose embedding may already be known, e.g. computed for a
+        whole batch of questions at once
+
+        Args:
+            query: Question text, for keyword search and name matches
+            query_vector: Embedding of the query, embedded here when None
+
+        Returns:
+            List[Document]: Fused results, as for `ainvoke`
+        """
+        vector_docs = await self._asearch(query, query_vector, k=self.k)
+        # BM25 scoring grows with the corpus, so it runs in the executor like the vector search
+        with stage("fuse"):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._fuse, query, vector_docs)
+
+    def get_rep_documents(self, query: str, rep_id: int) -> Optional[List[Document]]:
+        """
+        Retrieve from a single rep's documents, plus those of the other reps named in the
+        query, without searching the whole corpus. A rep with no more than `k` documents is
+        a plain id lookup; otherwise a vector search filtered on the rep's id picks the chunks.
+
+        Returns:
+            Optional[List[Document]]: The documents, or None if the rep is not indexed
+        """
+        rep_documents = self._documents_by_rep.get(rep_id)
+        if rep_documents is None:
+            return None
+        if len(rep_documents) > self.k:
+            vector_docs = self._search(query, k=self.k, filter={"rep_id": rep_id})
+            rep_documents = self._scope(rep_id, vector_docs)
+        return self._with_named_reps(query, rep_id, rep_documents)
+
+    async def aget_rep_documents(self, query: str, rep_id: int, query_vector: Optional[List[float]] = None) -> Optional[List[Document]]:
+        """
+        Async version of get_rep_documents, optionally with the query's embedding already known.
         """
-        vector_docs = self.vector_store.similarity_search(query, k=5)
+        rep_documents = self._documents_by_rep.get(rep_id)
+        if rep_documents is None:
+            return None
+        if len(rep_documents) > self.k:
+            vector_docs = await self._asearch(query, query_vector, k=self.k, filter={"rep_id": rep_id})
+            rep_documents = self._scope(rep_id, vector_docs)
+        return self._with_named_reps(query, rep_id, rep_documents)
+
+    def _search(self, query: str, **kwargs: Any) -> List[Document]:
+        """Vector search, with the query embedding and the search timed as separate stages."""
+        with stage("embed"):
+            query_vector = self.vector_store.embeddings.embed_query(query)
+        with stage("vector_search"):
+            return self.vector_store.similarity_search_by_vector(query_vector, **kwargs)
+
+    async def _asearch(self, query: str, query_vector: Optional[List[float]], **kwargs: Any) -> List[Document]:
+        """Async _search: the query goes through the async (batched) embedding path and the search runs in the executor."""
+        if query_vector is None:
+            with stage("embed"):
+                query_vector = await self.vector_store.embeddings.aembed_query(query)
+        with stage("vector_search"):
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(self.vector_store.similarity_search_by_vector, query_vector, **kwargs))
 
-        for rep in self.sales_data.salesReps:
-            if rep.name.lower() in query.lower():
-                rep_doc = SalesRepDocumentProcessor.create_document_from_rep(rep)
-                if not any(d.metadata.get("rep_id") == rep.id for d in vector_docs):
-                    vector_docs.append(rep_doc)
+    @staticmethod
+    def _rep_document_id(rep_id: int) -> str:
+        return f"rep-{rep_id}"
+
+    def _scope(self, rep_id: int, vector_docs: List[Document]) -> List[Document]:
+        """The rep's main document followed by its best-matching chunks."""
+        document_ids = [self._rep_document_id(rep_id)]
+        document_ids += [document.id for document in vector_docs if document.id not in document_ids]
+        return [self._documents_by_id[document_id] for document_id in document_ids if document_id in self._documents_by_id]
+
+    def _with_named_reps(self, query: str, rep_id: int, rep_documents: List[Document]) -> List[Document]:
+        named = [
+            self._documents_by_id[self._rep_document_id(value)]
+            for kind, value in self._name_matcher.find_values(query)
+            if kind == "rep" and value != rep_id and self._rep_document_id(value) in self._documents_by_id
+        ]
+        return rep_documents + named
+
+    def _fuse(self, query: str, vector_docs: List[Document]) -> List[Document]:
+        """Merge the vector, BM25 and client-name rankings, with reps named in the query first."""
+        named_rep_ids = []
+        # Ordered set of the reps selling to named clients; only the first k can make the cut
+        client_rep_ids: Dict[int, None] = {}
+        for kind, value in self._name_matcher.find_values(query):
+            if kind == "rep":
+                named_rep_ids.append(value)
+                continue
+            for rep_id in self._rep_ids_by_client[value]:
+                if len(client_rep_ids) >= self.k:
+                    break
+                client_rep_ids[rep_id] = None
+
+        rankings = [
+            [document.id or self._rep_document_id(document.metadata.get("rep_id")) for document in vector_docs],
+            [self.documents[position].id for position, _ in self._bm25.search(query, self.k)],
+            [self._rep_document_id(rep_id) for rep_id in client_rep_ids],
+        ]
+        scores: Dict[str, float] = {}
+        for ranking in rankings:
+            for rank, document_id in enumerate(ranking):
+                scores[document_id] = scores.get(document_id, 0.0) + 1 / (self.rrf_k + rank + 1)
+        fused = sorted(scores, key=lambda document_id: -scores[document_id])[:self.k]
 
-        return vector_docs
+        named = list(dict.fromkeys(self._rep_document_id(rep_id) for rep_id in named_rep_ids))
+        named_set = set(named)
+        document_ids = named + [document_id for document_id in fused if document_id not in named_set]
+        return [self._documents_by_id[document_id] for document_id in document_ids if document_id in self._documents_by_id]
 
 
 class SalesAnalyticsTools:
 
-    def __init__(self, sales_data: SalesData):
-        """Initialize the tools with sales data."""
-        self.sales_data = sales_data
-        self.sales_reps_by_name = {rep.name.lower(): rep for rep in sales_data.salesReps}
+    def __init__(self, data: CompactSalesData, rep_stats: RepStatsTable):
+        """Initialize the tools with compact sales data and its precomputed per-rep stats."""
+        self.data = data
+        self.rep_stats = rep_stats
+        # Only positions are kept; a rep's fields are decoded from the columns when looked up
+        self._positions_by_name = {name.lower(): position for position, name in enumerate(data.rep_names())}
 
-    def _get_rep_by_name(self, rep_name: str) -> str:
-        return self.sales_reps_by_name.get(rep_name.lower())
+    def _get_rep_by_name(self, rep_name: str) -> Optional[RepRecord]:
+        position = self._positions_by_name.get(rep_name.lower())
+        return self.data.reps[position] if position is not None else None
 
-    def get_rep_performance(self, rep_name: str) -> str:
-        rep = self._get_rep_by_name(rep_name)
-        if not rep:
-            return f"Sales representative {rep_name} not found."
+    def get_rep_by_id(self, rep_id: int) -> Optional[RepRecord]:
+        """Get a rep's fields by id, or None if there is no such rep."""
+        position = self.data.position_of(rep_id)
+        return self.data.reps[position] if position is not None else None
 
-        # calculate performance metrics
-        statuses_count = rep.deal_count_by_status()
-        total_value = sum(deal.value for deal in rep.deals)
+    @staticmethod
+    def _not_found(rep_name: str) -> Dict[str, Any]:
+        return {"error": f"Sales representative {rep_name} not found."}
 
-        return f"""
-        Performance for {rep.name} ({rep.role}, {rep.region}):
-        - Region: {rep.region}
-        - Total Deals: {len(rep.deals)}
-        - Closed Won: {statuses_count.get("Closed Won", 0)}
-        - Closed Lost: {statuses_count.get("Closed Lost", 0)}
-        - In Progress: {statuses_count.get("In Progress", 0)}
-        - Win rate: {rep.win_rate():.1f}%
-        - Total pipeline value: {total_value:,.2f}
+    def _rep_summary(self, rep: RepRecord) -> Dict[str, Any]:
+        return {**self.rep_stats.get(rep.id).model_dump(), "role": rep.role, "region": rep.region}
+
+    def rep_performance(self, rep_name: str) -> Dict[str, Any]:
         """
+        Performance metrics of a sales rep
 
-    def compare_reps(self, rep1_name: str, rep2_name: str) -> str:
+        Returns:
+            Dict: The rep and its deal statistics, or an `error` if no rep has that name
         """
-        Compare performance of two sales reps.
+        rep = self._get_rep_by_name(rep_name)
+        if not rep:
+            return self._not_found(rep_name)
+        return self._rep_summary(rep)
+
+    def rep_comparison(self, rep1_name: str, rep2_name: str) -> Dict[str, Any]:
         """
+        Performance metrics of two sales reps side by side
 
+        Returns:
+            Dict: Both reps' summaries under `reps`, or an `error` if either is unknown
+        """
         rep1 = self._get_rep_by_name(rep1_name)
         rep2 = self._get_rep_by_name(rep2_name)
-
         if not rep1:
-            return f"Sales representative {rep1_name} not found."
+            return self._not_found(rep1_name)
         if not rep2:
-            return f"Sales representative {rep2_name} not found."
+            return self._not_found(rep2_name)
+        return {"reps": [self._rep_summary(rep1), self._rep_summary(rep2)]}
 
-        rep1_statuses_count = rep1.deal_count_by_status()
-        rep2_statuses_count = rep2.deal_count_by_status()
+    def deal_status_count(self, rep_name: str, status: str) -> Dict[str, Any]:
+        """
+        Number of a sales rep's deals with a given status
+
+        Returns:
+            Dict: The count and the rep's total deal count, or an `error` if no rep has that name
+        """
+        rep = self._get_rep_by_name(rep_name)
+        if not rep:
+            return self._not_found(rep_name)
+
+        stats = self.rep_stats.get(rep.id)
+        status_counts = {
+            "closed won": stats.won_deals,
+            "closed lost": stats.lost_deals,
+            "in progress": stats.in_progress_deals,
+        }
+        count = status_counts.get(status.lower())
+        if count is None:
+            codes = [code for code, name in enumerate(self.data.statuses) if name.lower() == status.lower()]
+            count = int(np.isin(self.data.deal_status[rep.deal_start:rep.deal_end], codes).sum())
+        return {"rep_name": rep.name, "status": status, "count": count, "total_deals": stats.total_deals}
+
+    def get_rep_performance(self, rep_name: str) -> str:
+        performance = self.rep_performance(rep_name)
+        if "error" in performance:
+            return performance["error"]
+
+        return f"""
+        Performance for {performance["rep_name"]} ({performance["role"]}, {performance["region"]}):
+        - Region: {performance["region"]}
+        - Total Deals: {performance["total_deals"]}
+        - Closed Won: {performance["won_deals"]}
+        - Closed Lost: {performance["lost_deals"]}
+        - In Progress: {performance["in_progress_deals"]}
+        - Win rate: {performance["win_rate"]:.1f}%
+        - Total pipeline value: {performance["total_value"]:,.2f}
+        """
+
+    def compare_reps(self, rep1_name: str, rep2_name: str) -> str:
+        """
+        Compare performance of two sales reps.
+        """
+        comparison = self.rep_comparison(rep1_name, rep2_name)
+        if "error" in comparison:
+            return comparison["error"]
+        rep1, rep2 = comparison["reps"]
 
         return f"""
         Performance comparison:
         
-        {rep1.name} ({rep1.role}, {rep1.region}):
-        - Closed Won deals: {rep1_statuses_count.get("Closed Won", 0)} of {len(rep1.deals)}
-        - Closed Won value: {rep1.get_deals_value_by_status("Closed Won"):,.2f}
-        - Win Rate: {rep1.win_rate():.1f}%
-        - Clients: {len(rep1.clients)}
+        {rep1["rep_name"]} ({rep1["role"]}, {rep1["region"]}):
+        - Closed Won deals: {rep1["won_deals"]} of {rep1["total_deals"]}
+        - Closed Won value: {rep1["won_value"]:,.2f}
+        - Win Rate: {rep1["win_rate"]:.1f}%
+        - Clients: {rep1["client_count"]}
         
-        {rep2.name} ({rep2.role}, {rep2.region}):
-        - Closed Won deals: {rep2_statuses_count.get("Closed Won", 0)} of {len(rep2.deals)}
-        - Closed Won value: {rep2.get_deals_value_by_status("Closed Won"):,.2f}
-        - Win Rate: {rep2.win_rate():.1f}%
-        - Clients: {len(rep2.clients)}
+        {rep2["rep_name"]} ({rep2["role"]}, {rep2["region"]}):
+        - Closed Won deals: {rep2["won_deals"]} of {rep2["total_deals"]}
+        - Closed Won value: {rep2["won_value"]:,.2f}
+        - Win Rate: {rep2["win_rate"]:.1f}%
+        - Clients: {rep2["client_count"]}
+        """
+
+    def count_deals_by_status(self, rep_name: str, status: str) -> str:
+        """
+        Count a sales rep's deals with a given status.
         """
+        counted = self.deal_status_count(rep_name, status)
+        if "error" in counted:
+            return counted["error"]
+        return f"{counted['rep_name']} has {counted['count']} {status} deal(s) out of {counted['total_deals']} total deals."
+
+    def get_tools(self) -> List[StructuredTool]:
+        """
+        The analytics as agent tools returning structured data. They are coroutines, so
+        the tool calls of one agent step run concurrently on the event loop.
+        """
+        def tool_from(method, name: str, description: str, args_schema) -> StructuredTool:
+            async def coroutine(**kwargs: Any) -> Dict[str, Any]:
+                return method(**kwargs)
+
+            return StructuredTool.from_function(
+                func=method, coroutine=coroutine, name=name, description=description, args_schema=args_schema)
 
-    def get_tools(self) -> List[Tool]:
         return [
-            Tool(
-                name="get_rep_performance",
-                description="Get performance metrics for a spesific sales representative",
-                func=self.get_rep_performance,
-                args_schema=ToolSchema_RepName,
-            ),
-            Tool(
-                name="compare_reps",
-                description="Compare performance metrics between two sales representatives",
-                func=self.compare_reps,
-                args_schema=ToolSchema_CompareReps,
-            )
+            tool_from(
+                self.rep_performance, "get_rep_performance",
+                "Get performance metrics for a specific sales representative", ToolSchema_RepName),
+            tool_from(
+                self.rep_comparison, "compare_reps",
+                "Compare performance metrics between two sales representatives", ToolSchema_CompareReps),
+            tool_from(
+                self.deal_status_count, "count_deals_by_status",
+                "Count the deals of a sales representative with a given status", ToolSchema_RepDealStatus),
         ]
@@ -0,0 +1,192 @@
+"""
+Document embeddings stored in the sales data snapshot file, and a read-only vector store
+searching them in place.
+
+Building the snapshot file embeds every rep document once; workers started with
+SALES_DATA_SNAPSHOT_FILE then map the file and run nearest-neighbour search directly on
+the mapped matrix, instead of each embedding the documents into its own vector index.
+
+    python -m backend.ai.vectors --output /var/lib/sales-dashboard/sales.snapshot
+
+Re-run it whenever the data file changes: the file is replaced atomically and watching
+workers re-map it.
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from backend.data.compact import StringColumn
+from backend.data.mapped import DocumentVectors
+from backend.data.snapshot import SalesDataSnapshot
+from .embeddings import create_embeddings
+from .utils import SalesRepDocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+# Documents embedded per call while building, bounding the memory of one batch
+EMBEDDING_BATCH_SIZE = 256
+
+
+def vectors_meta(embedding_space: str, chunk_size: int) -> Dict[str, Any]:
+    """Describe how document vectors were built, so a worker only uses vectors matching its own settings."""
+    return {"embedding_space": embedding_space, "chunk_size": chunk_size}
+
+
+def embed_documents(documents: List[Document], embeddings: Embeddings, meta: Dict[str, Any]) -> DocumentVectors:
+    """
+    Embed documents into a normalized matrix for a snapshot file
+
+    Args:
+        documents: Rep documents, each with an id and a rep_id in its metadata
+        embeddings: Embedding model
+        meta: See `vectors_meta`
+
+    Returns:
+        DocumentVectors: One row per document, in document order
+    """
+    batches = [
+        np.asarray(embeddings.embed_documents([document.page_content for document in documents[start:start + EMBEDDING_BATCH_SIZE]]), dtype=np.float32)
+        for start in range(0, len(documents), EMBEDDING_BATCH_SIZE)
+    ]
+    matrix = np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    return DocumentVectors(
+        ids=StringColumn.from_strings(document.id for document in documents),
+        rep_ids=np.asarray([document.metadata["rep_id"] for document in documents], dtype=np.int64),
+        matrix=matrix,
+        meta=meta,
+    )
+
+
+def build_snapshot_file(
+    data_file: Union[str, Path],
+    output: Union[str, Path],
+    embeddings: Optional[Embeddings],
+    embedding_space: str,
+    chunk_size: int,
+) -> Path:
+    """
+    Load the JSON data file and write it to a snapshot file, with the embedding matrix of
+    its rep documents
+
+    Args:
+        data_file: JSON data file
+        output: Snapshot file to write
+        embeddings: Embedding model, or None to write the data without vectors
+        embedding_space: Name of the embedding model's vector space (see create_embeddings)
+        chunk_size: Document chunk size the workers use (AI_DOCUMENT_CHUNK_SIZE)
+
+    Returns:
+        Path: The written file
+    """
+    snapshot = SalesDataSnapshot.load(data_file)
+    vectors = None
+    if embeddings is not None:
+        documents = SalesRepDocumentProcessor.create_documents_from_sales_data(
+            snapshot.data, snapshot.stats, chunk_size)
+        vectors = embed_documents(documents, embeddings, vectors_meta(embedding_space, chunk_size))
+    path = snapshot.save(output, vectors)
+    logger.info(
+        "Snapshot file %s written (version %s, %d reps, %d document vectors)",
+        path, snapshot.version[:12], len(snapshot.data), len(vectors) if vectors is not None else 0)
+    return path
+
+
+class MappedVectorStore(VectorStore):
+    """
+    Read-only vector store over the document vectors of a snapshot file. Search is an
+    exact cosine top-k over the mapped matrix, so no worker holds its own copy of the
+    vectors. Results are the given Document objects, matched to the rows by id.
+    """
+
+    def __init__(self, embedding: Embeddings, vectors: DocumentVectors, documents: List[Document]):
+        """
+        Args:
+            embedding: Model embedding the queries, the one the vectors were built with
+            vectors: Mapped document vectors
+            documents: The documents the vectors were built from, in the same order
+
+        Raises:
+            ValueError: If the documents are not those the vectors were built from
+        """
+        if len(documents) != len(vectors) or vectors.ids.tolist() != [document.id for document in documents]:
+            raise ValueError("The snapshot file's document vectors were built from different documents")
+        self._embedding = embedding
+        self._vectors = vectors
+        self._documents = documents
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("Snapshot file vectors are read-only; rebuild the snapshot file instead")
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None, **kwargs: Any):
+        raise NotImplementedError("Build the vectors with build_snapshot_file")
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Document]:
+        return self.similarity_search_by_vector(self._embedding.embed_query(query), k, filter)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self._search(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Search by query text, with the cosine similarity of every result (higher is closer)."""
+        return self._search(self._embedding.embed_query(query), k, filter)
+
+    def _search(self, embedding: List[float], k: int, filter: Optional[Dict[str, Any]]) -> List[Tuple[Document, float]]:
+        matrix = self._vectors.matrix
+        rows = None
+        if filter:
+            unsupported = set(filter) - {"rep_id"}
+            if unsupported:
+                raise ValueError(f"Unsupported filter fields: {', '.join(sorted(unsupported))}")
+            rows = np.flatnonzero(self._vectors.rep_ids == filter["rep_id"])
+            matrix = matrix[rows]
+        if k <= 0 or len(matrix) == 0:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix @ (query / norm if norm else query)
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        # Best first, ties in document order
+        top = top[np.lexsort((top, -scores[top]))]
+        positions = rows[top] if rows is not None else top
+        return [(self._documents[position], float(scores[row])) for position, row in zip(positions.tolist(), top.tolist())]
+
+
+def main():
+    from backend.config import get_env_settings
+
+    settings = get_env_settings()
+    parser = argparse.ArgumentParser(description="Build the sales data snapshot file mapped by the workers.")
+    parser.add_argument("--data-file", default=settings.SALES_DATA_FILE)
+    parser.add_argument(
+        "--output", default=settings.SALES_DATA_SNAPSHOT_FILE or str(Path(__file__).parent.parent / "data" / "sales.snapshot"))
+    parser.add_argument("--no-vectors", action="store_true", help="Only write the data, without document embeddings")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    embeddings, embedding_space = None, ""
+    if not args.no_vectors:
+        embeddings, embedding_space = create_embeddings(
+            settings.AI_EMBEDDING_BACKEND, settings.AI_EMBEDDING_MODEL, settings.AI_EMBEDDING_DIMENSIONS)
+    build_snapshot_file(args.data_file, args.output, embeddings, embedding_space, settings.AI_DOCUMENT_CHUNK_SIZE)
+
+
+if __name__ == "__main__":
+    main()
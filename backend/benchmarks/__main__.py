@@ -0,0 +1,62 @@
+"""
+Run the benchmark suite, the micro-benchmarks and the HTTP load test, on one synthetic
+data file and write the results to a single JSON file. Compare two such files with
+`python -m backend.benchmarks.compare`.
+
+Usage:
+    python -m backend.benchmarks --reps 10000 --deals 200000 --output before.json
+    python -m backend.benchmarks --data-file backend/data/mock/dummyData.json --output dummy.json
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from . import load, micro
+from .common import environment, write_results
+from .fake_llm import FakeChatModel
+from .synthetic import cached_sales_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-file", help="Benchmark this data file instead of a synthetic one")
+    parser.add_argument("--reps", type=int, default=1000)
+    parser.add_argument("--deals", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=str(Path(tempfile.gettempdir()) / "sales-benchmarks"),
+                        help="Where synthetic data files are kept between runs")
+    parser.add_argument("--backends", nargs="+", default=list(micro.STORAGE_BACKENDS), choices=micro.STORAGE_BACKENDS,
+                        help="Storage backends of the micro-benchmarks; the load test runs on each too")
+    parser.add_argument("--only", help="Only run cases and routes whose name matches this regular expression")
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--min-seconds", type=float, default=0.2)
+    parser.add_argument("--requests", type=int, default=200, help="Load test requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--skip-load", action="store_true", help="Only run the micro-benchmarks")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.data_file:
+        data_file, data = Path(args.data_file), {"data_file": args.data_file}
+    else:
+        data_file = cached_sales_data(args.cache_dir, args.reps, args.deals, args.seed)
+        data = {"data_file": str(data_file), "reps": args.reps, "deals": args.deals, "seed": args.seed}
+
+    results = {
+        "environment": environment(),
+        "data": data,
+        "micro": micro.run(data_file, args.backends, args.only, args.min_runs, args.min_seconds, seed=args.seed),
+    }
+    if not args.skip_load:
+        results["load"] = {
+            backend: load.run(
+                data_file, backend, args.requests, args.concurrency, args.only,
+                FakeChatModel(latency_ms=args.llm_latency_ms), seed=args.seed)
+            for backend in args.backends
+        }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
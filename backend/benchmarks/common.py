@@ -0,0 +1,124 @@
+"""
+Helpers shared by the benchmarks: timing, latency summaries, run metadata, JSON output
+and pointing the app's settings at a benchmark data file.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+def summarize(durations: Sequence[float]) -> Dict[str, Any]:
+    """
+    Summarize durations in seconds as latency percentiles in milliseconds
+
+    Args:
+        durations: Measured durations
+
+    Returns:
+        Dict: count, mean, p50, p95, p99 and max
+    """
+    if not len(durations):
+        return {"count": 0}
+    milliseconds = np.asarray(durations) * 1000
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+    return {
+        "count": len(milliseconds),
+        "mean_ms": round(float(milliseconds.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(milliseconds.max()), 4),
+    }
+
+
+def time_call(function: Callable[[], Any], min_runs: int = 3, min_seconds: float = 0.2, max_runs: int = 1000) -> List[float]:
+    """
+    Call a function repeatedly: at least `min_runs` times, then until `min_seconds` have
+    passed, at most `max_runs` times
+
+    Returns:
+        List[float]: Duration of every call in seconds
+    """
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_runs and (len(durations) < min_runs or time.perf_counter() - started < min_seconds):
+        call_started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - call_started)
+    return durations
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code a benchmark ran on, so results are compared like with like."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def write_results(results: Dict[str, Any], output: Optional[str]) -> None:
+    """Print the results as JSON, and write them to `output` if given."""
+    text = json.dumps(results, indent=2)
+    if output:
+        Path(output).write_text(text)
+    print(text)
+
+
+def _clear_cached_settings() -> None:
+    from backend.config import get_env_settings
+    from backend.data.service import get_sales_data_store, get_sqlite_sales_rep_service
+    get_env_settings.cache_clear()
+    get_sales_data_store.cache_clear()
+    get_sqlite_sales_rep_service.cache_clear()
+
+
+@contextmanager
+def configured_app(data_file: Path, work_dir: Path, **settings: Any) -> Iterator[None]:
+    """
+    Point the app's settings at a benchmark data file, with the offline embedding backend
+    and a fresh vector index, dropping any settings or data already loaded; the previous
+    environment is restored on exit
+
+    Args:
+        data_file: Sales data file to serve
+        work_dir: Directory for the vector index and the SQLite database
+        settings: Other settings overrides, by environment variable name
+    """
+    overrides = {
+        "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY") or "benchmark",
+        "SALES_DATA_FILE": str(data_file),
+        "SALES_DATA_DATABASE": str(work_dir / "sales.db"),
+        "SALES_DATA_SNAPSHOT_FILE": "",
+        "SALES_DATA_WATCH": "false",
+        "AI_EMBEDDING_BACKEND": "hashing",
+        "AI_INDEX_DIR": str(work_dir / "vector_index"),
+        "AI_WARMUP_QUERY": "",
+        **settings,
+    }
+    saved = dict(os.environ)
+    os.environ.update({name: str(value) for name, value in overrides.items()})
+    _clear_cached_settings()
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+        _clear_cached_settings()
@@ -0,0 +1,113 @@
+"""
+Compare two benchmark result files (from `python -m backend.benchmarks` or any single
+benchmark with --output) and flag regressions.
+
+Every latency (mean/p50/p95/p99, lower is better) and throughput (ops or requests per
+second, higher is better) present in both files is compared. A metric regresses when it
+got worse by more than --threshold; the exit status is 1 if any did, so it can gate CI.
+
+Usage:
+    python -m backend.benchmarks.compare before.json after.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+LOWER_IS_BETTER = ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+HIGHER_IS_BETTER = ("ops_per_second", "requests_per_second")
+
+# Latencies below this many milliseconds are timer noise, not regressions
+NOISE_FLOOR_MS = 0.05
+
+
+def iter_metrics(results: Any, path: Tuple[str, ...] = ()) -> Iterator[Tuple[str, float]]:
+    """Yield every comparable metric of a result file as ("micro/service/memory/.../p50_ms", value)."""
+    if not isinstance(results, dict):
+        return
+    for key, value in results.items():
+        if key == "environment":
+            continue
+        if key in LOWER_IS_BETTER + HIGHER_IS_BETTER and isinstance(value, (int, float)):
+            yield "/".join(path + (key,)), float(value)
+        else:
+            yield from iter_metrics(value, path + (key,))
+
+
+def compare(
+    before: Dict[str, Any], after: Dict[str, Any], threshold: float, metrics: Sequence[str] = LOWER_IS_BETTER + HIGHER_IS_BETTER,
+) -> List[Dict[str, Any]]:
+    """
+    Compare the metrics two result files have in common
+
+    Args:
+        before: Baseline results
+        after: New results
+        threshold: Relative change counted as a regression or an improvement (0.1 is 10%)
+        metrics: Metric names to compare, e.g. only p50_ms on noisy machines
+
+    Returns:
+        List[Dict]: One row per metric with both values, the relative change (positive is
+            worse) and a verdict: "regression", "improvement" or "same"
+    """
+    baseline = dict(iter_metrics(before))
+    rows = []
+    for name, value in iter_metrics(after):
+        metric = name.rsplit("/", 1)[-1]
+        if name not in baseline or metric not in metrics:
+            continue
+        previous = baseline[name]
+        lower_is_better = metric in LOWER_IS_BETTER
+        if lower_is_better and max(previous, value) < NOISE_FLOOR_MS:
+            change = 0.0
+        elif previous == 0:
+            change = 0.0 if value == 0 else float("inf")
+            change = change if lower_is_better else -change
+        else:
+            change = (value - previous) / previous
+            change = change if lower_is_better else -change
+        verdict = "regression" if change > threshold else "improvement" if change < -threshold else "same"
+        rows.append({"metric": name, "before": previous, "after": value, "change": change, "verdict": verdict})
+    return rows
+
+
+def _environment_differences(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    keys = ("python", "platform", "cpu_count", "numpy")
+    first, second = before.get("environment", {}), after.get("environment", {})
+    differences = [f"{key}: {first.get(key)} -> {second.get(key)}" for key in keys if first.get(key) != second.get(key)]
+    if before.get("data") != after.get("data"):
+        differences.append(f"data: {before.get('data')} -> {after.get('data')}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before", help="Baseline result file")
+    parser.add_argument("after", help="New result file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change counted as a regression")
+    parser.add_argument("--metrics", nargs="+", default=list(LOWER_IS_BETTER + HIGHER_IS_BETTER),
+                        choices=LOWER_IS_BETTER + HIGHER_IS_BETTER, help="Metrics to compare")
+    parser.add_argument("--all", action="store_true", help="Also list metrics that did not change")
+    parser.add_argument("--output", help="Write the comparison as JSON to this file")
+    args = parser.parse_args()
+
+    before, after = (json.loads(Path(path).read_text()) for path in (args.before, args.after))
+    for difference in _environment_differences(before, after):
+        print(f"warning: runs differ in {difference}", file=sys.stderr)
+
+    rows = compare(before, after, args.threshold, args.metrics)
+    for row in rows:
+        if args.all or row["verdict"] != "same":
+            print(f"{row['verdict']:<12} {row['change']:+8.1%}  {row['before']:>12.4f} -> {row['after']:>12.4f}  {row['metric']}")
+    regressions = sum(row["verdict"] == "regression" for row in rows)
+    improvements = sum(row["verdict"] == "improvement" for row in rows)
+    print(f"{len(rows)} metrics compared: {regressions} regressions, {improvements} improvements "
+          f"(threshold {args.threshold:.0%})")
+    if args.output:
+        Path(args.output).write_text(json.dumps(rows, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare embedding backends on the rep documents: startup time, indexing and query latency,
+and retrieval quality (recall@k and MRR) on questions generated from the data itself.
+
+    python -m backend.benchmarks.embedding_backends --backends hashing huggingface --output results.json
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from backend.ai.embeddings import EMBEDDING_BACKENDS, create_embeddings
+from backend.ai.utils import SalesRepDocumentProcessor
+from backend.data.schemas import SalesData
+from backend.data.snapshot import SalesDataSnapshot
+
+DEFAULT_DATA_FILE = Path(__file__).parent.parent / "data" / "mock" / "dummyData.json"
+
+
+def build_queries(data: SalesData) -> List[Tuple[str, Set[int]]]:
+    """Generate questions with known relevant rep ids: by rep name, by client and by region plus skill."""
+    queries = []
+    reps_by_client: Dict[str, Set[int]] = {}
+    reps_by_region_skill: Dict[Tuple[str, str], Set[int]] = {}
+    for rep in data.salesReps:
+        queries.append((f"What deals does {rep.name} have?", {rep.id}))
+        for client in {deal.client for deal in rep.deals} | {client.name for client in rep.clients}:
+            reps_by_client.setdefault(client, set()).add(rep.id)
+        for skill in rep.skills:
+            reps_by_region_skill.setdefault((rep.region, skill), set()).add(rep.id)
+
+    queries += [(f"Who works with {client}?", rep_ids) for client, rep_ids in reps_by_client.items()]
+    queries += [
+        (f"Which reps in {region} are skilled in {skill}?", rep_ids)
+        for (region, skill), rep_ids in reps_by_region_skill.items()
+    ]
+    return queries
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def run_backend(backend: str, snapshot: SalesDataSnapshot, queries: List[Tuple[str, Set[int]]], k: int, model_name: str, dimensions: int, chunk_size: int) -> Dict:
+    started = time.perf_counter()
+    embeddings, embedding_space = create_embeddings(backend, model_name, dimensions)
+    embeddings.embed_query("warm up")
+    startup_seconds = time.perf_counter() - started
+
+    documents = SalesRepDocumentProcessor.create_documents_from_sales_data(snapshot.data, snapshot.stats, chunk_size)
+    doc_rep_ids = np.asarray([document.metadata["rep_id"] for document in documents])
+    started = time.perf_counter()
+    doc_matrix = _normalize(np.asarray(embeddings.embed_documents([document.page_content for document in documents])))
+    index_seconds = time.perf_counter() - started
+
+    latencies, recalls, reciprocal_ranks = [], [], []
+    for question, relevant in queries:
+        started = time.perf_counter()
+        query_vector = np.asarray(embeddings.embed_query(question))
+        latencies.append(time.perf_counter() - started)
+
+        scores = doc_matrix @ (query_vector / (np.linalg.norm(query_vector) or 1))
+        ranked = doc_rep_ids[np.argsort(-scores)]
+        top_k = set(ranked[:k].tolist())
+        recalls.append(len(top_k & relevant) / min(len(relevant), k))
+        first_hit = next((rank for rank, rep_id in enumerate(ranked, start=1) if rep_id in relevant), None)
+        reciprocal_ranks.append(1 / first_hit if first_hit else 0.0)
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        "backend": backend,
+        "embedding_space": embedding_space,
+        "documents": len(documents),
+        "queries": len(queries),
+        "startup_seconds": round(startup_seconds, 4),
+        "index_seconds": round(index_seconds, 4),
+        "query_latency_ms_p50": round(statistics.median(latencies_ms), 3),
+        "query_latency_ms_p95": round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 3),
+        f"recall_at_{k}": round(statistics.mean(recalls), 4),
+        "mrr": round(statistics.mean(reciprocal_ranks), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-file", default=str(DEFAULT_DATA_FILE))
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDING_BACKENDS), choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--model-name", default="all-MiniLM-L6-v2")
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    snapshot = SalesDataSnapshot.load(args.data_file)
+    queries = build_queries(snapshot.data.to_model())
+
+    results = []
+    for backend in args.backends:
+        try:
+            results.append(run_backend(backend, snapshot, queries, args.k, args.model_name, args.dimensions, args.chunk_size))
+        except ImportError as e:
+            results.append({"backend": backend, "error": f"Backend unavailable: {e}"})
+
+    output = json.dumps({"data_file": args.data_file, "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import orjson
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for the Gemini chat model, passed as RAGChatBotService(llm=...).
+
+    Answers after `latency_ms` (time to first token) and then produces `answer_tokens`
+    tokens `token_interval_ms` apart, streamed one by one. The answer states the prompt
+    size, so it is deterministic for a given question and retrieved context.
+
+    With tools bound, the first turn requests every call in `tool_calls` at once (each a
+    dict with the tool `name` and its `args`), and the turn after the tool results answers.
+    """
+
+    latency_ms: float = 0.0
+    token_interval_ms: float = 0.0
+    answer_tokens: int = 40
+    tool_calls: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat-model"
+
+    def bind_tools(
+        self, tools: Sequence[Union[Dict[str, Any], type, Callable, BaseTool]], **kwargs: Any,
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _requested_tool_calls(self, messages: List[BaseMessage], tools: Optional[list]) -> List[Dict[str, Any]]:
+        if not tools or any(isinstance(message, ToolMessage) for message in messages):
+            return []
+        return [{"name": call["name"], "args": call["args"], "id": f"call_{position}"}
+                for position, call in enumerate(self.tool_calls)]
+
+    def _tool_call_chunk(self, tool_calls: List[Dict[str, Any]]) -> ChatGenerationChunk:
+        return ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+            {"name": call["name"], "args": orjson.dumps(call["args"]).decode(), "id": call["id"], "index": position}
+            for position, call in enumerate(tool_calls)
+        ]))
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        prompt_chars = sum(len(message.content) for message in messages if isinstance(message.content, str))
+        tokens = [f"Answer from {prompt_chars} prompt characters."]
+        return tokens + [f" token{position}" for position in range(1, self.answer_tokens)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tool_calls = self._requested_tool_calls(messages, kwargs.get("tools"))
+        if tool_calls:
+            time.sleep(self.latency_ms / 1000)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=tool_calls))])
+        tokens = self._tokens(messages)
+        time.sleep((self.latency_ms + self.token_interval_ms * (len(tokens) - 1)) / 1000)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tool_calls = self._requested_tool_calls(messages, kwargs.get("tools"))
+        if tool_calls:
+            await asyncio.sleep(self.latency_ms / 1000)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=tool_calls))])
+        tokens = self._tokens(messages)
+        await asyncio.sleep((self.latency_ms + self.token_interval_ms * (len(tokens) - 1)) / 1000)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        tool_calls = self._requested_tool_calls(messages, kwargs.get("tools"))
+        if tool_calls:
+            time.sleep(self.latency_ms / 1000)
+            yield self._tool_call_chunk(tool_calls)
+            return
+        for position, token in enumerate(self._tokens(messages)):
+            time.sleep((self.token_interval_ms if position else self.latency_ms) / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tool_calls = self._requested_tool_calls(messages, kwargs.get("tools"))
+        if tool_calls:
+            await asyncio.sleep(self.latency_ms / 1000)
+            yield self._tool_call_chunk(tool_calls)
+            return
+        for position, token in enumerate(self._tokens(messages)):
+            await asyncio.sleep((self.token_interval_ms if position else self.latency_ms) / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
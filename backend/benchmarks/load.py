@@ -0,0 +1,267 @@
+"""
+In-process HTTP load test of every /api/sales-reps and /api/ai route, on a synthetic data
+file and with the fake chat model, so it runs offline and needs no server.
+
+Requests go through httpx's ASGI transport straight into the FastAPI app, `--concurrency`
+at a time, and each route is reported as latency percentiles, requests per second and
+status code counts. The ASGI transport buffers streamed responses, so /api/ai/stream is
+timed to its last event.
+
+Usage:
+    python -m backend.benchmarks.load --reps 10000 --deals 200000 --concurrency 32 --output load.json
+    python -m backend.benchmarks.load --backend mapped --set AI_CACHE_ENABLED=false --llm-latency-ms 300
+"""
+import argparse
+import asyncio
+import itertools
+import re
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import httpx
+from fastapi import FastAPI
+
+from backend.data.columnar import GROUP_BY_FIELDS
+from backend.data.snapshot import SalesDataSnapshot
+from backend.data.stats import LEADERBOARD_METRICS
+from .common import configured_app, environment, summarize, write_results
+from .fake_llm import FakeChatModel
+from .micro import STORAGE_BACKENDS, Samples
+from .synthetic import cached_sales_data
+
+
+class Scenario(NamedTuple):
+    """Requests to one route; the paths (and bodies) are cycled through."""
+    name: str
+    method: str
+    paths: Sequence[str]
+    bodies: Optional[Sequence[Dict[str, Any]]] = None
+
+
+def scenarios(samples: Samples) -> List[Scenario]:
+    """One scenario per route, with inputs sampled from the data."""
+    rep_ids = samples.rep_ids
+    names = samples.rep_names
+    prefix = "/api/sales-reps"
+    tool_questions = [{"message": f"How many deals has {name} won?", "rep_context_id": None} for name in names]
+    llm_questions = [
+        {"message": f"Which industries does {name} sell to, and what is in the pipeline?", "rep_context_id": rep_id}
+        for name, rep_id in zip(names, rep_ids)
+    ]
+    return [
+        Scenario("GET /api/sales-reps/", "GET", [f"{prefix}/"]),
+        Scenario("GET /api/sales-reps/?limit", "GET", [f"{prefix}/?limit=100&fields=id,name,region,stats"]),
+        Scenario("GET /api/sales-reps/analytics", "GET",
+                 [f"{prefix}/analytics?group_by={group_by}" for group_by in GROUP_BY_FIELDS]),
+        Scenario("GET /api/sales-reps/stats", "GET", [f"{prefix}/stats"]),
+        Scenario("GET /api/sales-reps/leaderboard/{metric}", "GET",
+                 [f"{prefix}/leaderboard/{metric}?k=10" for metric in LEADERBOARD_METRICS]),
+        Scenario("GET /api/sales-reps/{rep_id}", "GET", [f"{prefix}/{rep_id}" for rep_id in rep_ids]),
+        Scenario("GET /api/sales-reps/{rep_id}/stats", "GET", [f"{prefix}/{rep_id}/stats" for rep_id in rep_ids]),
+        Scenario("GET /api/sales-reps/{rep_id}/deals", "GET", [f"{prefix}/{rep_id}/deals?limit=50" for rep_id in rep_ids]),
+        Scenario("GET /api/sales-reps/{rep_id}/clients", "GET", [f"{prefix}/{rep_id}/clients?limit=50" for rep_id in rep_ids]),
+        Scenario("GET /api/sales-reps/region/{region}", "GET", [f"{prefix}/region/{region}" for region in samples.regions]),
+        Scenario("GET /api/sales-reps/skill/{skill}", "GET", [f"{prefix}/skill/{skill}" for skill in samples.skills]),
+        Scenario("GET /api/sales-reps/deals/status/{status}", "GET",
+                 [f"{prefix}/deals/status/{status}" for status in samples.statuses]),
+        Scenario("POST /api/ai/ (tool)", "POST", ["/api/ai/"], tool_questions),
+        Scenario("POST /api/ai/ (llm)", "POST", ["/api/ai/"], llm_questions),
+        Scenario("POST /api/ai/stream", "POST", ["/api/ai/stream"], llm_questions),
+        Scenario("POST /api/ai/batch", "POST", ["/api/ai/batch"],
+                 [{"questions": (tool_questions + llm_questions)[start:start + 20]}
+                  for start in range(0, len(tool_questions) + len(llm_questions), 20)]),
+        Scenario("GET /api/ai/cache", "GET", ["/api/ai/cache"]),
+        Scenario("GET /api/ai/embeddings", "GET", ["/api/ai/embeddings"]),
+    ]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Send `requests` requests of a scenario, `concurrency` at a time
+
+    Returns:
+        Dict: Latency summary, requests per second and status code counts
+    """
+    paths = itertools.cycle(scenario.paths)
+    bodies = itertools.cycle(scenario.bodies) if scenario.bodies else itertools.repeat(None)
+    remaining = iter(range(requests))
+    durations: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        for _ in remaining:
+            path, body = next(paths), next(bodies)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            durations.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(durations),
+        "requests_per_second": round(len(durations) / elapsed, 2) if elapsed else None,
+        "status_counts": dict(sorted(statuses.items())),
+    }
+
+
+@contextmanager
+def benchmark_app(data_file: Path, work_dir: Path, backend: str, llm: FakeChatModel, settings: Dict[str, str]) -> Iterator[FastAPI]:
+    """
+    Configure the app on a data file and storage backend, and install the AI service with
+    the fake chat model in place of the lifespan startup
+
+    Args:
+        data_file: Sales data file to serve
+        work_dir: Directory for the database, snapshot file and vector index
+        backend: Storage backend, see STORAGE_BACKENDS
+        llm: Chat model of the AI service
+        settings: Other settings overrides, by environment variable name
+
+    Yields:
+        FastAPI: The app, ready to serve until the context exits
+    """
+    from backend.config import get_env_settings
+
+    overrides = {"SALES_DATA_BACKEND": "sqlite" if backend == "sqlite" else "memory", **settings}
+    if backend == "mapped":
+        from backend.ai.embeddings import create_embeddings
+        from backend.ai.vectors import build_snapshot_file
+
+        with configured_app(data_file, work_dir, **overrides):
+            env = get_env_settings()
+            embeddings, embedding_space = create_embeddings(
+                env.AI_EMBEDDING_BACKEND, env.AI_EMBEDDING_MODEL, env.AI_EMBEDDING_DIMENSIONS)
+            overrides["SALES_DATA_SNAPSHOT_FILE"] = str(build_snapshot_file(
+                data_file, work_dir / "sales.snapshot", embeddings, embedding_space, env.AI_DOCUMENT_CHUNK_SIZE))
+
+    with configured_app(data_file, work_dir, **overrides):
+        from backend.ai.service import RAGChatBotService
+        from backend.data.service import SalesRepService, get_sales_data_snapshot
+        from backend.main import create_app
+
+        # Built here so the app reads the overridden settings
+        app = create_app()
+        app.state.rag_chatbot_service = RAGChatBotService(SalesRepService(get_sales_data_snapshot()), llm=llm)
+        app.state.rag_chatbot_error = None
+        try:
+            yield app
+        finally:
+            app.state.rag_chatbot_service = None
+
+
+async def run_load(app: FastAPI, samples: Samples, requests: int, concurrency: int, only: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run every scenario against the app in turn
+
+    Returns:
+        Dict: Results per scenario
+    """
+    results = {}
+    # Report app errors as 500 responses, as a server would, instead of raising them here
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for scenario in scenarios(samples):
+            if only and not re.search(only, scenario.name):
+                continue
+            results[scenario.name] = await run_scenario(client, scenario, requests, concurrency)
+    return results
+
+
+def run(
+    data_file: Path,
+    backend: str = "memory",
+    requests: int = 200,
+    concurrency: int = 16,
+    only: Optional[str] = None,
+    llm: Optional[FakeChatModel] = None,
+    settings: Optional[Dict[str, str]] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Load-test the app on a data file
+
+    Args:
+        data_file: Sales data file
+        backend: Storage backend, see STORAGE_BACKENDS
+        requests: Requests per route
+        concurrency: Requests in flight at a time
+        only: Regular expression selecting the routes to load
+        llm: Chat model of the AI service, a FakeChatModel answering immediately by default
+        settings: Other settings overrides, by environment variable name
+        seed: Seed of the sampled inputs
+
+    Returns:
+        Dict: Settings of the run and results per route
+    """
+    samples = Samples(SalesDataSnapshot.load(data_file), seed)
+    llm = llm or FakeChatModel()
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        with benchmark_app(data_file, Path(directory), backend, llm, settings or {}) as app:
+            startup_seconds = time.perf_counter() - started
+            routes = asyncio.run(run_load(app, samples, requests, concurrency, only))
+    return {
+        "backend": backend,
+        "requests_per_route": requests,
+        "concurrency": concurrency,
+        "llm": {"latency_ms": llm.latency_ms, "token_interval_ms": llm.token_interval_ms, "answer_tokens": llm.answer_tokens},
+        "settings": settings or {},
+        "startup_seconds": round(startup_seconds, 4),
+        "routes": routes,
+    }
+
+
+def _setting(value: str) -> tuple:
+    name, separator, setting = value.partition("=")
+    if not separator or not name:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {value!r}")
+    return name, setting
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-file", help="Load-test on this data file instead of a synthetic one")
+    parser.add_argument("--reps", type=int, default=1000)
+    parser.add_argument("--deals", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=str(Path(tempfile.gettempdir()) / "sales-benchmarks"),
+                        help="Where synthetic data files are kept between runs")
+    parser.add_argument("--backend", default="memory", choices=STORAGE_BACKENDS)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="Only load routes whose name matches this regular expression")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Fake chat model time to first token")
+    parser.add_argument("--llm-token-interval-ms", type=float, default=0.0, help="Fake chat model time between tokens")
+    parser.add_argument("--llm-answer-tokens", type=int, default=40)
+    parser.add_argument("--set", dest="settings", type=_setting, action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a setting, e.g. AI_CACHE_ENABLED=false (repeatable)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.data_file:
+        data_file, data = Path(args.data_file), {"data_file": args.data_file}
+    else:
+        data_file = cached_sales_data(args.cache_dir, args.reps, args.deals, args.seed)
+        data = {"data_file": str(data_file), "reps": args.reps, "deals": args.deals, "seed": args.seed}
+    llm = FakeChatModel(
+        latency_ms=args.llm_latency_ms, token_interval_ms=args.llm_token_interval_ms, answer_tokens=args.llm_answer_tokens)
+    results = {
+        "environment": environment(),
+        "data": data,
+        "load": run(data_file, args.backend, args.requests, args.concurrency, args.only, llm, dict(args.settings), args.seed),
+    }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Memory benchmark of the loaded sales data: bytes per deal of the Pydantic object graph
+(SalesData.model_validate_json, as the data used to be held) against the compact
+snapshot representation, on a synthetic data file.
+
+Allocations are measured with tracemalloc, which also tracks NumPy buffers. The retained
+size is what stays allocated once loading is done; the peak includes transient parsing.
+
+With --workers, that many processes at once also load the data, either by parsing the
+JSON file or by mapping a snapshot file, and report the private (unshared) memory each
+one added, read from /proc/self/smaps_rollup (Linux only).
+
+Usage:
+    python -m backend.benchmarks.memory --reps 100000 --deals 2000000 --workers 4 --output memory.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from backend.data.schemas import SalesData
+from backend.data.snapshot import SalesDataSnapshot
+from backend.data.service import SalesRepService
+from .synthetic import write_sales_data
+
+
+def measure(load: Callable[[], Any], deal_count: int) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    loaded = load()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+    return {
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "bytes_per_deal": round(retained / max(deal_count, 1), 1),
+        "load_seconds": round(seconds, 3),
+    }
+
+
+def process_memory() -> Dict[str, int]:
+    """Resident, proportional and private (unshared) memory of this process, in bytes."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                fields[key] = int(value.split()[0]) * 1024
+    return {"rss": fields["Rss"], "pss": fields["Pss"], "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _worker(mode: str, path: str, barrier, results) -> None:
+    before = process_memory()
+    snapshot = SalesDataSnapshot.open(path) if mode == "mapped" else SalesDataSnapshot.load(path)
+    # Read every array, so all of the data is resident, then answer a few cheap requests
+    service = SalesRepService(snapshot)
+    arrays = [snapshot.data.arrays(), snapshot.columns.arrays(), snapshot.index.arrays(), snapshot.stats.arrays()]
+    if snapshot.vectors is not None:
+        arrays.append(snapshot.vectors.arrays())
+    for values in (values for group in arrays for values in group.values()):
+        values.sum()
+    for group_by in ("region", "status", "client_industry"):
+        service.get_deal_analytics(group_by, ["sum", "count", "mean", "win_rate"])
+    service.get_leaderboard("won_value", 10)
+    service.get_sales_rep_by_id(1)
+    # Measure while every worker holds the data, so shared pages count as shared
+    barrier.wait()
+    after = process_memory()
+    barrier.wait()
+    results.put({key: after[key] - before[key] for key in after})
+
+
+def measure_workers(mode: str, path: Path, workers: int) -> Dict[str, Any]:
+    """
+    Load the data in `workers` concurrent processes and report the memory each one added
+
+    Args:
+        mode: "json" to parse the data file, "mapped" to map a snapshot file
+        path: The data file or snapshot file
+        workers: Number of processes
+
+    Returns:
+        Dict: Mean private and proportional bytes added per worker
+    """
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(workers), context.Queue()
+    processes = [context.Process(target=_worker, args=(mode, str(path), barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    deltas: List[Dict[str, int]] = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "workers": workers,
+        "private_bytes_per_worker": int(statistics.mean(delta["private"] for delta in deltas)),
+        "pss_bytes_per_worker": int(statistics.mean(delta["pss"] for delta in deltas)),
+    }
+
+
+def run(data_file: Path, deal_count: int) -> Dict[str, Any]:
+    content = data_file.read_bytes()
+    pydantic = measure(lambda: SalesData.model_validate_json(content), deal_count)
+    del content
+    compact = measure(lambda: SalesDataSnapshot.load(data_file), deal_count)
+    return {
+        "data_file": str(data_file),
+        "data_file_bytes": data_file.stat().st_size,
+        "deals": deal_count,
+        "pydantic_models": pydantic,
+        "compact_snapshot": compact,
+        "reduction": round(pydantic["retained_bytes"] / max(compact["retained_bytes"], 1), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reps", type=int, default=50_000)
+    parser.add_argument("--deals", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Also compare per-worker memory with this many processes")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = write_sales_data(Path(directory) / "sales.json", args.reps, args.deals, args.seed)
+        results = run(data_file, args.deals)
+        if args.workers:
+            snapshot_file = SalesDataSnapshot.load(data_file).save(Path(directory) / "sales.snapshot")
+            results["workers"] = {
+                "json": measure_workers("json", data_file, args.workers),
+                "mapped": measure_workers("mapped", snapshot_file, args.workers),
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
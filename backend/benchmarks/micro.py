@@ -0,0 +1,201 @@
+"""
+Micro-benchmarks of every SalesRepService method, for each storage backend, and of the
+AI service's document processor and analytics tools, on a synthetic data file.
+
+Each case is called repeatedly (see --min-runs and --min-seconds) with inputs sampled
+from the data, and reported as latency percentiles and calls per second.
+
+Usage:
+    python -m backend.benchmarks.micro --reps 10000 --deals 200000 --backends memory sqlite mapped --output micro.json
+"""
+import argparse
+import itertools
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from backend.ai.utils import SalesRepDocumentProcessor, SalesAnalyticsTools
+from backend.data.database import SQLiteSalesRepService, import_sales_data
+from backend.data.service import SalesRepService
+from backend.data.snapshot import SalesDataSnapshot
+from backend.data.stats import LEADERBOARD_METRICS
+from backend.data.columnar import GROUP_BY_FIELDS, METRICS
+from .common import environment, summarize, time_call, write_results
+from .synthetic import cached_sales_data
+
+STORAGE_BACKENDS = ("memory", "mapped", "sqlite")
+SAMPLE_SIZE = 100
+
+Case = Callable[[], Any]
+
+
+class Samples:
+    """Inputs sampled from the data, cycled through by the cases so caches see varied keys."""
+
+    def __init__(self, snapshot: SalesDataSnapshot, seed: int = 0):
+        rng = random.Random(seed)
+        data = snapshot.data
+        positions = rng.sample(range(len(data)), min(SAMPLE_SIZE, len(data)))
+        reps = [data.reps[position] for position in positions]
+        self.rep_ids = [rep.id for rep in reps]
+        self.rep_names = [rep.name for rep in reps]
+        self.regions = data.regions.tolist()
+        self.skills = data.skills.tolist()
+        self.statuses = data.statuses.tolist()
+        # Thresholds that most, some and hardly any reps have a deal above
+        values = sorted(data.deal_value.tolist()) or [0]
+        self.deal_values = [values[int(fraction * (len(values) - 1))] for fraction in (0.5, 0.9, 0.999)]
+
+
+def _cycling(function: Callable[[Any], Any], inputs: Sequence[Any]) -> Case:
+    values = itertools.cycle(inputs)
+    return lambda: function(next(values))
+
+
+def service_cases(service, samples: Samples) -> Dict[str, Case]:
+    """Cases for every SalesRepService method; works for the memory and SQLite services alike."""
+    first_page = service.get_sales_reps_page(None, 100, ["id", "name"])
+    return {
+        "get_all_sales_reps": service.get_all_sales_reps,
+        "get_sales_reps_page": lambda: service.get_sales_reps_page(None, 100, ["id", "name", "region", "stats"]),
+        "get_sales_reps_page_next": lambda: service.get_sales_reps_page(first_page.nextCursor, 100, ["id", "name", "region", "stats"]),
+        "get_rep_deals_page": _cycling(lambda rep_id: service.get_rep_deals_page(rep_id, None, 50), samples.rep_ids),
+        "get_rep_clients_page": _cycling(lambda rep_id: service.get_rep_clients_page(rep_id, None, 50), samples.rep_ids),
+        "get_sales_rep_by_id": _cycling(service.get_sales_rep_by_id, samples.rep_ids),
+        "get_sales_reps_by_region": _cycling(service.get_sales_reps_by_region, samples.regions),
+        "get_sales_reps_by_skill": _cycling(service.get_sales_reps_by_skill, samples.skills),
+        "get_deals_by_status": _cycling(service.get_deals_by_status, samples.statuses),
+        "get_reps_with_deals_above_value": _cycling(service.get_reps_with_deals_above_value, samples.deal_values),
+        "get_rep_stats": _cycling(service.get_rep_stats, samples.rep_ids),
+        "get_all_rep_stats": service.get_all_rep_stats,
+        "get_leaderboard": _cycling(lambda metric: service.get_leaderboard(metric, 10), LEADERBOARD_METRICS),
+        "get_leaderboard_by_region": _cycling(lambda region: service.get_leaderboard("won_value", 10, region), samples.regions),
+        "get_rep_performance_summary": service.get_rep_performance_summary,
+        "get_deal_analytics": _cycling(lambda group_by: service.get_deal_analytics(group_by, list(METRICS)), GROUP_BY_FIELDS),
+    }
+
+
+def ai_cases(snapshot: SalesDataSnapshot, samples: Samples, chunk_size: int) -> Dict[str, Case]:
+    """Cases for the document processor and the analytics tools of the AI service."""
+    sample_reps = snapshot.data.rep_models([snapshot.data.position_of(rep_id) for rep_id in samples.rep_ids])
+    tools = SalesAnalyticsTools(snapshot.data, snapshot.stats)
+    name_pairs = list(zip(samples.rep_names, samples.rep_names[1:] + samples.rep_names[:1]))
+    name_statuses = list(zip(samples.rep_names, itertools.cycle(samples.statuses)))
+    return {
+        "document_processor.create_documents_from_sales_data": lambda: SalesRepDocumentProcessor.create_documents_from_sales_data(
+            snapshot.data, snapshot.stats, chunk_size),
+        "document_processor.create_documents_from_rep": _cycling(
+            lambda rep: SalesRepDocumentProcessor.create_documents_from_rep(rep, snapshot.stats.get(rep.id), chunk_size),
+            sample_reps),
+        "analytics_tools.get_rep_performance": _cycling(tools.get_rep_performance, samples.rep_names),
+        "analytics_tools.compare_reps": _cycling(lambda names: tools.compare_reps(*names), name_pairs),
+        "analytics_tools.count_deals_by_status": _cycling(lambda args: tools.count_deals_by_status(*args), name_statuses),
+    }
+
+
+def run_cases(cases: Dict[str, Case], only: Optional[str], min_runs: int, min_seconds: float) -> Dict[str, Any]:
+    results = {}
+    for name, case in cases.items():
+        if only and not re.search(only, name):
+            continue
+        durations = time_call(case, min_runs=min_runs, min_seconds=min_seconds)
+        results[name] = {**summarize(durations), "ops_per_second": round(len(durations) / sum(durations), 2)}
+    return results
+
+
+def open_service(backend: str, data_file: Path, work_dir: Path):
+    """
+    Open a SalesRepService on the data file with the given storage backend
+
+    Returns:
+        Tuple: The service and how long opening it took, in seconds
+    """
+    started = time.perf_counter()
+    if backend == "memory":
+        service = SalesRepService(SalesDataSnapshot.load(data_file))
+    elif backend == "mapped":
+        snapshot_file = SalesDataSnapshot.load(data_file).save(work_dir / "sales.snapshot")
+        started = time.perf_counter()
+        service = SalesRepService(SalesDataSnapshot.open(snapshot_file))
+    elif backend == "sqlite":
+        database = work_dir / "sales.db"
+        import_sales_data(data_file, database)
+        service = SQLiteSalesRepService(database)
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    return service, time.perf_counter() - started
+
+
+def run(
+    data_file: Path,
+    backends: Sequence[str] = STORAGE_BACKENDS,
+    only: Optional[str] = None,
+    min_runs: int = 3,
+    min_seconds: float = 0.2,
+    chunk_size: int = 20,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run the micro-benchmarks on a data file
+
+    Args:
+        data_file: Sales data file
+        backends: Storage backends to benchmark the service methods on
+        only: Regular expression selecting the cases to run
+        min_runs: Minimum calls per case
+        min_seconds: Minimum time spent per case
+        chunk_size: Document chunk size for the document processor
+        seed: Seed of the sampled inputs
+
+    Returns:
+        Dict: Results per backend and per case
+    """
+    snapshot = SalesDataSnapshot.load(data_file)
+    samples = Samples(snapshot, seed)
+    results: Dict[str, Any] = {"service": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in backends:
+            service, open_seconds = open_service(backend, data_file, Path(directory))
+            results["service"][backend] = {
+                "open_seconds": round(open_seconds, 4),
+                "cases": run_cases(service_cases(service, samples), only, min_runs, min_seconds),
+            }
+            del service
+    results["ai"] = run_cases(ai_cases(snapshot, samples, chunk_size), only, min_runs, min_seconds)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-file", help="Benchmark this data file instead of a synthetic one")
+    parser.add_argument("--reps", type=int, default=1000)
+    parser.add_argument("--deals", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=str(Path(tempfile.gettempdir()) / "sales-benchmarks"),
+                        help="Where synthetic data files are kept between runs")
+    parser.add_argument("--backends", nargs="+", default=list(STORAGE_BACKENDS), choices=STORAGE_BACKENDS)
+    parser.add_argument("--only", help="Only run cases whose name matches this regular expression")
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--min-seconds", type=float, default=0.2)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.data_file:
+        data_file, data = Path(args.data_file), {"data_file": args.data_file}
+    else:
+        data_file = cached_sales_data(args.cache_dir, args.reps, args.deals, args.seed)
+        data = {"data_file": str(data_file), "reps": args.reps, "deals": args.deals, "seed": args.seed}
+    results = {
+        "environment": environment(),
+        "data": data,
+        "micro": run(data_file, args.backends, args.only, args.min_runs, args.min_seconds, args.chunk_size, args.seed),
+    }
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
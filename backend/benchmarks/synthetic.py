@@ -0,0 +1,149 @@
+"""
+Deterministic synthetic sales data matching the SalesData schema.
+
+The same arguments always produce the same file, so benchmark runs can be compared.
+Reps are written one at a time, so anything from 10 reps / 100 deals up to 1M reps /
+10M deals (about 1GB of JSON) is generated in constant memory.
+
+Usage:
+    python -m backend.benchmarks.synthetic --reps 100000 --deals 2000000 --output /tmp/sales.json
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+REGIONS = ("North America", "Europe", "Asia-Pacific", "South America", "Middle East", "Africa")
+ROLES = ("Sales Representative", "Senior Sales Executive", "Account Manager", "Sales Manager", "Business Development Rep")
+SKILLS = (
+    "Negotiation", "CRM", "Client Relations", "Lead Generation", "Presentation", "Customer Service",
+    "Sales Strategy", "Data Analysis", "Cold Calling", "Closing", "Market Research", "Account Planning",
+)
+INDUSTRIES = ("Manufacturing", "Retail", "Tech", "Finance", "Healthcare", "Energy", "Logistics", "Education")
+STATUSES = ("Closed Won", "Closed Lost", "In Progress")
+STATUS_WEIGHTS = (0.3, 0.4, 0.3)
+CLIENT_PREFIXES = (
+    "Acme", "Beta", "Gamma", "Delta", "Omega", "Sigma", "Zeta", "Theta", "Nova", "Apex",
+    "Vertex", "Summit", "Pioneer", "Quantum", "Stellar", "Atlas", "Orion", "Vanguard", "Horizon", "Lumen",
+)
+CLIENT_SUFFIXES = ("Corp", "Ltd", "Inc", "LLC", "Group", "Systems", "Holdings", "Partners")
+
+
+def client_name(number: int) -> str:
+    prefix = CLIENT_PREFIXES[number % len(CLIENT_PREFIXES)]
+    suffix = CLIENT_SUFFIXES[(number // len(CLIENT_PREFIXES)) % len(CLIENT_SUFFIXES)]
+    series = number // (len(CLIENT_PREFIXES) * len(CLIENT_SUFFIXES))
+    return f"{prefix} {suffix}" + (f" {series}" if series else "")
+
+
+def hash_name(name: str) -> int:
+    """Stable (not per-process salted) hash of a client name, so a client keeps its industry."""
+    return sum(ord(char) * (i + 1) for i, char in enumerate(name))
+
+
+def iter_reps(rep_count: int, deal_count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate reps as plain dicts in the data file format
+
+    Args:
+        rep_count: Number of reps
+        deal_count: Total number of deals, spread evenly over the reps
+        seed: Random seed
+
+    Yields:
+        Dict: One rep
+    """
+    if rep_count < 1 or deal_count < 0:
+        raise ValueError("At least one rep and a non-negative number of deals are required")
+    rng = random.Random(seed)
+    # Enough distinct clients that names repeat across reps, as in real exports
+    client_pool = max(8, rep_count // 4)
+    for position in range(rep_count):
+        rep_deals = deal_count // rep_count + (1 if position < deal_count % rep_count else 0)
+        clients = [client_name(rng.randrange(client_pool)) for _ in range(rng.randint(1, 5))]
+        # Reps repeat the same deal (client, value, status) often, like the mock data does
+        deals = []
+        while len(deals) < rep_deals:
+            deal = {
+                "client": rng.choice(clients),
+                "value": rng.randrange(5_000, 250_000, 5_000),
+                "status": rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+            }
+            deals += [deal] * min(rng.choice((1, 1, 1, 2, 5)), rep_deals - len(deals))
+        yield {
+            "id": position + 1,
+            "name": f"Rep {position + 1}",
+            "role": rng.choice(ROLES),
+            "region": rng.choice(REGIONS),
+            "skills": rng.sample(SKILLS, rng.randint(2, 4)),
+            "deals": deals,
+            "clients": [
+                {
+                    "name": name,
+                    "industry": INDUSTRIES[hash_name(name) % len(INDUSTRIES)],
+                    "contact": f"contact@{name.lower().replace(' ', '')}.com",
+                }
+                for name in dict.fromkeys(clients)
+            ],
+        }
+
+
+def write_sales_data(path: Union[str, Path], rep_count: int, deal_count: int, seed: int = 0) -> Path:
+    """
+    Write a synthetic `{"salesReps": [...]}` data file
+
+    Args:
+        path: Output file
+        rep_count: Number of reps
+        deal_count: Total number of deals
+        seed: Random seed
+
+    Returns:
+        Path: The written file
+    """
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{"salesReps": [')
+        for position, rep in enumerate(iter_reps(rep_count, deal_count, seed)):
+            if position:
+                file.write(", ")
+            file.write(json.dumps(rep))
+        file.write("]}")
+    return path
+
+
+def cached_sales_data(directory: Union[str, Path], rep_count: int, deal_count: int, seed: int = 0) -> Path:
+    """
+    Get a synthetic data file from a cache directory, generating it on first use
+
+    Args:
+        directory: Cache directory
+        rep_count: Number of reps
+        deal_count: Total number of deals
+        seed: Random seed
+
+    Returns:
+        Path: The data file
+    """
+    path = Path(directory) / f"sales-{rep_count}-{deal_count}-{seed}.json"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".writing")
+        write_sales_data(partial, rep_count, deal_count, seed)
+        partial.replace(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reps", type=int, default=1000)
+    parser.add_argument("--deals", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    write_sales_data(args.output, args.reps, args.deals, args.seed)
+
+
+if __name__ == "__main__":
+    main()
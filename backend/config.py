@@ -1,3 +1,5 @@
+from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
@@ -6,6 +8,84 @@ class EnvironSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
     GEMINI_API_KEY: str
 
+    # Sales data file, reloaded in the background whenever it changes on disk.
+    SALES_DATA_FILE: str = str(Path(__file__).parent / "data" / "mock" / "dummyData.json")
+    SALES_DATA_WATCH: bool = True
+    # Detect changes by polling mtimes instead of inotify (e.g. for network or bind mounts).
+    SALES_DATA_WATCH_FORCE_POLLING: bool = False
+    # Storage of the sales data API: "memory" (the data file loaded into every worker) or
+    # "sqlite" (the data file imported into SALES_DATA_DATABASE, queried per request). With
+    # "sqlite", the data file is re-imported at startup and whenever it changes, and the AI
+    # service reads its data back from the database, so both answer from the same import.
+    # Every worker still holds the compact data, documents and search index the AI service
+    # needs. When SALES_DATA_SNAPSHOT_FILE is set, the AI service maps it instead and is not
+    # tied to the database: rebuild the snapshot and re-import together.
+    SALES_DATA_BACKEND: str = "memory"
+    SALES_DATA_DATABASE: str = str(Path(__file__).parent / "data" / "sales.db")
+    # Prebuilt snapshot file (see `python -m backend.ai.vectors`) mapped by every worker
+    # instead of parsing SALES_DATA_FILE, so the data and the document embeddings are shared
+    # through the page cache. It is watched and re-mapped when rebuilt.
+    SALES_DATA_SNAPSHOT_FILE: Optional[str] = None
+
+    # Question sent through the retriever once the AI service is built, so the
+    # embedding model and vector index are warm before the first real request.
+    AI_WARMUP_QUERY: Optional[str] = "Who has the best win rate?"
+
+    # Directory of the persistent vector index, with one collection per data version (the
+    # current and the previous one are kept). Only new or changed rep documents are
+    # re-embedded on startup or refresh.
+    AI_INDEX_DIR: str = str(Path(__file__).parent / ".vector_index")
+
+    # Embedding backend: "huggingface" (sentence-transformers model, needs torch and the
+    # model weights) or "hashing" (lexical, numpy/scikit-learn only, starts in milliseconds).
+    AI_EMBEDDING_BACKEND: str = "huggingface"
+    AI_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    AI_EMBEDDING_DIMENSIONS: int = 1024
+
+    # Concurrent LLM calls per worker, how many requests may wait for one, and for how long.
+    AI_MAX_CONCURRENT_REQUESTS: int = 8
+    AI_MAX_QUEUED_REQUESTS: int = 32
+    AI_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    AI_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    # Threads used for CPU-bound query embedding and vector search.
+    AI_EMBEDDING_THREADS: int = 2
+    # Concurrent query embeddings are coalesced into one forward pass of up to this many
+    # queries, waiting at most this long for a batch to fill.
+    AI_EMBEDDING_BATCHING: bool = True
+    AI_EMBEDDING_BATCH_MAX_SIZE: int = 32
+    AI_EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # A rep with more distinct deal or client lines than this gets them as separate chunk
+    # documents next to its summary document.
+    AI_DOCUMENT_CHUNK_SIZE: int = 20
+    # Estimated token budget for the retrieved context passed to the LLM.
+    AI_CONTEXT_MAX_TOKENS: int = 3000
+    # Questions accepted by one /api/ai/batch call, and how many of its LLM calls run at
+    # once. Each call still takes one of the AI_MAX_CONCURRENT_REQUESTS slots.
+    AI_BATCH_MAX_QUESTIONS: int = 500
+    AI_BATCH_MAX_CONCURRENCY: int = 8
+    # Answer questions the analytics tools cannot answer directly with the tool-calling
+    # agent instead of the RAG chain, and the most agent steps (LLM turns) per question.
+    AI_AGENT_ENABLED: bool = False
+    AI_AGENT_MAX_ITERATIONS: int = 4
+
+    # Answer cache in front of the RAG chain; cleared whenever the sales data changes.
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_MAX_ENTRIES: int = 1024
+    AI_CACHE_TTL_SECONDS: float = 600.0
+    AI_CACHE_SEMANTIC_ENABLED: bool = True
+    # Minimum cosine similarity for a near-duplicate question to reuse a cached answer.
+    AI_CACHE_SEMANTIC_THRESHOLD: float = 0.95
+
+    # Request and per-stage latency histograms on /metrics, and a Server-Timing header
+    # listing the stages of each response.
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = True
+    # Requests slower than this are slow; this fraction of them (0 for none) is logged as
+    # JSON with its stage breakdown.
+    METRICS_SLOW_REQUEST_SECONDS: float = 2.0
+    METRICS_SLOW_REQUEST_SAMPLE_RATE: float = 0.0
+
 
 @lru_cache
 def get_env_settings() -> EnvironSettings:
@@ -0,0 +1,164 @@
+from typing import Dict, Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .compact import CompactSalesData, StringColumn
+
+CLOSED_WON = "Closed Won"
+CLOSED_LOST = "Closed Lost"
+IN_PROGRESS = "In Progress"
+UNKNOWN_INDUSTRY = "Unknown"
+
+GROUP_BY_FIELDS = ("region", "status", "rep", "client_industry")
+METRICS = ("sum", "count", "mean", "win_rate")
+
+
+class DealColumns:
+    """
+    Deals of a snapshot as parallel NumPy arrays, one entry per deal, with strings
+    dictionary-encoded into small lookup tables. Aggregates over these arrays are
+    vectorized group-bys instead of Python loops over Pydantic models.
+    """
+
+    def __init__(self, data: CompactSalesData, arrays: Optional[Mapping[str, np.ndarray]] = None):
+        """
+        Wrap the deal arrays of compact sales data and add the group-by dimension columns
+
+        Args:
+            data: Loaded sales data
+            arrays: Dimension columns saved by `arrays()` in a snapshot file, used instead
+                of computing them
+        """
+        self.rep_index = data.deal_rep_index
+        self.value = data.deal_value
+        self.status_code = data.deal_status
+        self.client_id = data.deal_client
+        self.statuses = data.statuses.tolist()
+        self.rep_count = len(data)
+
+        # Per-rep dimension column, indexed by rep position: regions are already coded
+        self.rep_region_code = data.rep_region
+        self.regions = data.regions.tolist()
+
+        if arrays is not None:
+            self.client_industry_code = arrays["client_industry_code"]
+            self.industries = StringColumn.from_arrays(arrays, "industries").tolist()
+            return
+
+        # A client's industry is the one of its first listing in data order; industries are
+        # coded in the order their clients first appear in deals, after the unknown industry
+        listed_names, first_listing = np.unique(data.client_name, return_index=True)
+        industry_by_client = dict(zip(listed_names.tolist(), data.client_industry[first_listing].tolist()))
+        dealt_clients, first_deal = np.unique(self.client_id, return_index=True)
+        industry_codes: Dict[str, int] = {UNKNOWN_INDUSTRY: 0}
+        self.client_industry_code = np.zeros(len(data.client_names), dtype=np.int32)
+        for client in dealt_clients[np.argsort(first_deal)].tolist():
+            industry = industry_by_client.get(client)
+            if industry is not None:
+                self.client_industry_code[client] = industry_codes.setdefault(
+                    data.industries[industry], len(industry_codes))
+        self.industries = list(industry_codes)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get the computed dimension columns, for saving them to a snapshot file
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays by name
+        """
+        return {
+            "client_industry_code": self.client_industry_code,
+            **StringColumn.from_strings(self.industries).arrays("industries"),
+        }
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def status_mask(self, status: str) -> np.ndarray:
+        """
+        Get a boolean mask of the deals with the given status
+
+        Args:
+            status: Exact deal status
+
+        Returns:
+            np.ndarray: Boolean mask over the deals
+        """
+        if status not in self.statuses:
+            return np.zeros(len(self), dtype=bool)
+        return self.status_code == self.statuses.index(status)
+
+    def _group_keys(self, group_by: str):
+        """Map each deal to its group code and return the codes with the group labels."""
+        if group_by == "region":
+            return self.rep_region_code[self.rep_index], self.regions
+        if group_by == "status":
+            return self.status_code, self.statuses
+        if group_by == "rep":
+            return self.rep_index, None
+        if group_by == "client_industry":
+            return self.client_industry_code[self.client_id], self.industries
+        raise ValueError(f"Unsupported group by field: {group_by}")
+
+    def aggregate(self, group_by: str, metrics: Sequence[str] = METRICS) -> Dict[str, np.ndarray]:
+        """
+        Compute deal aggregates per group with vectorized group-bys
+
+        Args:
+            group_by: One of GROUP_BY_FIELDS
+            metrics: Any of METRICS
+
+        Returns:
+            Dict: "group" codes (or labels) plus one array per requested metric, for non-empty groups
+        """
+        unsupported = set(metrics) - set(METRICS)
+        if unsupported:
+            raise ValueError(f"Unsupported metrics: {', '.join(sorted(unsupported))}")
+
+        keys, labels = self._group_keys(group_by)
+        size = len(labels) if labels is not None else self.rep_count
+        count = np.bincount(keys, minlength=size)
+        present = np.flatnonzero(count)
+
+        result: Dict[str, Any] = {"group": present if labels is None else np.asarray(labels, dtype=object)[present]}
+        if "count" in metrics:
+            result["count"] = count[present]
+        if "sum" in metrics or "mean" in metrics:
+            # float64 weights are exact for sums below 2**53
+            total = np.bincount(keys, weights=self.value, minlength=size)[present]
+            if "sum" in metrics:
+                result["sum"] = np.rint(total).astype(np.int64)
+            if "mean" in metrics:
+                result["mean"] = total / count[present]
+        if "win_rate" in metrics:
+            won = np.bincount(keys[self.status_mask(CLOSED_WON)], minlength=size)[present]
+            lost = np.bincount(keys[self.status_mask(CLOSED_LOST)], minlength=size)[present]
+            closed = won + lost
+            result["win_rate"] = np.divide(won * 100.0, closed, out=np.zeros(len(present)), where=closed > 0)
+        return result
+
+    def rep_status_counts(self, status: str) -> np.ndarray:
+        """
+        Count deals with the given status per rep
+
+        Args:
+            status: Exact deal status
+
+        Returns:
+            np.ndarray: Deal counts indexed by rep position
+        """
+        return np.bincount(self.rep_index[self.status_mask(status)], minlength=self.rep_count)
+
+    def rep_status_values(self, status: str) -> np.ndarray:
+        """
+        Sum deal values with the given status per rep
+
+        Args:
+            status: Exact deal status
+
+        Returns:
+            np.ndarray: Deal value totals (int64) indexed by rep position
+        """
+        mask = self.status_mask(status)
+        totals = np.bincount(self.rep_index[mask], weights=self.value[mask], minlength=self.rep_count)
+        return np.rint(totals).astype(np.int64)
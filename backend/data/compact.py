@@ -0,0 +1,398 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .schemas import SalesRep, SalesData, Deal, Client
+
+
+# String tables up to this size keep their decoded values instead of decoding on access
+DECODED_TABLE_MAX_BYTES = 64 * 1024
+
+
+def _frozen(values, dtype) -> np.ndarray:
+    """Wrap an array.array (or any buffer) as a read-only NumPy array without copying it."""
+    result = np.frombuffer(values, dtype=dtype)
+    result.flags.writeable = False
+    return result
+
+
+def _offsets(lengths: Sequence[int]) -> np.ndarray:
+    """Turn item lengths into read-only start offsets with a trailing end offset."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    offsets.flags.writeable = False
+    return offsets
+
+
+def _gather_rows(offsets: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+    """
+    Concatenate the row ranges of many positions of a CSR-style offsets array
+
+    Returns:
+        Tuple: The rows, and the bounds of each position's rows within them
+    """
+    starts = offsets[positions]
+    lengths = offsets[positions + 1] - starts
+    bounds = np.zeros(len(positions) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=bounds[1:])
+    rows = np.repeat(starts - bounds[:-1], lengths) + np.arange(bounds[-1], dtype=np.int64)
+    return rows, bounds.tolist()
+
+
+class StringColumn:
+    """
+    Immutable list of strings stored as one UTF-8 buffer plus offsets, so that it can be
+    saved to and mapped from a snapshot file. Strings are decoded on access.
+    """
+
+    __slots__ = ("offsets", "buffer", "_view", "_values")
+
+    def __init__(self, offsets: np.ndarray, buffer: np.ndarray):
+        """
+        Wrap the offsets and buffer of a column
+
+        Args:
+            offsets: Start offset of every string, plus the end offset of the last one
+            buffer: UTF-8 bytes of all strings (uint8)
+        """
+        self.offsets = offsets
+        self.buffer = buffer
+        self._view = memoryview(buffer)
+        # Small tables (statuses, regions, industries...) are decoded once per process
+        self._values: Optional[List[str]] = self._decode() if len(buffer) <= DECODED_TABLE_MAX_BYTES else None
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "StringColumn":
+        encoded = [value.encode("utf-8") for value in values]
+        return cls(_offsets([len(value) for value in encoded]), _frozen(b"".join(encoded), np.uint8))
+
+    def __getitem__(self, index: int) -> str:
+        if self._values is not None:
+            return self._values[index]
+        start, end = self.offsets[index:index + 2].tolist()
+        return str(self._view[start:end], "utf-8")
+
+    def take(self, codes: Iterable[int]) -> List[str]:
+        """Decode the strings of many codes, each distinct code once."""
+        decoded: Dict[int, str] = {}
+        result = []
+        for code in codes:
+            value = decoded.get(code)
+            if value is None:
+                value = decoded[code] = self[code]
+            result.append(value)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tolist())
+
+    def tolist(self) -> List[str]:
+        if self._values is not None:
+            return list(self._values)
+        return self._decode()
+
+    def _decode(self) -> List[str]:
+        text = bytes(self._view)
+        offsets = self.offsets.tolist()
+        return [text[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def arrays(self, name: str) -> Dict[str, np.ndarray]:
+        return {f"{name}.offsets": self.offsets, f"{name}.buffer": self.buffer}
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], name: str) -> "StringColumn":
+        return cls(arrays[f"{name}.offsets"], arrays[f"{name}.buffer"])
+
+
+class StringTable:
+    """
+    Dictionary encoding of a repeated string column while it is being built: every
+    distinct string is stored once and referred to by a small integer code, in order of
+    first appearance.
+    """
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def freeze(self) -> StringColumn:
+        return StringColumn.from_strings(self.values)
+
+
+class RepRecord(NamedTuple):
+    """A rep's scalar fields, with its deals and clients as row ranges of the shared arrays."""
+    id: int
+    name: str
+    role: str
+    region: str
+    skills: Tuple[str, ...]
+    deal_start: int
+    deal_end: int
+    client_start: int
+    client_end: int
+
+
+class RepRecords(Sequence[RepRecord]):
+    """Read-only sequence view of the reps of a CompactSalesData, one RepRecord per access."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: "CompactSalesData"):
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data.rep_id)
+
+    def __getitem__(self, position: int) -> RepRecord:
+        data = self._data
+        if position < 0:
+            position += len(self)
+        # Sequence iteration and `in` stop on IndexError
+        if not 0 <= position < len(self):
+            raise IndexError("rep position out of range")
+        skill_start, skill_end = data.rep_skill_offsets[position:position + 2].tolist()
+        deal_start, deal_end = data.rep_deal_offsets[position:position + 2].tolist()
+        client_start, client_end = data.rep_client_offsets[position:position + 2].tolist()
+        return RepRecord(
+            id=int(data.rep_id[position]),
+            name=data.names[data.rep_name[position]],
+            role=data.roles[data.rep_role[position]],
+            region=data.regions[data.rep_region[position]],
+            skills=tuple(data.skills[code] for code in data.rep_skill[skill_start:skill_end].tolist()),
+            deal_start=deal_start,
+            deal_end=deal_end,
+            client_start=client_start,
+            client_end=client_end,
+        )
+
+
+class CompactSalesData:
+    """
+    Sales data held as parallel NumPy arrays for reps, deals and clients, with every
+    string column dictionary-encoded into a StringColumn table. A deal costs 18 bytes
+    instead of a Pydantic model with its own string copies, and since the whole state is
+    arrays, it can be saved to a snapshot file and mapped by several processes.
+
+    Pydantic models are only built on demand, for the reps or deals a response returns.
+    """
+
+    ARRAY_FIELDS = (
+        "rep_id", "rep_name", "rep_role", "rep_region", "rep_skill_offsets", "rep_skill",
+        "rep_deal_offsets", "rep_client_offsets", "rep_id_order", "rep_sorted_id",
+        "deal_rep_index", "deal_value", "deal_status", "deal_client",
+        "client_name", "client_industry", "client_contact",
+    )
+    STRING_FIELDS = ("names", "roles", "regions", "skills", "statuses", "client_names", "industries", "contacts")
+
+    __slots__ = ARRAY_FIELDS + STRING_FIELDS + ("reps",)
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        """
+        Wrap the arrays of compact sales data, as built by `from_reps` or mapped from a
+        snapshot file by `SalesDataSnapshot.open`
+
+        Args:
+            arrays: Arrays named as returned by `arrays()`
+        """
+        for name in self.ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        for name in self.STRING_FIELDS:
+            setattr(self, name, StringColumn.from_arrays(arrays, name))
+        self.reps = RepRecords(self)
+
+    @classmethod
+    def from_reps(cls, reps: Iterable[SalesRep]) -> "CompactSalesData":
+        """
+        Encode reps one at a time, so the input can be a stream of validated models
+
+        Args:
+            reps: Sales reps in data order
+
+        Returns:
+            CompactSalesData: The encoded data
+        """
+        tables = {name: StringTable() for name in cls.STRING_FIELDS}
+        names, roles, regions, skills = tables["names"], tables["roles"], tables["regions"], tables["skills"]
+        statuses, client_names, industries, contacts = (
+            tables["statuses"], tables["client_names"], tables["industries"], tables["contacts"])
+
+        rep_id, rep_name, rep_role, rep_region, rep_skill = array("q"), array("i"), array("i"), array("i"), array("i")
+        skill_counts, deal_counts, client_counts = array("q"), array("q"), array("q")
+        deal_rep_index, deal_value, deal_status, deal_client = array("i"), array("q"), array("h"), array("i")
+        client_name, client_industry, client_contact = array("i"), array("i"), array("i")
+        for position, rep in enumerate(reps):
+            rep_id.append(rep.id)
+            rep_name.append(names.encode(rep.name))
+            rep_role.append(roles.encode(rep.role))
+            rep_region.append(regions.encode(rep.region))
+            rep_skill.extend(skills.encode(skill) for skill in rep.skills)
+            skill_counts.append(len(rep.skills))
+            for deal in rep.deals:
+                deal_rep_index.append(position)
+                deal_value.append(deal.value)
+                deal_status.append(statuses.encode(deal.status))
+                deal_client.append(client_names.encode(deal.client))
+            deal_counts.append(len(rep.deals))
+            for client in rep.clients:
+                client_name.append(client_names.encode(client.name))
+                client_industry.append(industries.encode(client.industry))
+                client_contact.append(contacts.encode(client.contact))
+            client_counts.append(len(rep.clients))
+
+        rep_ids = _frozen(rep_id, np.int64)
+        rep_id_order = np.argsort(rep_ids, kind="stable")
+        arrays = {
+            "rep_id": rep_ids,
+            "rep_name": _frozen(rep_name, np.int32),
+            "rep_role": _frozen(rep_role, np.int32),
+            "rep_region": _frozen(rep_region, np.int32),
+            "rep_skill_offsets": _offsets(skill_counts),
+            "rep_skill": _frozen(rep_skill, np.int32),
+            "rep_deal_offsets": _offsets(deal_counts),
+            "rep_client_offsets": _offsets(client_counts),
+            # Positions sorted by rep id (ties in data order), for id lookups by binary search
+            "rep_id_order": rep_id_order,
+            "rep_sorted_id": rep_ids[rep_id_order],
+            "deal_rep_index": _frozen(deal_rep_index, np.int32),
+            "deal_value": _frozen(deal_value, np.int64),
+            "deal_status": _frozen(deal_status, np.int16),
+            "deal_client": _frozen(deal_client, np.int32),
+            "client_name": _frozen(client_name, np.int32),
+            "client_industry": _frozen(client_industry, np.int32),
+            "client_contact": _frozen(client_contact, np.int32),
+        }
+        for name, table in tables.items():
+            arrays.update(table.freeze().arrays(name))
+        return cls(arrays)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get every array of the data, for saving it to a snapshot file
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays by name
+        """
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        for name in self.STRING_FIELDS:
+            arrays.update(getattr(self, name).arrays(name))
+        return arrays
+
+    def __len__(self) -> int:
+        return len(self.rep_id)
+
+    @property
+    def deal_count(self) -> int:
+        return len(self.deal_value)
+
+    def position_of(self, rep_id: int) -> Optional[int]:
+        """
+        Get the data position of the first rep with the given id
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[int]: The rep's position or None if not found
+        """
+        found = int(np.searchsorted(self.rep_sorted_id, rep_id))
+        if found < len(self.rep_sorted_id) and self.rep_sorted_id[found] == rep_id:
+            return int(self.rep_id_order[found])
+        return None
+
+    def deal(self, row: int) -> Deal:
+        """Build the Deal model of a deal row."""
+        return Deal.model_construct(
+            client=self.client_names[self.deal_client[row]],
+            value=int(self.deal_value[row]),
+            status=self.statuses[self.deal_status[row]],
+        )
+
+    def client(self, row: int) -> Client:
+        """Build the Client model of a client row."""
+        return Client.model_construct(
+            name=self.client_names[self.client_name[row]],
+            industry=self.industries[self.client_industry[row]],
+            contact=self.contacts[self.client_contact[row]],
+        )
+
+    def deals(self, rows: Union[range, np.ndarray]) -> List[Deal]:
+        """Build the Deal models of many deal rows, decoding each distinct string once."""
+        rows = slice(rows.start, rows.stop) if isinstance(rows, range) else rows
+        clients = self.client_names.take(self.deal_client[rows].tolist())
+        statuses = self.statuses.take(self.deal_status[rows].tolist())
+        return [
+            Deal.model_construct(client=client, value=value, status=status)
+            for client, value, status in zip(clients, self.deal_value[rows].tolist(), statuses)
+        ]
+
+    def clients(self, rows: Union[range, np.ndarray]) -> List[Client]:
+        """Build the Client models of many client rows, decoding each distinct string once."""
+        rows = slice(rows.start, rows.stop) if isinstance(rows, range) else rows
+        return [
+            Client.model_construct(name=name, industry=industry, contact=contact)
+            for name, industry, contact in zip(
+                self.client_names.take(self.client_name[rows].tolist()),
+                self.industries.take(self.client_industry[rows].tolist()),
+                self.contacts.take(self.client_contact[rows].tolist()),
+            )
+        ]
+
+    def deal_rows(self, position: int) -> range:
+        """Deal rows of the rep at a data position."""
+        return range(*self.rep_deal_offsets[position:position + 2].tolist())
+
+    def client_rows(self, position: int) -> range:
+        """Client rows of the rep at a data position."""
+        return range(*self.rep_client_offsets[position:position + 2].tolist())
+
+    def rep_names(self) -> List[str]:
+        """Names of all reps, in data order."""
+        return self.names.take(self.rep_name.tolist())
+
+    def rep_model(self, position: int) -> SalesRep:
+        """Build the SalesRep model of the rep at a data position."""
+        return self.rep_models([position])[0]
+
+    def rep_models(self, positions: Union[Sequence[int], np.ndarray]) -> List[SalesRep]:
+        """Build the SalesRep models of many reps, decoding each distinct string once."""
+        positions = np.asarray(positions, dtype=np.int64)
+        skill_rows, skill_bounds = _gather_rows(self.rep_skill_offsets, positions)
+        deal_rows, deal_bounds = _gather_rows(self.rep_deal_offsets, positions)
+        client_rows, client_bounds = _gather_rows(self.rep_client_offsets, positions)
+        skills = self.skills.take(self.rep_skill[skill_rows].tolist())
+        deals = self.deals(deal_rows)
+        clients = self.clients(client_rows)
+        return [
+            SalesRep.model_construct(
+                id=rep_id,
+                name=name,
+                role=role,
+                region=region,
+                skills=skills[skill_bounds[index]:skill_bounds[index + 1]],
+                deals=deals[deal_bounds[index]:deal_bounds[index + 1]],
+                clients=clients[client_bounds[index]:client_bounds[index + 1]],
+            )
+            for index, (rep_id, name, role, region) in enumerate(zip(
+                self.rep_id[positions].tolist(),
+                self.names.take(self.rep_name[positions].tolist()),
+                self.roles.take(self.rep_role[positions].tolist()),
+                self.regions.take(self.rep_region[positions].tolist()),
+            ))
+        ]
+
+    def to_model(self) -> SalesData:
+        """Build the full SalesData model. Costs as much memory as the original data."""
+        return SalesData.model_construct(salesReps=self.rep_models(np.arange(len(self))))
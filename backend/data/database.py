@@ -0,0 +1,791 @@
+"""
+SQLite storage backend for the sales data.
+
+The JSON data file is imported into an indexed SQLite database (`import_sales_data`, or
+`python -m backend.data.database`), and `SQLiteSalesRepService` answers the same calls as
+`SalesRepService` with SQL queries, so a worker only holds the rows of the current request
+in memory instead of the whole dataset. `sync_database` re-imports the data file whenever
+the database holds another version of it.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from filelock import FileLock
+from pydantic import ValidationError
+
+from .schemas import (
+    SalesRep, SalesData, Deal, Client, AnalyticsGroup, RepStats,
+    SalesRepProjection, SalesRepPage, DealPage, ClientPage, SALES_REP_FIELDS,
+)
+from .columnar import CLOSED_WON, CLOSED_LOST, IN_PROGRESS, UNKNOWN_INDUSTRY, GROUP_BY_FIELDS, METRICS
+from .stats import LEADERBOARD_METRICS
+from .index import normalize_key
+from .pagination import encode_cursor, decode_cursor
+from .responses import UncachedResponses
+from .jsonstream import READ_CHUNK_SIZE, iter_sales_reps
+
+logger = logging.getLogger(__name__)
+
+# Reps inserted per executemany batch by the importer
+IMPORT_BATCH_SIZE = 1000
+# Bumped whenever SCHEMA or INDEXES change, so databases imported before are re-imported
+SCHEMA_VERSION = "2"
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE reps (
+    position INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    region TEXT NOT NULL,
+    region_key TEXT NOT NULL
+);
+CREATE TABLE skills (
+    rep_position INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    skill_key TEXT NOT NULL,
+    PRIMARY KEY (rep_position, seq)
+) WITHOUT ROWID;
+CREATE TABLE deals (
+    id INTEGER PRIMARY KEY,
+    rep_position INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    client TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    status_key TEXT NOT NULL
+);
+CREATE TABLE clients (
+    rep_position INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    contact TEXT NOT NULL,
+    PRIMARY KEY (rep_position, seq)
+) WITHOUT ROWID;
+-- Distinct normalized regions, so partial region names only scan these
+CREATE TABLE regions (
+    region_key TEXT PRIMARY KEY
+) WITHOUT ROWID;
+-- Industry of each client name, from its first listing in data order
+CREATE TABLE client_industries (
+    name TEXT PRIMARY KEY,
+    industry TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+INDEXES = """
+CREATE INDEX reps_id ON reps (id, position);
+CREATE INDEX reps_region ON reps (region, position);
+CREATE INDEX reps_region_key ON reps (region_key, position);
+CREATE INDEX skills_skill_key ON skills (skill_key, rep_position);
+CREATE UNIQUE INDEX deals_rep ON deals (rep_position, seq);
+CREATE INDEX deals_status_key ON deals (status_key);
+CREATE INDEX deals_value ON deals (value, rep_position);
+"""
+
+
+def _lock(database_path: Path) -> FileLock:
+    # Serializes imports of the same database across the workers of a server
+    return FileLock(str(database_path.with_name(database_path.name + ".lock")))
+
+
+def import_sales_data(data_file_path: Union[str, Path], database_path: Union[str, Path]) -> str:
+    """
+    Stream a JSON data file into a new SQLite database, replacing any previous database
+    atomically once the import has succeeded
+
+    Args:
+        data_file_path: Path to the JSON data file
+        database_path: Path of the SQLite database to create
+
+    Returns:
+        str: Content hash of the imported file, stored as the database version
+    """
+    database_path = Path(database_path)
+    with _lock(database_path):
+        return _import_sales_data(data_file_path, database_path)
+
+
+def _import_sales_data(data_file_path: Union[str, Path], database_path: Path) -> str:
+    temporary_path = database_path.with_name(database_path.name + ".importing")
+    temporary_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(temporary_path)
+    succeeded = False
+    try:
+        version, rep_count = _write_database(connection, data_file_path)
+        succeeded = True
+    except FileNotFoundError:
+        raise Exception(f"Data file not found: {data_file_path}")
+    except json.JSONDecodeError:
+        raise Exception(f"Invalid JSON in data file: {data_file_path}")
+    except (ValueError, ValidationError) as e:
+        raise Exception(f"Error loading data: {str(e)}")
+    finally:
+        connection.close()
+        if not succeeded:
+            temporary_path.unlink(missing_ok=True)
+
+    os.replace(temporary_path, database_path)
+    logger.info("Imported %d sales reps from %s into %s", rep_count, data_file_path, database_path)
+    return version
+
+
+def sync_database(data_file_path: Union[str, Path], database_path: Union[str, Path]) -> str:
+    """
+    Import a JSON data file into a SQLite database unless the database already holds this
+    version of it. The file is only hashed when its size or modification time differ from
+    those recorded at import.
+
+    Args:
+        data_file_path: Path to the JSON data file
+        database_path: Path of the SQLite database
+
+    Returns:
+        str: Content hash of the data file, the database version
+    """
+    database_path = Path(database_path)
+    with _lock(database_path):
+        meta = read_meta(database_path)
+        if meta.get("schema_version") == SCHEMA_VERSION:
+            try:
+                stat = os.stat(data_file_path)
+            except FileNotFoundError:
+                raise Exception(f"Data file not found: {data_file_path}")
+            if meta.get("source_stat") == _stat_key(stat):
+                return meta["version"]
+            hasher = hashlib.sha256()
+            with open(data_file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            if hasher.hexdigest() == meta.get("version"):
+                return meta["version"]
+
+        logger.info("Sales database %s is missing or out of date, importing %s", database_path, data_file_path)
+        return _import_sales_data(data_file_path, database_path)
+
+
+def read_meta(database_path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Read the meta table of an imported database: its version (the content hash of the
+    imported file), the file's path and stat, and the schema version
+
+    Returns:
+        Dict[str, str]: Meta values by key, empty if there is no readable database
+    """
+    database_path = Path(database_path)
+    if not database_path.exists():
+        return {}
+    try:
+        connection = sqlite3.connect(f"{database_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return dict(connection.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return {}
+
+
+def _stat_key(stat: os.stat_result) -> str:
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _write_database(connection: sqlite3.Connection, data_file_path: Union[str, Path]) -> Tuple[str, int]:
+    """Create the schema, insert every rep in batches, then build the indexes."""
+    connection.executescript(SCHEMA)
+    hasher = hashlib.sha256()
+    rep_count = 0
+    with open(data_file_path, "rb") as file:
+        # Taken before reading, so a file changed during the import is re-imported
+        stat = os.fstat(file.fileno())
+        batch = []
+        for raw_rep in iter_sales_reps(file, hasher):
+            batch.append((rep_count, SalesRep.model_validate(raw_rep)))
+            rep_count += 1
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                _insert_reps(connection, batch)
+                batch = []
+        _insert_reps(connection, batch)
+
+    version = hasher.hexdigest()
+    connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+        ("version", version),
+        ("source_path", str(data_file_path)),
+        ("source_stat", _stat_key(stat)),
+        ("schema_version", SCHEMA_VERSION),
+    ])
+    connection.executescript(INDEXES)
+    connection.commit()
+    connection.execute("ANALYZE")
+    return version, rep_count
+
+
+def _insert_reps(connection: sqlite3.Connection, reps: List[Tuple[int, SalesRep]]) -> None:
+    connection.executemany(
+        "INSERT INTO reps (position, id, name, role, region, region_key) VALUES (?, ?, ?, ?, ?, ?)",
+        [(position, rep.id, rep.name, rep.role, rep.region, normalize_key(rep.region)) for position, rep in reps],
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO regions (region_key) VALUES (?)",
+        [(normalize_key(rep.region),) for _, rep in reps],
+    )
+    connection.executemany(
+        "INSERT INTO skills (rep_position, seq, skill, skill_key) VALUES (?, ?, ?, ?)",
+        [
+            (position, seq, skill, normalize_key(skill))
+            for position, rep in reps for seq, skill in enumerate(rep.skills)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO deals (rep_position, seq, client, value, status, status_key) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (position, seq, deal.client, deal.value, deal.status, normalize_key(deal.status))
+            for position, rep in reps for seq, deal in enumerate(rep.deals)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO clients (rep_position, seq, name, industry, contact) VALUES (?, ?, ?, ?, ?)",
+        [
+            (position, seq, client.name, client.industry, client.contact)
+            for position, rep in reps for seq, client in enumerate(rep.clients)
+        ],
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO client_industries (name, industry) VALUES (?, ?)",
+        [(client.name, client.industry) for _, rep in reps for client in rep.clients],
+    )
+
+
+# Per-rep stats as one aggregation over the deals, in the same shape as RepStats
+_STATS_QUERY = f"""
+WITH rep_deals AS (
+    SELECT
+        r.position,
+        r.id AS rep_id,
+        r.name AS rep_name,
+        r.region,
+        COALESCE(SUM(d.status = '{CLOSED_WON}'), 0) AS won_deals,
+        COALESCE(SUM(d.status = '{CLOSED_LOST}'), 0) AS lost_deals,
+        COALESCE(SUM(d.status = '{IN_PROGRESS}'), 0) AS in_progress_deals,
+        COUNT(d.id) AS total_deals,
+        COALESCE(SUM(CASE WHEN d.status = '{CLOSED_WON}' THEN d.value END), 0) AS won_value,
+        COALESCE(SUM(CASE WHEN d.status = '{IN_PROGRESS}' THEN d.value END), 0) AS pipeline_value,
+        COALESCE(SUM(d.value), 0) AS total_value
+    FROM reps r
+    LEFT JOIN deals d ON d.rep_position = r.position
+    WHERE {{where}}
+    GROUP BY r.position
+)
+SELECT
+    rep_id, rep_name, region, won_deals, lost_deals, in_progress_deals, total_deals,
+    won_value, pipeline_value, total_value,
+    CASE WHEN won_deals + lost_deals > 0
+        THEN won_deals * 100.0 / (won_deals + lost_deals) ELSE 0.0 END AS win_rate,
+    (SELECT COUNT(*) FROM clients c WHERE c.rep_position = rep_deals.position) AS client_count
+FROM rep_deals
+ORDER BY {{order_by}}
+"""
+
+_STATS_FIELDS = (
+    "rep_id", "rep_name", "region", "won_deals", "lost_deals", "in_progress_deals", "total_deals",
+    "won_value", "pipeline_value", "total_value", "win_rate", "client_count",
+)
+
+# Deal group key, label and first-appearance order of each analytics group-by field
+_GROUP_BY_SQL = {
+    "region": ("r.region", "r.region", "(SELECT MIN(position) FROM reps WHERE region = r.region)"),
+    "status": ("d.status", "d.status", "MIN(d.id)"),
+    "rep": ("r.position", "r.name", "r.position"),
+    "client_industry": (
+        f"COALESCE(ci.industry, '{UNKNOWN_INDUSTRY}')",
+        f"COALESCE(ci.industry, '{UNKNOWN_INDUSTRY}')",
+        f"COALESCE(ci.industry, '{UNKNOWN_INDUSTRY}') != '{UNKNOWN_INDUSTRY}', MIN(d.id)",
+    ),
+}
+
+
+def _select_reps(
+    query: Callable[[str, Sequence[Any]], List[tuple]],
+    where: str = "1",
+    params: Sequence[Any] = (),
+    limit: Optional[int] = None,
+    fields: Sequence[str] = SALES_REP_FIELDS,
+) -> List[Dict[str, Any]]:
+    """
+    Load reps matching a condition on the reps table, in data order, with the requested
+    nested lists fetched by one query per table
+
+    Args:
+        query: Runs a SQL query and returns its rows
+
+    Returns:
+        List[Dict]: Rep fields by name, plus their "position"
+    """
+    selection = f"SELECT position FROM reps WHERE {where} ORDER BY position"
+    if limit is not None:
+        selection += f" LIMIT {int(limit)}"
+
+    reps = [
+        {"position": position, "id": rep_id, "name": name, "role": role, "region": region}
+        for position, rep_id, name, role, region in query(
+            f"SELECT position, id, name, role, region FROM reps WHERE position IN ({selection}) ORDER BY position",
+            params,
+        )
+    ]
+    reps_by_position = {rep["position"]: rep for rep in reps}
+
+    nested = {
+        "skills": ("skill", lambda row: row[0]),
+        "deals": ("client, value, status", lambda row: Deal(client=row[0], value=row[1], status=row[2])),
+        "clients": ("name, industry, contact", lambda row: Client(name=row[0], industry=row[1], contact=row[2])),
+    }
+    for field, (columns, build) in nested.items():
+        if field not in fields:
+            continue
+        for rep in reps:
+            rep[field] = []
+        for row in query(
+            f"SELECT rep_position, {columns} FROM {field} WHERE rep_position IN ({selection}) "
+            f"ORDER BY rep_position, seq",
+            params,
+        ):
+            reps_by_position[row[0]][field].append(build(row[1:]))
+    return reps
+
+
+def iter_database_reps(connection: sqlite3.Connection, batch_size: int = IMPORT_BATCH_SIZE) -> Iterator[SalesRep]:
+    """
+    Stream every rep of an imported database in data order, loading `batch_size` reps at
+    a time. The connection keeps reading the database it opened even if a new import
+    replaces the file meanwhile.
+
+    Args:
+        connection: Connection to the database
+
+    Yields:
+        SalesRep: The next rep
+    """
+    def query(sql: str, params: Sequence[Any]) -> List[tuple]:
+        return connection.execute(sql, params).fetchall()
+
+    rep_count = query("SELECT COUNT(*) FROM reps", ())[0][0]
+    for start in range(0, rep_count, batch_size):
+        yield from SQLiteSalesRepService._to_models(
+            _select_reps(query, "position >= ? AND position < ?", (start, start + batch_size)))
+
+
+class SQLiteSalesRepService:
+    """
+    Service class to handle sales representative data operations on an imported SQLite
+    database. Offers the same calls as SalesRepService, with filters and aggregates
+    pushed down into indexed SQL queries.
+    """
+
+    def __init__(self, database_path: Union[str, Path]):
+        """
+        Initialize the service on an imported database. Connections are opened read-only,
+        one per thread, and reopened when the database file is replaced by a new import.
+
+        Args:
+            database_path: Path of the SQLite database created by import_sales_data
+        """
+        self.database_path = Path(database_path)
+        self._local = threading.local()
+        self._responses = UncachedResponses()
+
+    def _connection(self) -> sqlite3.Connection:
+        stat = os.stat(self.database_path)
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.file_id != file_id:
+            if connection is not None:
+                connection.close()
+            connection = sqlite3.connect(f"{self.database_path.resolve().as_uri()}?mode=ro", uri=True)
+            self._local.connection = connection
+            self._local.file_id = file_id
+        return connection
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self._connection().execute(sql, params).fetchall()
+
+    @property
+    def version(self) -> str:
+        """
+        Get the content hash of the imported data file
+
+        Returns:
+            str: Database version
+        """
+        return self._query("SELECT value FROM meta WHERE key = 'version'")[0][0]
+
+    @property
+    def responses(self) -> UncachedResponses:
+        """
+        Get the response serializer. Responses are not kept in memory for this backend.
+
+        Returns:
+            UncachedResponses: Serializer with the SnapshotResponseCache interface
+        """
+        return self._responses
+
+    @property
+    def data(self) -> SalesData:
+        """
+        Get all the data. Materializes every rep, prefer the filtered calls.
+
+        Returns:
+            SalesData: Loaded data in Pydantic model
+        """
+        return self.get_all_sales_reps()
+
+    def _load_reps(
+        self,
+        where: str = "1",
+        params: Sequence[Any] = (),
+        limit: Optional[int] = None,
+        fields: Sequence[str] = SALES_REP_FIELDS,
+    ) -> List[Dict[str, Any]]:
+        return _select_reps(self._query, where, params, limit, fields)
+
+    def _rep_position(self, rep_id: int) -> Optional[int]:
+        rows = self._query("SELECT MIN(position) FROM reps WHERE id = ?", (rep_id,))
+        return rows[0][0]
+
+    def _stats(self, where: str = "1", params: Sequence[Any] = (), order_by: str = "position", limit: Optional[int] = None) -> List[RepStats]:
+        sql = _STATS_QUERY.format(where=where, order_by=order_by)
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [RepStats(**dict(zip(_STATS_FIELDS, row))) for row in self._query(sql, params)]
+
+    @staticmethod
+    def _to_models(reps: List[Dict[str, Any]]) -> List[SalesRep]:
+        return [SalesRep.model_construct(**{field: rep[field] for field in SALES_REP_FIELDS if field in rep}) for rep in reps]
+
+    def get_all_sales_reps(self) -> SalesData:
+        """
+        Get all sales representatives
+
+        Returns:
+            SalesData: List of all sales representatives
+        """
+        return SalesData(salesReps=self._to_models(self._load_reps()))
+
+    def get_sales_reps_page(self, cursor: Optional[str], limit: int, fields: Sequence[str]) -> SalesRepPage:
+        """
+        Get one page of sales representatives, restricted to the requested fields
+
+        Args:
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of reps in the page
+            fields: Rep fields to include (see SALES_REP_FIELDS)
+
+        Returns:
+            SalesRepPage: The page and the cursor of the next one (None on the last page)
+
+        Raises:
+            ValueError: If the cursor or a field name is invalid
+        """
+        unknown = set(fields) - set(SALES_REP_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        start = 0
+        if cursor:
+            position, rep_id = decode_cursor(cursor)
+            # Re-anchor on the rep id in case the data was re-imported between pages
+            if rep_id is not None and not self._query(
+                    "SELECT 1 FROM reps WHERE position = ? AND id = ?", (position, rep_id)):
+                anchor = self._rep_position(rep_id)
+                position = anchor if anchor is not None else position
+            start = position + 1
+
+        page = self._load_reps("position >= ?", (start,), limit=limit + 1, fields=fields)
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        # Positions are contiguous, so the page's stats are one range aggregation
+        page_stats = []
+        if "stats" in fields and page:
+            page_stats = self._stats("r.position BETWEEN ? AND ?", (page[0]["position"], page[-1]["position"]))
+
+        items = []
+        for i, rep in enumerate(page):
+            item = {field: rep[field] for field in fields if field != "stats"}
+            if "stats" in fields:
+                item["stats"] = page_stats[i]
+            items.append(SalesRepProjection(**item))
+
+        next_cursor = encode_cursor(page[-1]["position"], page[-1]["id"]) if has_more else None
+        return SalesRepPage(salesReps=items, nextCursor=next_cursor)
+
+    def _get_nested_page(self, rep_id: int, table: str, columns: str, cursor: Optional[str], limit: int):
+        position = self._rep_position(rep_id)
+        if position is None:
+            return None
+        start = decode_cursor(cursor)[0] + 1 if cursor else 0
+        rows = self._query(
+            f"SELECT {columns} FROM {table} WHERE rep_position = ? AND seq >= ? ORDER BY seq LIMIT ?",
+            (position, start, limit + 1),
+        )
+        next_cursor = encode_cursor(start + limit - 1) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def get_rep_deals_page(self, rep_id: int, cursor: Optional[str], limit: int) -> Optional[DealPage]:
+        """
+        Get one page of a sales representative's deals
+
+        Args:
+            rep_id: ID of the sales representative
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of deals in the page
+
+        Returns:
+            Optional[DealPage]: The page, or None if the rep was not found
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        result = self._get_nested_page(rep_id, "deals", "client, value, status", cursor, limit)
+        if result is None:
+            return None
+        rows, next_cursor = result
+        deals = [Deal(client=client, value=value, status=status) for client, value, status in rows]
+        return DealPage(deals=deals, nextCursor=next_cursor)
+
+    def get_rep_clients_page(self, rep_id: int, cursor: Optional[str], limit: int) -> Optional[ClientPage]:
+        """
+        Get one page of a sales representative's clients
+
+        Args:
+            rep_id: ID of the sales representative
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of clients in the page
+
+        Returns:
+            Optional[ClientPage]: The page, or None if the rep was not found
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        result = self._get_nested_page(rep_id, "clients", "name, industry, contact", cursor, limit)
+        if result is None:
+            return None
+        rows, next_cursor = result
+        clients = [Client(name=name, industry=industry, contact=contact) for name, industry, contact in rows]
+        return ClientPage(clients=clients, nextCursor=next_cursor)
+
+    def get_sales_rep_by_id(self, rep_id: int) -> Optional[SalesRep]:
+        """
+        Get a sales representative by ID
+
+        Args:
+            rep_id: ID of the sales representative to find
+
+        Returns:
+            Optional[SalesRep]: Sales representative with the given ID or None if not found
+        """
+        reps = self._to_models(self._load_reps("position = (SELECT MIN(position) FROM reps WHERE id = ?)", (rep_id,)))
+        return reps[0] if reps else None
+
+    def get_sales_reps_by_region(self, region: str) -> List[SalesRep]:
+        """
+        Get all sales representatives whose region matches or contains the given text
+
+        Args:
+            region: Region (or part of a region name) to filter by
+
+        Returns:
+            List[SalesRep]: List of sales representatives in the specified region
+        """
+        # Like the in-memory index: match the text against the few distinct regions, then look
+        # their reps up through reps_region_key (the planner would rather scan reps in
+        # position order, since there are few regions)
+        return self._to_models(self._load_reps(
+            "position IN (SELECT position FROM reps INDEXED BY reps_region_key WHERE region_key IN "
+            "(SELECT region_key FROM regions WHERE instr(region_key, ?) > 0))",
+            (normalize_key(region),),
+        ))
+
+    def get_sales_reps_by_skill(self, skill: str) -> List[SalesRep]:
+        """
+        Get all sales representatives who have a specific skill
+
+        Args:
+            skill: Skill to filter by
+
+        Returns:
+            List[SalesRep]: List of sales representatives with the specified skill
+        """
+        return self._to_models(self._load_reps(
+            "position IN (SELECT rep_position FROM skills WHERE skill_key = ?)", (normalize_key(skill),)))
+
+    def get_deals_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Get all deals with a specific status, including rep information
+
+        Args:
+            status: Deal status to filter by
+
+        Returns:
+            List[Dict]: List of deals with rep information
+        """
+        rows = self._query(
+            "SELECT r.id, r.name, d.client, d.value, d.status FROM deals d "
+            "JOIN reps r ON r.position = d.rep_position WHERE d.status_key = ? ORDER BY d.id",
+            (normalize_key(status),),
+        )
+        return [
+            {"rep_id": rep_id, "rep_name": rep_name, "deal": Deal(client=client, value=value, status=deal_status)}
+            for rep_id, rep_name, client, value, deal_status in rows
+        ]
+
+    def get_reps_with_deals_above_value(self, value: int) -> List[SalesRep]:
+        """
+        Get all sales representatives who have at least one deal above the specified value
+
+        Args:
+            value: Minimum deal value to filter by
+
+        Returns:
+            List[SalesRep]: List of sales representatives with deals above the specified value
+        """
+        return self._to_models(self._load_reps(
+            "position IN (SELECT rep_position FROM deals WHERE value > ?)", (value,)))
+
+    def get_rep_stats(self, rep_id: int) -> Optional[RepStats]:
+        """
+        Get the stats of a sales representative, aggregated in SQL
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[RepStats]: Stats of the rep or None if not found
+        """
+        stats = self._stats("r.position = (SELECT MIN(position) FROM reps WHERE id = ?)", (rep_id,))
+        return stats[0] if stats else None
+
+    def get_all_rep_stats(self) -> List[RepStats]:
+        """
+        Get the stats of every sales representative, aggregated in SQL
+
+        Returns:
+            List[RepStats]: Stats in data order
+        """
+        return self._stats()
+
+    def get_leaderboard(self, metric: str, k: int, region: Optional[str] = None) -> List[RepStats]:
+        """
+        Get the top k sales representatives by a metric
+
+        Args:
+            metric: Stats field to rank by (won_value, win_rate, won_deals, pipeline_value, total_value)
+            k: Number of reps to return
+            region: Optional region (or part of a region name) to restrict the ranking to
+
+        Returns:
+            List[RepStats]: Stats of the top reps, best first
+        """
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unsupported leaderboard metric: {metric}")
+        if k <= 0:
+            return []
+        if region:
+            return self._stats("instr(r.region_key, ?) > 0", (normalize_key(region),), f"{metric} DESC, position", k)
+        return self._stats(order_by=f"{metric} DESC, position", limit=k)
+
+    def get_rep_performance_summary(self) -> List[Dict[str, Any]]:
+        """
+        Get a summary of each rep's performance
+
+        Returns:
+            List[Dict]: List of performance summaries
+        """
+        return [
+            {
+                "rep_id": stats.rep_id,
+                "rep_name": stats.rep_name,
+                "region": stats.region,
+                "total_value_won": stats.won_value,
+                "won_deals": stats.won_deals,
+                "lost_deals": stats.lost_deals,
+                "in_progress_deals": stats.in_progress_deals,
+                "client_count": stats.client_count
+            }
+            for stats in self._stats()
+        ]
+
+    def get_deal_analytics(self, group_by: str, metrics: List[str]) -> List[AnalyticsGroup]:
+        """
+        Aggregate deals per group with a SQL GROUP BY
+
+        Args:
+            group_by: Field to group by (region, status, rep or client_industry)
+            metrics: Metrics to compute (sum, count, mean, win_rate)
+
+        Returns:
+            List[AnalyticsGroup]: One entry per non-empty group
+        """
+        if group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"Unsupported group by field: {group_by}")
+        unsupported = set(metrics) - set(METRICS)
+        if unsupported:
+            raise ValueError(f"Unsupported metrics: {', '.join(sorted(unsupported))}")
+
+        key, label, order_by = _GROUP_BY_SQL[group_by]
+        rows = self._query(f"""
+            SELECT
+                {label}, MIN(r.id), SUM(d.value), COUNT(*),
+                SUM(d.status = '{CLOSED_WON}'), SUM(d.status = '{CLOSED_LOST}')
+            FROM deals d
+            JOIN reps r ON r.position = d.rep_position
+            LEFT JOIN client_industries ci ON ci.name = d.client
+            GROUP BY {key}
+            ORDER BY {order_by}
+        """)
+
+        groups = []
+        for group, rep_id, total, count, won, lost in rows:
+            entry = {"group": group}
+            if group_by == "rep":
+                entry["rep_id"] = rep_id
+            if "sum" in metrics:
+                entry["sum"] = total
+            if "count" in metrics:
+                entry["count"] = count
+            if "mean" in metrics:
+                entry["mean"] = total / count
+            if "win_rate" in metrics:
+                entry["win_rate"] = won * 100.0 / (won + lost) if won + lost else 0.0
+            groups.append(AnalyticsGroup(**entry))
+        return groups
+
+
+def main():
+    from backend.config import get_env_settings
+
+    settings = get_env_settings()
+    parser = argparse.ArgumentParser(description="Import the sales data JSON file into a SQLite database.")
+    parser.add_argument("--data-file", default=settings.SALES_DATA_FILE)
+    parser.add_argument("--database", default=settings.SALES_DATA_DATABASE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    import_sales_data(args.data_file, args.database)
+
+
+if __name__ == "__main__":
+    main()
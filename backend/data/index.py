@@ -0,0 +1,206 @@
+from typing import Dict, List, Any, Mapping, Optional
+
+import numpy as np
+
+from .schemas import SalesRep
+from .compact import CompactSalesData
+from .columnar import DealColumns
+
+
+def normalize_key(value: str) -> str:
+    """Normalize a region, skill or status so lookups are case and whitespace insensitive."""
+    return value.strip().casefold()
+
+
+def _group_positions(codes: np.ndarray, positions: np.ndarray, code_count: int):
+    """Group positions by code: positions sorted by code (stable) plus per-code offsets."""
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(code_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=code_count), out=offsets[1:])
+    return positions[order], offsets
+
+
+class SalesRepIndex:
+    """
+    Lookup indexes over the loaded sales data, built once when the data is loaded so
+    that the service methods answer without scanning every rep or deal. The indexes
+    are arrays of rep positions grouped by region and skill code, so they can be saved
+    to a snapshot file with the data; models are only built for the matches.
+    """
+
+    ARRAY_FIELDS = (
+        "region_positions", "region_offsets", "skill_positions", "skill_offsets",
+        "max_deal_values", "positions_by_max_deal_value",
+    )
+
+    def __init__(self, data: CompactSalesData, columns: DealColumns, arrays: Optional[Mapping[str, np.ndarray]] = None):
+        """
+        Build all indexes from the rep and deal arrays
+
+        Args:
+            data: Loaded sales data to index
+            columns: Columnar deals of the same data
+            arrays: Indexes saved by `arrays()` in a snapshot file, used instead of building them
+        """
+        self.data = data
+        self.columns = columns
+
+        # Distinct regions, skills and statuses are few: their normalized keys are kept as dicts
+        self.region_codes_by_key: Dict[str, List[int]] = {}
+        for code, region in enumerate(data.regions):
+            self.region_codes_by_key.setdefault(normalize_key(region), []).append(code)
+        self.skill_codes_by_key: Dict[str, List[int]] = {}
+        for code, skill in enumerate(data.skills):
+            self.skill_codes_by_key.setdefault(normalize_key(skill), []).append(code)
+        # Status codes per normalized status, so differently cased statuses match together
+        self.status_codes_by_key: Dict[str, List[int]] = {}
+        for code, status in enumerate(columns.statuses):
+            self.status_codes_by_key.setdefault(normalize_key(status), []).append(code)
+
+        if arrays is None:
+            arrays = self._build(data, columns)
+        for name in self.ARRAY_FIELDS:
+            setattr(self, f"_{name}", arrays[name])
+
+    @staticmethod
+    def _build(data: CompactSalesData, columns: DealColumns) -> Dict[str, np.ndarray]:
+        positions = np.arange(len(data), dtype=np.int64)
+        region_positions, region_offsets = _group_positions(data.rep_region, positions, len(data.regions))
+
+        skill_reps = np.repeat(positions, np.diff(data.rep_skill_offsets))
+        skill_positions, skill_offsets = _group_positions(data.rep_skill, skill_reps, len(data.skills))
+
+        # Rep positions sorted by their largest deal, so "any deal above X" is a binary search.
+        # A rep's deals are contiguous rows, so the maxima are one reduceat.
+        deal_starts = data.rep_deal_offsets[:-1]
+        with_deals = np.flatnonzero(np.diff(data.rep_deal_offsets) > 0)
+        max_deal_values = np.zeros(0, dtype=np.int64)
+        if len(with_deals):
+            max_deal_values = np.maximum.reduceat(columns.value, deal_starts[with_deals])
+        order = np.argsort(max_deal_values, kind="stable")
+
+        return {
+            "region_positions": region_positions,
+            "region_offsets": region_offsets,
+            "skill_positions": skill_positions,
+            "skill_offsets": skill_offsets,
+            "max_deal_values": max_deal_values[order],
+            "positions_by_max_deal_value": with_deals[order],
+        }
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get the index arrays, for saving them to a snapshot file
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays by name
+        """
+        return {name: getattr(self, f"_{name}") for name in self.ARRAY_FIELDS}
+
+    def get_position(self, rep_id: int) -> Optional[int]:
+        """
+        Get the data position of the first rep with the given id
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[int]: The rep's position or None if not found
+        """
+        return self.data.position_of(rep_id)
+
+    def get_by_id(self, rep_id: int) -> Optional[SalesRep]:
+        """
+        Get the first rep with the given id
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[SalesRep]: The rep or None if not found
+        """
+        position = self.data.position_of(rep_id)
+        return self.data.rep_model(position) if position is not None else None
+
+    def get_by_region(self, region: str) -> List[SalesRep]:
+        """
+        Get reps whose region matches or contains the given text
+
+        Args:
+            region: Region (or part of a region name) to look up
+
+        Returns:
+            List[SalesRep]: Matching reps in data order
+        """
+        return self.data.rep_models(self.get_positions_by_region(region))
+
+    def get_positions_by_region(self, region: str) -> List[int]:
+        """
+        Get data positions of reps whose region matches or contains the given text
+
+        Args:
+            region: Region (or part of a region name) to look up
+
+        Returns:
+            List[int]: Matching rep positions in ascending order
+        """
+        # Partial names ("america") scan the handful of distinct regions, not every rep
+        key = normalize_key(region)
+        codes = [code for region_key, codes in self.region_codes_by_key.items() if key in region_key for code in codes]
+        positions = [self._region_positions[self._region_offsets[code]:self._region_offsets[code + 1]] for code in codes]
+        if len(positions) == 1:
+            return positions[0].tolist()
+        return np.sort(np.concatenate(positions)).tolist() if positions else []
+
+    def get_by_skill(self, skill: str) -> List[SalesRep]:
+        """
+        Get reps with the given skill
+
+        Args:
+            skill: Skill to look up
+
+        Returns:
+            List[SalesRep]: Matching reps in data order
+        """
+        codes = self.skill_codes_by_key.get(normalize_key(skill), [])
+        if not codes:
+            return []
+        # np.unique also drops a rep listing the same skill twice
+        positions = np.unique(np.concatenate(
+            [self._skill_positions[self._skill_offsets[code]:self._skill_offsets[code + 1]] for code in codes]))
+        return self.data.rep_models(positions)
+
+    def get_deals_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Get deal references with the given status
+
+        Args:
+            status: Deal status to look up
+
+        Returns:
+            List[Dict]: Deals with rep information
+        """
+        codes = self.status_codes_by_key.get(normalize_key(status))
+        if not codes:
+            return []
+        data = self.data
+        rows = np.flatnonzero(np.isin(self.columns.status_code, codes))
+        positions = self.columns.rep_index[rows]
+        rep_ids, rep_names = data.rep_id[positions].tolist(), data.rep_name[positions].tolist()
+        return [
+            {"rep_id": rep_id, "rep_name": rep_name, "deal": deal}
+            for rep_id, rep_name, deal in zip(rep_ids, data.names.take(rep_names), data.deals(rows))
+        ]
+
+    def get_reps_with_deals_above_value(self, value: int) -> List[SalesRep]:
+        """
+        Get reps with at least one deal strictly above the given value
+
+        Args:
+            value: Minimum deal value (exclusive)
+
+        Returns:
+            List[SalesRep]: Matching reps in data order
+        """
+        start = np.searchsorted(self._max_deal_values, value, side="right")
+        return self.data.rep_models(np.sort(self._positions_by_max_deal_value[start:]))
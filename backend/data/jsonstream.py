@@ -0,0 +1,118 @@
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+# Bytes read from the JSON file at a time
+READ_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_sales_reps(file: BinaryIO, hasher: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rep objects of a `{"salesReps": [...]}` JSON file one at a time, reading
+    it in chunks so that only the current chunk (and the current value) is held in memory.
+    The whole file is checked to be one JSON object; its other members are decoded and
+    skipped.
+
+    Args:
+        file: JSON data file opened in binary mode
+        hasher: Optional hashlib object updated with every byte of the file
+
+    Yields:
+        Dict: The next rep object, as decoded by the json module
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON (positions are relative to the
+            chunk being read)
+        ValueError: If the file is a JSON object without a salesReps array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+
+    def read_more() -> bool:
+        # Drop what has been consumed and append the next chunk
+        nonlocal buffer, position
+        chunk = file.read(READ_CHUNK_SIZE)
+        if hasher is not None:
+            hasher.update(chunk)
+        buffer = buffer[position:] + text_decoder.decode(chunk, final=not chunk)
+        position = 0
+        return bool(chunk)
+
+    def peek() -> str:
+        # The next character after whitespace, or "" at the end of the file
+        nonlocal position
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            if not read_more():
+                return ""
+
+    def expect(characters: str, expecting: str) -> str:
+        nonlocal position
+        character = peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(f"Expecting {expecting}", buffer, position)
+        position += 1
+        return character
+
+    def decode() -> Any:
+        nonlocal position
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The value may continue past the end of the buffer
+                if read_more():
+                    continue
+                raise
+            # A number may also continue in the next chunk
+            if end == len(buffer) and read_more():
+                continue
+            position = end
+            return value
+
+    def decode_key() -> str:
+        if peek() != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, position)
+        key = decode()
+        expect(":", "':' delimiter")
+        return key
+
+    found = False
+    if peek() != "{":
+        # Valid JSON of another type, or a decoding error
+        decode()
+        raise ValueError("No salesReps array in data file")
+    position += 1
+    if peek() == "}":
+        raise ValueError("No salesReps array in data file")
+    while True:
+        key = decode_key()
+        if key == "salesReps" and not found:
+            found = True
+            if peek() != "[":
+                raise ValueError("No salesReps array in data file")
+            position += 1
+            if peek() == "]":
+                position += 1
+            else:
+                while True:
+                    yield decode()
+                    if expect(",]", "',' or ']' in the salesReps array") == "]":
+                        break
+        else:
+            decode()
+        if expect(",}", "',' or '}' in the data object") == "}":
+            break
+
+    if peek():
+        raise json.JSONDecodeError("Extra data", buffer, position)
+    if not found:
+        raise ValueError("No salesReps array in data file")
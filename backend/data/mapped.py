@@ -0,0 +1,151 @@
+"""
+Binary snapshot files: named NumPy arrays plus a JSON manifest in one file that
+processes map read-only, so every worker shares one copy through the OS page cache.
+
+Layout: an 8-byte magic, the format version and the manifest length (little-endian
+uint32 and uint64), the UTF-8 JSON manifest, then every array's raw bytes at a 64-byte
+aligned offset listed in the manifest.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from .compact import StringColumn
+
+MAGIC = b"SALESNAP"
+# Bump whenever the arrays written by the snapshot classes change meaning or name
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_HEADER = struct.Struct("<8sIQ")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_array_file(path: Union[str, Path], arrays: Mapping[str, np.ndarray], meta: Dict[str, Any]) -> Path:
+    """
+    Write arrays and metadata to a snapshot file. The file is written next to its
+    destination and renamed over it, so processes mapping the previous file keep a
+    consistent view and watchers see a single change.
+
+    Args:
+        path: Output file
+        arrays: Arrays by name
+        meta: JSON-serializable metadata stored in the manifest
+
+    Returns:
+        Path: The written file
+    """
+    path = Path(path)
+    entries = {}
+    offset = 0
+    for name, values in arrays.items():
+        values = np.asarray(values)
+        entries[name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+        offset = _aligned(offset + values.nbytes)
+    manifest = json.dumps({"meta": meta, "arrays": entries}).encode("utf-8")
+    data_start = _aligned(_HEADER.size + len(manifest))
+
+    partial = path.with_name(path.name + ".writing")
+    try:
+        with open(partial, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(manifest)))
+            file.write(manifest)
+            for name, values in arrays.items():
+                file.seek(data_start + entries[name]["offset"])
+                np.ascontiguousarray(values).tofile(file)
+            # Pad to the end of the last aligned array so every mapped view is in bounds
+            file.truncate(data_start + offset)
+        os.replace(partial, path)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    return path
+
+
+def open_array_file(path: Union[str, Path]) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Map a snapshot file read-only. The arrays are views of the mapping, so nothing is
+    copied and pages are only read from disk when used.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], Dict]: Read-only arrays by name, and the metadata
+
+    Raises:
+        ValueError: If the file is not a snapshot file of the supported format version
+    """
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapping) < _HEADER.size:
+        raise ValueError(f"Not a sales data snapshot file: {path}")
+    magic, version, manifest_size = _HEADER.unpack_from(mapping)
+    if magic != MAGIC:
+        raise ValueError(f"Not a sales data snapshot file: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Snapshot file {path} has format version {version}, expected {FORMAT_VERSION}; rebuild it")
+
+    manifest = json.loads(mapping[_HEADER.size:_HEADER.size + manifest_size])
+    data_start = _aligned(_HEADER.size + manifest_size)
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(
+            mapping, dtype=dtype, count=count, offset=data_start + entry["offset"]).reshape(entry["shape"])
+    return arrays, manifest["meta"]
+
+
+def section(arrays: Mapping[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    """Get the arrays saved under a name prefix, without the prefix."""
+    start = f"{prefix}/"
+    return {name[len(start):]: values for name, values in arrays.items() if name.startswith(start)}
+
+
+def prefixed(arrays: Mapping[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    """Put arrays under a name prefix, to be read back with `section`."""
+    return {f"{prefix}/{name}": values for name, values in arrays.items()}
+
+
+class DocumentVectors:
+    """
+    Embedding matrix of the rep documents of a snapshot: one L2-normalized float32 row
+    per document, with the document ids and rep ids of the rows. Saved in the snapshot
+    file, so nearest-neighbour search runs on the mapped matrix in every worker.
+    """
+
+    __slots__ = ("ids", "rep_ids", "matrix", "meta")
+
+    def __init__(self, ids: StringColumn, rep_ids: np.ndarray, matrix: np.ndarray, meta: Dict[str, Any]):
+        """
+        Args:
+            ids: Document id of every row
+            rep_ids: Rep id of every row (int64)
+            matrix: Normalized embeddings (float32, one row per document)
+            meta: How the documents and embeddings were built (embedding space, chunk size)
+        """
+        self.ids = ids
+        self.rep_ids = rep_ids
+        self.matrix = matrix
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.rep_ids)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"rep_ids": self.rep_ids, "matrix": self.matrix, **self.ids.arrays("ids")}
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], meta: Dict[str, Any]) -> Optional["DocumentVectors"]:
+        if "matrix" not in arrays:
+            return None
+        return cls(StringColumn.from_arrays(arrays, "ids"), arrays["rep_ids"], arrays["matrix"], meta)
@@ -0,0 +1,54 @@
+import base64
+import re
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# A non-negative position, optionally followed by the key of the item at that position
+_CURSOR = re.compile(r"(\d+)(?::(-?\d+))?")
+
+
+def encode_cursor(position: int, key: Optional[int] = None) -> str:
+    """
+    Encode an opaque cursor pointing just after an item
+
+    Args:
+        position: Position of the last item of the page
+        key: Optional stable key of that item (e.g. a rep id), used to re-anchor the
+            cursor if the data was reloaded between pages
+
+    Returns:
+        str: URL-safe cursor
+
+    Raises:
+        ValueError: If the position is negative
+    """
+    if position < 0:
+        raise ValueError(f"Cursor position must not be negative: {position}")
+    raw = f"{position}" if key is None else f"{position}:{key}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[int]]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor from a previous page
+
+    Returns:
+        Tuple[int, Optional[int]]: Position and key of the last item of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed or its position is negative
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    match = _CURSOR.fullmatch(raw)
+    if match is None:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    position, key = match.groups()
+    return int(position), int(key) if key is not None else None
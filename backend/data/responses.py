@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import orjson
+import zstandard
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from backend.metrics.timing import stage
+
+# Cached responses per snapshot. Region lookups accept free text, and most partial region
+# names match a large share of the reps, so the cache is bounded by its size in bytes
+# (bodies and their compressed variants) as well as by its number of entries.
+MAX_CACHED_RESPONSES = 4096
+MAX_CACHED_RESPONSE_BYTES = 256 * 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _build_payload(build: Callable[[], Any]) -> Optional["SerializedPayload"]:
+    with stage("query"):
+        data = build()
+    if not data:
+        return None
+    with stage("serialize"):
+        return SerializedPayload(orjson.dumps(data, default=_orjson_default))
+
+
+class SerializedPayload:
+    """
+    A JSON body serialized once, with its compressed variants created on first use.
+    Each variant has its own strong ETag derived from the body hash.
+    """
+
+    __slots__ = ("body", "digest", "nbytes", "on_grow", "_variants", "_lock")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        # Size of the body and of the variants created so far
+        self.nbytes = len(body)
+        # Accounts for each new variant instead, while a cache holds the payload
+        self.on_grow: Optional[Callable[["SerializedPayload", int], None]] = None
+        self._variants: Dict[str, bytes] = {"identity": body}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+    def variant(self, encoding: str) -> bytes:
+        """Get the body in the given content coding (identity, gzip or zstd)."""
+        content = self._variants.get(encoding)
+        if content is None:
+            with self._lock:
+                content = self._variants.get(encoding)
+                if content is None:
+                    with stage("compress"):
+                        if encoding == "gzip":
+                            content = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+                        else:
+                            content = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(self.body)
+                    self._variants[encoding] = content
+                    on_grow = self.on_grow
+                    if on_grow is not None:
+                        on_grow(self, len(content))
+                    else:
+                        self.nbytes += len(content)
+        return content
+
+    def to_response(self, request: Request) -> Response:
+        """
+        Build the response for a request: the best accepted encoding, or 304 when the
+        client already holds the same representation.
+
+        Args:
+            request: Incoming request (Accept-Encoding and If-None-Match are honoured)
+
+        Returns:
+            Response: 200 with the cached bytes or 304 Not Modified
+        """
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = "identity"
+        for candidate in ("zstd", "gzip"):
+            if accepted.get(candidate, 0) > 0:
+                encoding = candidate
+                break
+
+        etag = self.etag(encoding)
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.variant(encoding), media_type="application/json", headers=headers)
+
+
+class SnapshotResponseCache:
+    """
+    Serialized responses of one data snapshot. Since a snapshot never changes, its
+    responses are serialized (with orjson) once and served from memory afterwards. The
+    least recently used responses are dropped beyond `max_entries` or `max_bytes`.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES, max_bytes: int = MAX_CACHED_RESPONSE_BYTES):
+        self._entries: "OrderedDict[Hashable, SerializedPayload]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the cached bodies and their compressed variants."""
+        return self._bytes
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Optional[SerializedPayload]:
+        """
+        Get the serialized payload for a key, building and serializing it on a miss
+
+        Args:
+            key: Cache key identifying the response within the snapshot
+            build: Returns the data to serialize, or None/empty if there is nothing to return
+
+        Returns:
+            Optional[SerializedPayload]: Serialized payload, or None when build found nothing
+                (such results are not cached)
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+
+        payload = _build_payload(build)
+        if payload is None or payload.nbytes > self._max_bytes:
+            return payload
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._forget(previous)
+            self._entries[key] = payload
+            self._bytes += payload.nbytes
+            payload.on_grow = self._grew
+            self._evict()
+        return payload
+
+    def _grew(self, payload: SerializedPayload, nbytes: int) -> None:
+        with self._lock:
+            payload.nbytes += nbytes
+            # The payload may have been evicted since it called back
+            if payload.on_grow is not None:
+                self._bytes += nbytes
+                self._evict()
+
+    def _forget(self, payload: SerializedPayload) -> None:
+        payload.on_grow = None
+        self._bytes -= payload.nbytes
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+            _, payload = self._entries.popitem(last=False)
+            self._forget(payload)
+
+
+class UncachedResponses:
+    """
+    Same interface as SnapshotResponseCache, serializing on every call. Used by storage
+    backends whose data is not held in memory, so responses are not either.
+    """
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Optional[SerializedPayload]:
+        return _build_payload(build)
@@ -1,32 +1,135 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
-from .schemas import SalesRep, SalesData
-from .service import SalesRepService, get_sales_rep_service
+from typing import List, Dict, Any, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from .schemas import (
+    SalesRep, SalesData, AnalyticsGroup, AnalyticsGroupBy, AnalyticsMetric, RepStats, LeaderboardMetric,
+    SalesRepPage, DealPage, ClientPage,
+)
+from .service import SalesRepService, get_sales_rep_service, SALES_REP_FIELDS
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from .index import normalize_key
+from backend.metrics.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
-@router.get("/", response_model=SalesData)
-async def get_all(service: SalesRepService = Depends(get_sales_rep_service)):
-    return service.get_all_sales_reps()
+@router.get("/", response_model=Union[SalesData, SalesRepPage], response_model_exclude_unset=True)
+async def get_all(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor returned as nextCursor by the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated rep fields to return, any of: {', '.join(SALES_REP_FIELDS)}"),
+    service: SalesRepService = Depends(get_sales_rep_service),
+):
+    """
+    Returns all sales reps. When any of cursor, limit or fields is given, returns a page of
+    reps restricted to the requested fields instead, with a cursor to the next page.
+    """
+    if cursor is None and limit is None and fields is None:
+        payload = service.responses.get_or_build(("all",), service.get_all_sales_reps)
+        return payload.to_response(request)
+
+    selected_fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else SALES_REP_FIELDS
+    try:
+        return service.get_sales_reps_page(cursor, limit or DEFAULT_PAGE_SIZE, selected_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/analytics", response_model=List[AnalyticsGroup], response_model_exclude_none=True)
+async def get_analytics(
+    group_by: AnalyticsGroupBy = Query(AnalyticsGroupBy.region, description="Field to group deals by"),
+    metrics: List[AnalyticsMetric] = Query(list(AnalyticsMetric), description="Aggregates to compute per group"),
+    service: SalesRepService = Depends(get_sales_rep_service),
+):
+    """
+    Aggregate deals by region, status, rep or client industry.
+    """
+    return service.get_deal_analytics(group_by.value, [metric.value for metric in metrics])
+
+
+@router.get("/stats", response_model=List[RepStats])
+async def get_all_stats(service: SalesRepService = Depends(get_sales_rep_service)):
+    """
+    Precomputed deal statistics of every sales rep.
+    """
+    return service.get_all_rep_stats()
+
+
+@router.get("/leaderboard/{metric}", response_model=List[RepStats])
+async def get_leaderboard(
+    metric: LeaderboardMetric,
+    k: int = Query(10, ge=1, le=1000, description="Number of reps to return"),
+    region: Optional[str] = Query(None, description="Only rank reps in this region"),
+    service: SalesRepService = Depends(get_sales_rep_service),
+):
+    """
+    Top k sales reps by won value, win rate, won deals, pipeline value or total value.
+    """
+    return service.get_leaderboard(metric.value, k, region)
 
 
 @router.get("/{rep_id}", response_model=SalesRep)
-async def get_by_id(rep_id: int, service: SalesRepService = Depends(get_sales_rep_service)):
-    sales_rep = service.get_sales_rep_by_id(rep_id)
-    if not sales_rep:
+async def get_by_id(rep_id: int, request: Request, service: SalesRepService = Depends(get_sales_rep_service)):
+    payload = service.responses.get_or_build(
+        ("rep", rep_id), lambda: service.get_sales_rep_by_id(rep_id))
+    if not payload:
+        raise HTTPException(
+            status_code=404, detail="Sales representative not found")
+    return payload.to_response(request)
+
+
+@router.get("/{rep_id}/stats", response_model=RepStats)
+async def get_stats_by_id(rep_id: int, service: SalesRepService = Depends(get_sales_rep_service)):
+    stats = service.get_rep_stats(rep_id)
+    if not stats:
         raise HTTPException(
             status_code=404, detail="Sales representative not found")
-    return sales_rep
+    return stats
+
+
+@router.get("/{rep_id}/deals", response_model=DealPage, response_model_exclude_unset=True)
+async def get_deals_by_id(
+    rep_id: int,
+    cursor: Optional[str] = Query(None, description="Cursor returned as nextCursor by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    service: SalesRepService = Depends(get_sales_rep_service),
+):
+    try:
+        page = service.get_rep_deals_page(rep_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not page:
+        raise HTTPException(
+            status_code=404, detail="Sales representative not found")
+    return page
+
+
+@router.get("/{rep_id}/clients", response_model=ClientPage, response_model_exclude_unset=True)
+async def get_clients_by_id(
+    rep_id: int,
+    cursor: Optional[str] = Query(None, description="Cursor returned as nextCursor by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    service: SalesRepService = Depends(get_sales_rep_service),
+):
+    try:
+        page = service.get_rep_clients_page(rep_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not page:
+        raise HTTPException(
+            status_code=404, detail="Sales representative not found")
+    return page
 
 
 @router.get("/region/{region}", response_model=List[SalesRep])
-async def get_by_region(region: str, service: SalesRepService = Depends(get_sales_rep_service)):
-    sales_reps = service.get_sales_reps_by_region(region)
-    if not sales_reps:
+async def get_by_region(region: str, request: Request, service: SalesRepService = Depends(get_sales_rep_service)):
+    payload = service.responses.get_or_build(
+        ("region", normalize_key(region)), lambda: service.get_sales_reps_by_region(region))
+    if not payload:
         raise HTTPException(
             status_code=404, detail="No sales representatives found in the given region")
-    return sales_reps
+    return payload.to_response(request)
 
 
 @router.get("/skill/{skill}", response_model=List[SalesRep])
@@ -39,9 +142,10 @@ async def get_by_skill(skill: str, service: SalesRepService = Depends(get_sales_
 
 
 @router.get("/deals/status/{status}", response_model=List[Dict[str, Any]])
-async def get_deals_by_status(status: str, service: SalesRepService = Depends(get_sales_rep_service)):
-    deals = service.get_deals_by_status(status)
-    if len(deals) == 0:
+async def get_deals_by_status(status: str, request: Request, service: SalesRepService = Depends(get_sales_rep_service)):
+    payload = service.responses.get_or_build(
+        ("status", normalize_key(status)), lambda: service.get_deals_by_status(status))
+    if not payload:
         raise HTTPException(
             status_code=404, detail="No deals found with the given status")
-    return deals
+    return payload.to_response(request)
@@ -1,20 +1,27 @@
-from typing import List, Dict
-from pydantic import BaseModel
+from enum import Enum
+from typing import List, Dict, Optional
+from pydantic import BaseModel, ConfigDict
 
 
 class Deal(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     client: str
     value: int
     status: str
 
 
 class Client(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     industry: str
     contact: str
 
 
 class SalesRep(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     role: str
@@ -54,5 +61,85 @@ class SalesRep(BaseModel):
         return closed_won / total * 100
 
 
+class RepStats(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    rep_id: int
+    rep_name: str
+    region: str
+    won_deals: int
+    lost_deals: int
+    in_progress_deals: int
+    total_deals: int
+    won_value: int
+    pipeline_value: int
+    total_value: int
+    win_rate: float
+    client_count: int
+
+
 class SalesData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     salesReps: List[SalesRep]
+
+
+SALES_REP_FIELDS = ("id", "name", "role", "region", "skills", "deals", "clients", "stats")
+
+
+class SalesRepProjection(BaseModel):
+    """A sales rep restricted to the fields requested with `fields=`."""
+    id: Optional[int] = None
+    name: Optional[str] = None
+    role: Optional[str] = None
+    region: Optional[str] = None
+    skills: Optional[List[str]] = None
+    deals: Optional[List[Deal]] = None
+    clients: Optional[List[Client]] = None
+    stats: Optional[RepStats] = None
+
+
+class SalesRepPage(BaseModel):
+    salesReps: List[SalesRepProjection]
+    nextCursor: Optional[str] = None
+
+
+class DealPage(BaseModel):
+    deals: List[Deal]
+    nextCursor: Optional[str] = None
+
+
+class ClientPage(BaseModel):
+    clients: List[Client]
+    nextCursor: Optional[str] = None
+
+
+class AnalyticsGroupBy(str, Enum):
+    region = "region"
+    status = "status"
+    rep = "rep"
+    client_industry = "client_industry"
+
+
+class AnalyticsMetric(str, Enum):
+    sum = "sum"
+    count = "count"
+    mean = "mean"
+    win_rate = "win_rate"
+
+
+class AnalyticsGroup(BaseModel):
+    group: str
+    rep_id: Optional[int] = None
+    sum: Optional[int] = None
+    count: Optional[int] = None
+    mean: Optional[float] = None
+    win_rate: Optional[float] = None
+
+
+class LeaderboardMetric(str, Enum):
+    won_value = "won_value"
+    win_rate = "win_rate"
+    won_deals = "won_deals"
+    pipeline_value = "pipeline_value"
+    total_value = "total_value"
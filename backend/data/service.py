@@ -1,64 +1,66 @@
-from typing import Optional, List, Dict, Any
-import json
-from functools import lru_cache
+import logging
 from pathlib import Path
+from typing import Optional, List, Dict, Any, Sequence, Union
+from functools import lru_cache, partial
 
-from .schemas import SalesRep, SalesData
+from .schemas import (
+    SalesRep, SalesData, AnalyticsGroup, RepStats,
+    SalesRepProjection, SalesRepPage, DealPage, ClientPage, SALES_REP_FIELDS,
+)
+from .pagination import encode_cursor, decode_cursor
+from backend.config import get_env_settings
+from backend.metrics.timing import stage
+from .snapshot import SalesDataSnapshot
+from .store import SalesDataStore
+from .responses import SnapshotResponseCache
+from .database import SQLiteSalesRepService, sync_database
+
+logger = logging.getLogger(__name__)
 
 
 class SalesRepService:
     """Service class to handle sales representative data operations"""
 
-    def __init__(self, data_file_path: str = "sales_data.json"):
+    def __init__(self, snapshot: SalesDataSnapshot):
         """
-        Initialize the service with the path to the JSON data file
+        Initialize the service on top of a loaded data snapshot
 
         Args:
-            data_file_path: Path to the JSON data file
+            snapshot: Shared, immutable snapshot of the sales data
         """
-        self.data_file_path = data_file_path
-        self._data, self._raw_json_data = self._load_data()
+        self._snapshot = snapshot
+        self._data = snapshot.data
+        self._index = snapshot.index
 
     @property
-    def data(self) -> SalesData:
+    def snapshot(self) -> SalesDataSnapshot:
         """
-        Get the loaded data
+        Get the data snapshot this service answers from
 
         Returns:
-            SalesData: Loaded data in Pydantic model
+            SalesDataSnapshot: Shared data snapshot
         """
-        return self._data
+        return self._snapshot
 
     @property
-    def raw_json_data(self) -> Dict[str, Any]:
+    def responses(self) -> SnapshotResponseCache:
         """
-        Get the raw JSON data
+        Get the serialized response cache of the snapshot
 
         Returns:
-            Dict: Raw JSON data
+            SnapshotResponseCache: Shared response cache
         """
-        return self._raw_json_data
+        return self._snapshot.responses
 
-    @lru_cache(maxsize=1)
-    def _load_data(self) -> SalesData:
+    @property
+    def data(self) -> SalesData:
         """
-        Load data from JSON file and parse it into Pydantic models
-        Returns cached results after first call
+        Get the loaded data, built from the compact snapshot data on every access
 
         Returns:
-            SalesRep: Parsed data in Pydantic model
+            SalesData: Loaded data in Pydantic model
         """
-        try:
-            with open(self.data_file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                return SalesData(**data), data
-        except FileNotFoundError:
-            raise Exception(f"Data file not found: {self.data_file_path}")
-        except json.JSONDecodeError:
-            raise Exception(
-                f"Invalid JSON in data file: {self.data_file_path}")
-        except Exception as e:
-            raise Exception(f"Error loading data: {str(e)}")
+        return self._data.to_model()
 
     def get_all_sales_reps(self) -> SalesData:
         """
@@ -67,7 +69,109 @@ class SalesRepService:
         Returns:
             SalesData: List of all sales representatives
         """
-        return self._data
+        return self._data.to_model()
+
+    def get_sales_reps_page(self, cursor: Optional[str], limit: int, fields: Sequence[str]) -> SalesRepPage:
+        """
+        Get one page of sales representatives, restricted to the requested fields
+
+        Args:
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of reps in the page
+            fields: Rep fields to include (see SALES_REP_FIELDS)
+
+        Returns:
+            SalesRepPage: The page and the cursor of the next one (None on the last page)
+
+        Raises:
+            ValueError: If the cursor or a field name is invalid
+        """
+        unknown = set(fields) - set(SALES_REP_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        reps = self._data.reps
+        start = 0
+        if cursor:
+            position, rep_id = decode_cursor(cursor)
+            # Re-anchor on the rep id in case the data was reloaded between pages
+            if rep_id is not None and not (position < len(reps) and self._data.rep_id[position] == rep_id):
+                anchor = self._index.get_position(rep_id)
+                position = anchor if anchor is not None else position
+            start = position + 1
+
+        positions = range(start, min(start + limit, len(reps)))
+        items = []
+        for position in positions:
+            rep = reps[position]
+            item = {}
+            for field in fields:
+                if field == "stats":
+                    item["stats"] = self._snapshot.stats.record(position)
+                elif field == "skills":
+                    item["skills"] = list(rep.skills)
+                elif field == "deals":
+                    item["deals"] = self._data.deals(self._data.deal_rows(position))
+                elif field == "clients":
+                    item["clients"] = self._data.clients(self._data.client_rows(position))
+                else:
+                    item[field] = getattr(rep, field)
+            items.append(SalesRepProjection(**item))
+
+        next_cursor = None
+        if positions and positions.stop < len(reps):
+            next_cursor = encode_cursor(positions.stop - 1, reps[positions.stop - 1].id)
+        return SalesRepPage(salesReps=items, nextCursor=next_cursor)
+
+    def get_rep_deals_page(self, rep_id: int, cursor: Optional[str], limit: int) -> Optional[DealPage]:
+        """
+        Get one page of a sales representative's deals
+
+        Args:
+            rep_id: ID of the sales representative
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of deals in the page
+
+        Returns:
+            Optional[DealPage]: The page, or None if the rep was not found
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        position = self._index.get_position(rep_id)
+        if position is None:
+            return None
+        rows, next_cursor = self._paginate(self._data.deal_rows(position), cursor, limit)
+        return DealPage(deals=self._data.deals(rows), nextCursor=next_cursor)
+
+    def get_rep_clients_page(self, rep_id: int, cursor: Optional[str], limit: int) -> Optional[ClientPage]:
+        """
+        Get one page of a sales representative's clients
+
+        Args:
+            rep_id: ID of the sales representative
+            cursor: Cursor returned with the previous page, or None for the first page
+            limit: Maximum number of clients in the page
+
+        Returns:
+            Optional[ClientPage]: The page, or None if the rep was not found
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        position = self._index.get_position(rep_id)
+        if position is None:
+            return None
+        rows, next_cursor = self._paginate(self._data.client_rows(position), cursor, limit)
+        return ClientPage(clients=self._data.clients(rows), nextCursor=next_cursor)
+
+    @staticmethod
+    def _paginate(items: Sequence[Any], cursor: Optional[str], limit: int):
+        """Slice a page out of a sequence by position cursor."""
+        start = decode_cursor(cursor)[0] + 1 if cursor else 0
+        page = items[start:start + limit]
+        next_cursor = encode_cursor(start + len(page) - 1) if page and start + len(page) < len(items) else None
+        return page, next_cursor
 
     def get_sales_rep_by_id(self, rep_id: int) -> Optional[SalesRep]:
         """
@@ -79,10 +183,7 @@ class SalesRepService:
         Returns:
             Optional[SalesRep]: Sales representative with the given ID or None if not found
         """
-        for rep in self._data.salesReps:
-            if rep.id == rep_id:
-                return rep
-        return None
+        return self._index.get_by_id(rep_id)
 
     def get_sales_reps_by_region(self, region: str) -> List[SalesRep]:
         """
@@ -94,7 +195,7 @@ class SalesRepService:
         Returns:
             List[SalesRep]: List of sales representatives in the specified region
         """
-        return [rep for rep in self._data.salesReps if region.lower() in rep.region.lower()]
+        return self._index.get_by_region(region)
 
     def get_sales_reps_by_skill(self, skill: str) -> List[SalesRep]:
         """
@@ -106,7 +207,7 @@ class SalesRepService:
         Returns:
             List[SalesRep]: List of sales representatives with the specified skill
         """
-        return [rep for rep in self._data.salesReps if skill.lower() in [s.lower() for s in rep.skills]]
+        return self._index.get_by_skill(skill)
 
     def get_deals_by_status(self, status: str) -> List[Dict[str, Any]]:
         """
@@ -118,16 +219,7 @@ class SalesRepService:
         Returns:
             List[Dict]: List of deals with rep information
         """
-        deals = []
-        for rep in self._data.salesReps:
-            for deal in rep.deals:
-                if deal.status.lower() == status.lower():
-                    deals.append({
-                        "rep_id": rep.id,
-                        "rep_name": rep.name,
-                        "deal": deal
-                    })
-        return deals
+        return self._index.get_deals_by_status(status)
 
     def get_reps_with_deals_above_value(self, value: int) -> List[SalesRep]:
         """
@@ -139,10 +231,43 @@ class SalesRepService:
         Returns:
             List[SalesRep]: List of sales representatives with deals above the specified value
         """
-        return [
-            rep for rep in self._data.salesReps
-            if any(deal.value > value for deal in rep.deals)
-        ]
+        return self._index.get_reps_with_deals_above_value(value)
+
+    def get_rep_stats(self, rep_id: int) -> Optional[RepStats]:
+        """
+        Get the precomputed stats of a sales representative
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[RepStats]: Stats of the rep or None if not found
+        """
+        return self._snapshot.stats.get(rep_id)
+
+    def get_all_rep_stats(self) -> List[RepStats]:
+        """
+        Get the precomputed stats of every sales representative
+
+        Returns:
+            List[RepStats]: Stats in data order
+        """
+        return self._snapshot.stats.records
+
+    def get_leaderboard(self, metric: str, k: int, region: Optional[str] = None) -> List[RepStats]:
+        """
+        Get the top k sales representatives by a metric
+
+        Args:
+            metric: Stats field to rank by (won_value, win_rate, won_deals, pipeline_value, total_value)
+            k: Number of reps to return
+            region: Optional region (or part of a region name) to restrict the ranking to
+
+        Returns:
+            List[RepStats]: Stats of the top reps, best first
+        """
+        positions = self._index.get_positions_by_region(region) if region else None
+        return self._snapshot.stats.top(metric, k, positions)
 
     def get_rep_performance_summary(self) -> List[Dict[str, Any]]:
         """
@@ -151,36 +276,103 @@ class SalesRepService:
         Returns:
             List[Dict]: List of performance summaries
         """
-        summaries = []
-        for rep in self._data.salesReps:
-            total_value = sum(
-                deal.value for deal in rep.deals if deal.status == "Closed Won")
-            won_deals = sum(
-                1 for deal in rep.deals if deal.status == "Closed Won")
-            lost_deals = sum(
-                1 for deal in rep.deals if deal.status == "Closed Lost")
-            in_progress = sum(
-                1 for deal in rep.deals if deal.status == "In Progress")
-
-            summaries.append({
-                "rep_id": rep.id,
-                "rep_name": rep.name,
-                "region": rep.region,
-                "total_value_won": total_value,
-                "won_deals": won_deals,
-                "lost_deals": lost_deals,
-                "in_progress_deals": in_progress,
-                "client_count": len(rep.clients)
-            })
-
-        return summaries
-
-
-def get_sales_rep_service() -> SalesRepService:
+        return [
+            {
+                "rep_id": stats.rep_id,
+                "rep_name": stats.rep_name,
+                "region": stats.region,
+                "total_value_won": stats.won_value,
+                "won_deals": stats.won_deals,
+                "lost_deals": stats.lost_deals,
+                "in_progress_deals": stats.in_progress_deals,
+                "client_count": stats.client_count
+            }
+            for stats in self._snapshot.stats.records
+        ]
+
+
+    def get_deal_analytics(self, group_by: str, metrics: List[str]) -> List[AnalyticsGroup]:
+        """
+        Aggregate deals per group using the snapshot's columnar deal arrays
+
+        Args:
+            group_by: Field to group by (region, status, rep or client_industry)
+            metrics: Metrics to compute (sum, count, mean, win_rate)
+
+        Returns:
+            List[AnalyticsGroup]: One entry per non-empty group
+        """
+        result = self._snapshot.columns.aggregate(group_by, metrics)
+        reps = self._data.reps
+
+        groups = []
+        for i, group in enumerate(result["group"]):
+            entry = {name: values[i].item() for name, values in result.items() if name != "group"}
+            if group_by == "rep":
+                rep = reps[group]
+                entry.update(group=rep.name, rep_id=rep.id)
+            else:
+                entry["group"] = group
+            groups.append(AnalyticsGroup(**entry))
+        return groups
+
+
+@lru_cache(maxsize=1)
+def get_sales_data_store() -> SalesDataStore:
+    """
+    Get the process-wide sales data store
+
+    Returns:
+        SalesDataStore: Shared data store
+    """
+    settings = get_env_settings()
+    if settings.SALES_DATA_SNAPSHOT_FILE:
+        return SalesDataStore(settings.SALES_DATA_SNAPSHOT_FILE, loader=SalesDataSnapshot.open)
+    if settings.SALES_DATA_BACKEND == "sqlite":
+        # The data file is re-imported when it changes, and the snapshot (used by the AI
+        # service) read back from the database, so the chatbot and the data API agree
+        return SalesDataStore(settings.SALES_DATA_FILE, loader=partial(_load_from_database, settings.SALES_DATA_DATABASE))
+    return SalesDataStore(settings.SALES_DATA_FILE)
+
+
+def _load_from_database(database_path: str, data_file_path: Path) -> SalesDataSnapshot:
+    sync_database(data_file_path, database_path)
+    return SalesDataSnapshot.from_database(database_path)
+
+
+def get_sales_data_snapshot() -> SalesDataSnapshot:
+    """
+    Get the current process-wide sales data snapshot, loading it on first use
+
+    Returns:
+        SalesDataSnapshot: Shared data snapshot
+    """
+    return get_sales_data_store().snapshot
+
+
+@lru_cache(maxsize=1)
+def get_sqlite_sales_rep_service() -> SQLiteSalesRepService:
+    """
+    Get the process-wide SQLite-backed service, importing the data file first if the
+    database is missing or holds another version of it
+
+    Returns:
+        SQLiteSalesRepService: Shared service
+    """
+    settings = get_env_settings()
+    with stage("data_load"):
+        sync_database(settings.SALES_DATA_FILE, settings.SALES_DATA_DATABASE)
+    return SQLiteSalesRepService(settings.SALES_DATA_DATABASE)
+
+
+def get_sales_rep_service() -> Union[SalesRepService, SQLiteSalesRepService]:
     """
-    Get an instance of the SalesRepService
+    Get the sales rep service of the configured storage backend: bound to the current
+    in-memory snapshot, or to the SQLite database
 
     Returns:
-        SalesRepService: Instance of the service
+        Union[SalesRepService, SQLiteSalesRepService]: Instance of the service
     """
-    return SalesRepService(Path(__file__).parent / "mock/dummyData.json")
+    if get_env_settings().SALES_DATA_BACKEND == "sqlite":
+        return get_sqlite_sales_rep_service()
+    return SalesRepService(get_sales_data_snapshot())
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+from .schemas import SalesRep
+from .compact import CompactSalesData
+from .jsonstream import iter_sales_reps
+from .database import iter_database_reps
+from .index import SalesRepIndex
+from .columnar import DealColumns
+from .stats import RepStatsTable
+from .responses import SnapshotResponseCache
+from .mapped import DocumentVectors, write_array_file, open_array_file, section, prefixed
+
+
+class SalesDataSnapshot:
+    """
+    Immutable view of one version of the sales data file, with its lookup indexes.
+
+    A snapshot is shared by every request and router in the process, so neither the
+    snapshot nor the models it holds may be modified after loading.
+
+    A snapshot is loaded from the JSON data file (`load`), read from the SQLite database it
+    was imported into (`from_database`), or mapped from a snapshot file written by `save`
+    (`open`), in which case its arrays are shared with every other process mapping the same
+    file.
+    """
+
+    __slots__ = ("data", "index", "columns", "stats", "vectors", "responses", "source_path", "version")
+
+    def __init__(
+        self,
+        data: CompactSalesData,
+        source_path: Union[str, Path],
+        version: str,
+        arrays: Optional[dict] = None,
+        vectors: Optional[DocumentVectors] = None,
+    ):
+        """
+        Wrap loaded data and build its indexes
+
+        Args:
+            data: Parsed sales data in its compact form
+            source_path: Path of the JSON file the data was loaded from
+            version: Content hash of the JSON file the data was loaded from
+            arrays: Columns, index and stats arrays of a snapshot file, instead of building them
+            vectors: Embedding matrix of the rep documents, if the snapshot file has one
+        """
+        arrays = arrays or {}
+        self.data = data
+        self.columns = DealColumns(data, section(arrays, "columns") or None)
+        self.index = SalesRepIndex(data, self.columns, section(arrays, "index") or None)
+        self.stats = RepStatsTable(data, self.columns, section(arrays, "stats") or None)
+        self.vectors = vectors
+        self.responses = SnapshotResponseCache()
+        self.source_path = Path(source_path)
+        self.version = version
+
+    @classmethod
+    def load(cls, data_file_path: Union[str, Path]) -> "SalesDataSnapshot":
+        """
+        Stream a JSON data file into the compact representation, validating one rep at a
+        time, so neither the raw JSON nor a full Pydantic object graph is ever held in memory
+
+        Args:
+            data_file_path: Path to the JSON data file
+
+        Returns:
+            SalesDataSnapshot: Snapshot of the file's contents
+        """
+        hasher = hashlib.sha256()
+        try:
+            with open(data_file_path, 'rb') as file:
+                data = CompactSalesData.from_reps(SalesRep.model_validate(rep) for rep in iter_sales_reps(file, hasher))
+        except FileNotFoundError:
+            raise Exception(f"Data file not found: {data_file_path}")
+        except json.JSONDecodeError:
+            raise Exception(f"Invalid JSON in data file: {data_file_path}")
+        except Exception as e:
+            raise Exception(f"Error loading data: {str(e)}")
+
+        return cls(data, data_file_path, hasher.hexdigest())
+
+    @classmethod
+    def from_database(cls, database_path: Union[str, Path]) -> "SalesDataSnapshot":
+        """
+        Read the data imported into a SQLite database by `import_sales_data`, a batch of
+        reps at a time, so the snapshot has exactly the contents the SQLite backend serves
+
+        Args:
+            database_path: Path of the SQLite database
+
+        Returns:
+            SalesDataSnapshot: Snapshot of the imported data file
+        """
+        try:
+            connection = sqlite3.connect(f"{Path(database_path).resolve().as_uri()}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            raise Exception(f"Error opening sales database {database_path}: {str(e)}")
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+            data = CompactSalesData.from_reps(iter_database_reps(connection))
+        except sqlite3.Error as e:
+            raise Exception(f"Error reading sales database {database_path}: {str(e)}")
+        finally:
+            connection.close()
+
+        return cls(data, meta["source_path"], meta["version"])
+
+    @classmethod
+    def open(cls, snapshot_file_path: Union[str, Path]) -> "SalesDataSnapshot":
+        """
+        Map a snapshot file written by `save`. Nothing is parsed or computed: the data,
+        columns, index, stats and document vectors are views of the shared mapping.
+
+        Args:
+            snapshot_file_path: Path to the snapshot file
+
+        Returns:
+            SalesDataSnapshot: Snapshot of the file's contents
+        """
+        try:
+            arrays, meta = open_array_file(snapshot_file_path)
+        except FileNotFoundError:
+            raise Exception(f"Snapshot file not found: {snapshot_file_path}")
+        except Exception as e:
+            raise Exception(f"Error opening snapshot file: {str(e)}")
+
+        return cls(
+            CompactSalesData(section(arrays, "data")),
+            meta["source_path"],
+            meta["version"],
+            arrays=arrays,
+            vectors=DocumentVectors.from_arrays(section(arrays, "vectors"), meta.get("vectors") or {}),
+        )
+
+    def save(self, snapshot_file_path: Union[str, Path], vectors: Optional[DocumentVectors] = None) -> Path:
+        """
+        Write the snapshot, with its precomputed columns, index and stats, to a snapshot
+        file for `open`
+
+        Args:
+            snapshot_file_path: Output file, replaced atomically
+            vectors: Embedding matrix of the rep documents to include (defaults to the
+                snapshot's own)
+
+        Returns:
+            Path: The written file
+        """
+        vectors = vectors if vectors is not None else self.vectors
+        arrays = {
+            **prefixed(self.data.arrays(), "data"),
+            **prefixed(self.columns.arrays(), "columns"),
+            **prefixed(self.index.arrays(), "index"),
+            **prefixed(self.stats.arrays(), "stats"),
+        }
+        meta = {"source_path": str(self.source_path), "version": self.version}
+        if vectors is not None:
+            arrays.update(prefixed(vectors.arrays(), "vectors"))
+            meta["vectors"] = vectors.meta
+        return write_array_file(snapshot_file_path, arrays, meta)
@@ -0,0 +1,143 @@
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .schemas import RepStats
+from .compact import CompactSalesData
+from .columnar import DealColumns, CLOSED_WON, CLOSED_LOST, IN_PROGRESS
+
+LEADERBOARD_METRICS = ("won_value", "win_rate", "won_deals", "pipeline_value", "total_value")
+
+
+class RepStatsTable:
+    """
+    Per-rep deal statistics computed once per snapshot as NumPy columns indexed by rep
+    position. RepStats records are built from the columns when a lookup returns them.
+    """
+
+    ARRAY_FIELDS = (
+        "won_deals", "lost_deals", "in_progress_deals", "total_deals",
+        "won_value", "pipeline_value", "total_value", "win_rate", "client_count",
+    )
+
+    def __init__(self, data: CompactSalesData, columns: DealColumns, arrays: Optional[Mapping[str, np.ndarray]] = None):
+        """
+        Compute every rep's stats with one vectorized group-by per column
+
+        Args:
+            data: Loaded sales data
+            columns: Columnar deals of the same data
+            arrays: Stats columns saved by `arrays()` in a snapshot file, used instead of
+                computing them
+        """
+        self._data = data
+        if arrays is not None:
+            for name in self.ARRAY_FIELDS:
+                setattr(self, name, arrays[name])
+            return
+
+        self.won_deals = columns.rep_status_counts(CLOSED_WON)
+        self.lost_deals = columns.rep_status_counts(CLOSED_LOST)
+        self.in_progress_deals = columns.rep_status_counts(IN_PROGRESS)
+        self.total_deals = np.bincount(columns.rep_index, minlength=columns.rep_count)
+        self.won_value = columns.rep_status_values(CLOSED_WON)
+        self.pipeline_value = columns.rep_status_values(IN_PROGRESS)
+        self.total_value = np.rint(
+            np.bincount(columns.rep_index, weights=columns.value, minlength=columns.rep_count)
+        ).astype(np.int64)
+        closed = self.won_deals + self.lost_deals
+        self.win_rate = np.divide(
+            self.won_deals * 100.0, closed, out=np.zeros(len(data)), where=closed > 0)
+        self.client_count = np.diff(data.rep_client_offsets)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get the stats columns, for saving them to a snapshot file
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays by name
+        """
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def record(self, position: int) -> RepStats:
+        """
+        Build the stats record of the rep at a data position
+
+        Args:
+            position: Data position of the rep
+
+        Returns:
+            RepStats: The rep's stats
+        """
+        data = self._data
+        return RepStats.model_construct(
+            rep_id=int(data.rep_id[position]),
+            rep_name=data.names[data.rep_name[position]],
+            region=data.regions[data.rep_region[position]],
+            won_deals=int(self.won_deals[position]),
+            lost_deals=int(self.lost_deals[position]),
+            in_progress_deals=int(self.in_progress_deals[position]),
+            total_deals=int(self.total_deals[position]),
+            won_value=int(self.won_value[position]),
+            pipeline_value=int(self.pipeline_value[position]),
+            total_value=int(self.total_value[position]),
+            win_rate=float(self.win_rate[position]),
+            client_count=int(self.client_count[position]),
+        )
+
+    @property
+    def records(self) -> List[RepStats]:
+        """
+        Build the stats records of every rep
+
+        Returns:
+            List[RepStats]: Stats in data order
+        """
+        return [self.record(position) for position in range(len(self._data))]
+
+    def get(self, rep_id: int) -> Optional[RepStats]:
+        """
+        Get the stats of a rep
+
+        Args:
+            rep_id: ID of the sales representative
+
+        Returns:
+            Optional[RepStats]: The rep's stats or None if not found
+        """
+        position = self._data.position_of(rep_id)
+        return self.record(position) if position is not None else None
+
+    def top(self, metric: str, k: int, positions: Optional[Sequence[int]] = None) -> List[RepStats]:
+        """
+        Get the k reps ranking highest on a metric, using partial selection instead of a full sort
+
+        Args:
+            metric: One of LEADERBOARD_METRICS
+            k: Number of reps to return
+            positions: Rep positions to rank (all reps if omitted)
+
+        Returns:
+            List[RepStats]: Up to k stats records, best first (ties keep data order)
+        """
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unsupported leaderboard metric: {metric}")
+
+        candidates = np.arange(len(self._data)) if positions is None else np.asarray(positions, dtype=np.int64)
+        if k <= 0 or len(candidates) == 0:
+            return []
+
+        values = getattr(self, metric)[candidates]
+        if k < len(candidates):
+            selected = np.argpartition(-values, k - 1)[:k]
+            # Reps tied with the k-th value may fall on either side of the partition,
+            # so take every rep at or above the threshold before ordering.
+            selected = np.flatnonzero(values >= values[selected].min())
+        else:
+            selected = np.arange(len(candidates))
+
+        order = np.lexsort((candidates[selected], -values[selected]))[:k]
+        return [self.record(position) for position in candidates[selected][order].tolist()]
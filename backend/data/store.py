@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Union
+
+from watchfiles import awatch
+
+from backend.metrics.timing import stage
+from .snapshot import SalesDataSnapshot
+
+logger = logging.getLogger(__name__)
+
+SnapshotListener = Callable[[SalesDataSnapshot, SalesDataSnapshot], Awaitable[None]]
+SnapshotLoader = Callable[[Union[str, Path]], SalesDataSnapshot]
+
+
+class SalesDataStore:
+    """
+    Holds the current sales data snapshot of the process and swaps it when the data file changes.
+
+    Readers grab `store.snapshot` once and keep using that object, so a swap never changes
+    the data under an in-flight request.
+    """
+
+    def __init__(self, data_file_path: Union[str, Path], loader: SnapshotLoader = SalesDataSnapshot.load):
+        """
+        Initialize the store for a data file. The file is loaded on first access.
+
+        Args:
+            data_file_path: Path to the JSON data file, or to a snapshot file
+            loader: Reads the file into a snapshot (SalesDataSnapshot.open for snapshot files)
+        """
+        self.data_file_path = Path(data_file_path)
+        self.loader = loader
+        self._snapshot: Optional[SalesDataSnapshot] = None
+        self._listeners: List[SnapshotListener] = []
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def snapshot(self) -> SalesDataSnapshot:
+        """
+        Get the current snapshot
+
+        Returns:
+            SalesDataSnapshot: Current data snapshot
+        """
+        if self._snapshot is None:
+            self._snapshot = self._load()
+        return self._snapshot
+
+    def _load(self) -> SalesDataSnapshot:
+        with stage("data_load"):
+            return self.loader(self.data_file_path)
+
+    def add_listener(self, listener: SnapshotListener) -> None:
+        """
+        Register a coroutine called with (previous, current) after every snapshot swap
+
+        Args:
+            listener: Async callback notified of snapshot changes
+        """
+        self._listeners.append(listener)
+
+    async def reload(self) -> bool:
+        """
+        Re-read the data file off the event loop and swap in the new snapshot if it changed.
+        A file that cannot be loaded or validated never replaces the current snapshot.
+
+        Returns:
+            bool: True if a new snapshot was swapped in
+        """
+        async with self._reload_lock:
+            previous = self.snapshot
+            try:
+                snapshot = await asyncio.to_thread(self._load)
+            except Exception as e:
+                logger.warning("Keeping the current sales data, failed to reload %s: %s", self.data_file_path, e)
+                return False
+
+            if snapshot.version == previous.version:
+                return False
+
+            self._snapshot = snapshot
+            logger.info("Sales data reloaded from %s (version %s)", self.data_file_path, snapshot.version[:12])
+
+            for listener in self._listeners:
+                try:
+                    await listener(previous, snapshot)
+                except Exception:
+                    logger.exception("Sales data change listener %r failed", listener)
+            return True
+
+    async def watch(self, force_polling: bool = False) -> None:
+        """
+        Reload the snapshot whenever the data file changes, until cancelled.
+
+        The parent directory is watched (inotify, or mtime polling when `force_polling` is set)
+        so that editors and deploy tools that replace the file by renaming are noticed too.
+
+        Args:
+            force_polling: Poll file mtimes instead of relying on filesystem notifications
+        """
+        data_file_path = self.data_file_path.resolve()
+
+        def is_data_file(_, changed_path: str) -> bool:
+            return Path(changed_path).resolve() == data_file_path
+
+        async for _ in awatch(data_file_path.parent, watch_filter=is_data_file, force_polling=force_polling):
+            await self.reload()
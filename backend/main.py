@@ -1,26 +1,96 @@
-from fastapi import Depends, FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .data import router as data_router
 from .ai import router as ai_router
+from .metrics import router as metrics_router
+from .metrics.timing import MetricsMiddleware, set_enabled as set_stage_timing_enabled
+from .ai.service import startup_rag_chatbot_service, is_rag_chatbot_service_ready
+from .config import get_env_settings
+from .data.service import get_sales_data_store
 
-app = FastAPI()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the shared AI service in the background so the data routes are served immediately,
+    and watch the sales data file for changes.
+    """
+    settings = get_env_settings()
+    app.state.rag_chatbot_service = None
+    app.state.rag_chatbot_error = None
+    background_tasks = [asyncio.create_task(startup_rag_chatbot_service(app))]
+    if settings.SALES_DATA_WATCH:
+        store = get_sales_data_store()
+        background_tasks.append(asyncio.create_task(
+            store.watch(force_polling=settings.SALES_DATA_WATCH_FORCE_POLLING)))
+    yield
+    for task in background_tasks:
+        task.cancel()
 
-app.include_router(data_router.router, prefix="/api/sales-reps", tags=["sales-reps"])
-app.include_router(ai_router.router, prefix="/api/ai", tags=["ai"])
 
+root_router = APIRouter()
 
-@app.get("/", tags=["root"])
+
+@root_router.get("/")
 async def read_root():
     """
     Root endpoint.
     """
     return {"message": "Hello InterOpera!"}
+
+
+@root_router.get("/ready")
+async def read_ready(request: Request):
+    """
+    Readiness endpoint. Reports ready only once the AI embedding model and vector index are loaded.
+    """
+    app = request.app
+    if is_rag_chatbot_service_ready(app):
+        return {"status": "ready"}
+
+    content = {"status": "starting"}
+    if app.state.rag_chatbot_error:
+        content = {"status": "failed", "detail": app.state.rag_chatbot_error}
+    return JSONResponse(status_code=503, content=content)
+
+
+def create_app() -> FastAPI:
+    """
+    Build the app, with the metrics middleware and routes configured from the settings
+    as they are when it is called.
+    """
+    settings = get_env_settings()
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(data_router.router, prefix="/api/sales-reps", tags=["sales-reps"])
+    app.include_router(ai_router.router, prefix="/api/ai", tags=["ai"])
+    app.include_router(root_router, tags=["root"])
+
+    set_stage_timing_enabled(settings.METRICS_ENABLED)
+    if settings.METRICS_ENABLED:
+        # Added last so it wraps CORS too and times the whole request
+        app.add_middleware(
+            MetricsMiddleware,
+            server_timing=settings.METRICS_SERVER_TIMING,
+            slow_request_seconds=settings.METRICS_SLOW_REQUEST_SECONDS,
+            slow_request_sample_rate=settings.METRICS_SLOW_REQUEST_SAMPLE_RATE,
+        )
+        app.include_router(metrics_router.router, tags=["metrics"])
+
+    return app
+
+
+app = create_app()
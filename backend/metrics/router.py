@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from .registry import CONTENT_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Request and stage latency histograms and counters in the Prometheus text format.
+    """
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
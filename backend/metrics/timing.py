@@ -0,0 +1,243 @@
+"""
+Per-stage latency of requests: where a request spent its time (loading data, querying,
+building documents, embedding, vector search, waiting for and running the LLM,
+serializing), exposed as Prometheus histograms and as a Server-Timing response header.
+
+Code marks a stage with `with stage("embed"): ...`. Inside a request the duration is
+added to that request's timings, which the middleware turns into the Server-Timing
+header and observes once the response is sent, labelled with the route; outside a
+request (startup, data reloads) it is observed right away with an empty route.
+"""
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last byte of its response",
+    ("method", "route", "status"))
+REQUESTS = REGISTRY.counter("http_requests_total", "Requests handled", ("method", "route", "status"))
+STAGE_DURATION = REGISTRY.histogram(
+    "stage_duration_seconds", "Time spent in each stage of handling a request (empty route: outside a request)",
+    ("route", "stage"))
+SLOW_REQUESTS_LOGGED = REGISTRY.counter(
+    "slow_requests_logged_total", "Slow requests written to the slow request log", ("route",))
+
+# Route label of requests that matched no route, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTimings:
+    """The stages recorded while handling one request, in order."""
+
+    __slots__ = ("stages", "endpoint_finished")
+
+    def __init__(self):
+        # Appended from the event loop and from worker threads; list.append is atomic
+        self.stages: List[Tuple[str, float]] = []
+        self.endpoint_finished: Optional[float] = None
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per stage, summed over repeated stages, in first-seen order."""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def server_timing(self, total: float) -> str:
+        """Format the stages recorded so far, and the total, as a Server-Timing header value."""
+        metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.totals().items()]
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None)
+_enabled = True
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn stage timing on or off for the whole process."""
+    global _enabled
+    _enabled = enabled
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """
+    Record time spent in a stage: for the current request if there is one, directly in the
+    stage histogram otherwise
+    """
+    if not _enabled:
+        return
+    timings = _current_timings.get()
+    if timings is None:
+        STAGE_DURATION.observe(("", name), seconds)
+    else:
+        timings.stages.append((name, seconds))
+
+
+class _StageTimer:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_StageTimer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        record_stage(self.name, time.perf_counter() - self.started)
+
+
+def stage(name: str) -> _StageTimer:
+    """
+    Time the enclosed block as a stage, also when it raises
+
+    Args:
+        name: Stage name, e.g. "embed" or "vector_search"
+    """
+    return _StageTimer(name)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # include_router re-creates every route from the endpoint of the original one
+    if getattr(endpoint, "_stage_timed", False):
+        return endpoint
+
+    def finished(started: float) -> None:
+        now = time.perf_counter()
+        record_stage("endpoint", now - started)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.endpoint_finished = now
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finished(started)
+    else:
+        @wraps(endpoint)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                finished(started)
+    timed._stage_timed = True
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """
+    Route recording the endpoint function as the "endpoint" stage, and the response
+    validation and serialization FastAPI does once it returns as the "serialize" stage.
+    Use as `APIRouter(route_class=TimedRoute)`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timings = _current_timings.get()
+            if timings is not None and timings.endpoint_finished is not None:
+                record_stage("serialize", time.perf_counter() - timings.endpoint_finished)
+            return response
+
+        return timed_handler
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request: observes its duration and stages in the
+    histograms, adds the Server-Timing header and samples slow requests into the log.
+
+    The header is sent with the response start, so a streamed response only lists the
+    stages finished before its first byte; the histograms get all of them.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        server_timing: bool = True,
+        slow_request_seconds: Optional[float] = None,
+        slow_request_sample_rate: float = 0.0,
+    ):
+        """
+        Args:
+            app: The wrapped application
+            server_timing: Whether to add the Server-Timing header
+            slow_request_seconds: Requests taking at least this long are slow
+            slow_request_sample_rate: Fraction of slow requests logged, 0 to log none
+        """
+        self.app = app
+        self.server_timing = server_timing
+        self.slow_request_seconds = slow_request_seconds
+        self.slow_request_sample_rate = slow_request_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            self._observe(scope, timings, str(status), time.perf_counter() - started)
+
+    def _observe(self, scope: Scope, timings: RequestTimings, status: str, duration: float) -> None:
+        route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+        method = scope["method"]
+        REQUEST_DURATION.observe((method, route, status), duration)
+        REQUESTS.inc((method, route, status))
+        for name, seconds in timings.stages:
+            STAGE_DURATION.observe((route, name), seconds)
+
+        if (self.slow_request_seconds is not None and duration >= self.slow_request_seconds
+                and self.slow_request_sample_rate > 0 and random.random() < self.slow_request_sample_rate):
+            SLOW_REQUESTS_LOGGED.inc((route,))
+            record = {
+                "event": "slow_request",
+                "method": method,
+                "path": scope["path"],
+                "route": route,
+                "status": int(status),
+                "duration_ms": round(duration * 1000, 2),
+                "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in timings.totals().items()},
+            }
+            logger.warning(orjson.dumps(record).decode(), extra={"slow_request": record})
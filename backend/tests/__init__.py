@@ -0,0 +1,7 @@
+"""
+Tests of the data API and the AI service, run against small synthetic data sets on every
+storage backend, with the offline embedding backend and the fake chat model.
+
+Usage (from the repository root):
+    python -m pytest -q backend/tests
+"""
@@ -0,0 +1,73 @@
+import shutil
+import tempfile
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.benchmarks.fake_llm import FakeChatModel
+from backend.benchmarks.load import benchmark_app
+from backend.benchmarks.micro import STORAGE_BACKENDS
+from backend.benchmarks.synthetic import cached_sales_data
+
+REP_COUNT = 60
+DEAL_COUNT = 600
+
+AppFactory = Callable[..., AbstractContextManager]
+
+
+def pytest_configure(config: pytest.Config):
+    # chromadb reads Pydantic model fields the deprecated way on every collection call
+    config.addinivalue_line("filterwarnings", "ignore::DeprecationWarning:chromadb.*")
+
+
+def api_client(app: FastAPI) -> httpx.AsyncClient:
+    """HTTP client calling the app in process."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture(scope="session")
+def data_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return cached_sales_data(tmp_path_factory.mktemp("data"), REP_COUNT, DEAL_COUNT)
+
+
+@pytest.fixture
+def served_file(data_file: Path, tmp_path: Path) -> Path:
+    """A copy of the data file that a test may rewrite."""
+    return Path(shutil.copy(data_file, tmp_path / "sales.json"))
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def open_app(data_file: Path, tmp_path: Path) -> AppFactory:
+    """
+    Open the app on a storage backend, each time with its own database, snapshot file and
+    vector index: `with open_app("sqlite", llm=..., AI_CACHE_ENABLED="false") as app:`
+    """
+    def open_app(
+        backend: str = "memory", served: Optional[Path] = None, llm: Optional[FakeChatModel] = None, **settings: str,
+    ) -> AbstractContextManager:
+        work_dir = Path(tempfile.mkdtemp(prefix=f"{backend}-", dir=tmp_path))
+        return benchmark_app(served or data_file, work_dir, backend, llm or FakeChatModel(), settings)
+
+    return open_app
+
+
+@pytest.fixture(params=STORAGE_BACKENDS)
+def app(request: pytest.FixtureRequest, open_app: AppFactory) -> Iterator[FastAPI]:
+    """The app serving the synthetic data from each storage backend in turn."""
+    with open_app(request.param) as app:
+        yield app
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    async with api_client(app) as client:
+        yield client
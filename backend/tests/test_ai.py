@@ -0,0 +1,176 @@
+"""
+The AI service: answers cached for a snapshot are dropped when the data changes, and the
+intent router only answers plain lookups, leaving everything else to the LLM.
+"""
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+import pytest
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+
+from backend.ai.cache import AnswerCache
+from backend.ai.embeddings import HashingEmbeddings
+from backend.ai.intent import QueryIntentRouter
+from backend.ai.utils import SalesAnalyticsTools
+from backend.benchmarks.fake_llm import FakeChatModel
+from backend.benchmarks.synthetic import write_sales_data
+from backend.data.service import SalesRepService, get_sales_data_store
+from backend.data.snapshot import SalesDataSnapshot
+from .conftest import DEAL_COUNT, REP_COUNT, AppFactory, api_client
+
+QUESTION = "Who has the best win rate?"
+OTHER_QUESTION = "Which region has the most deals?"
+
+
+async def _ask(client: httpx.AsyncClient, message: str, rep_context_id: Optional[int] = None) -> dict:
+    response = await client.post("/api/ai/", json={"message": message, "rep_context_id": rep_context_id})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.anyio
+async def test_refresh_invalidates_cached_answers_and_responses(open_app: AppFactory, served_file: Path, monkeypatch):
+    with open_app("memory", served_file, FakeChatModel(latency_ms=200)) as app:
+        service = app.state.rag_chatbot_service
+        async with api_client(app) as client:
+            rep = (await client.get("/api/sales-reps/1")).json()
+            assert (await _ask(client, QUESTION))["path"] == "llm"
+            assert (await _ask(client, QUESTION))["path"] == "cache"
+
+            write_sales_data(served_file, REP_COUNT, DEAL_COUNT, seed=1)
+            store = get_sales_data_store()
+            assert await store.reload()
+            assert (await client.get("/api/sales-reps/1")).json() != rep
+
+            # Hold the refresh halfway through, and ask a question meanwhile: it answers from
+            # the previous state, whose version it must also cache the answer under
+            opened, release = threading.Event(), threading.Event()
+            open_vector_store = service._open_vector_store
+
+            def open_vector_store_when_released(*args):
+                opened.set()
+                release.wait(5)
+                return open_vector_store(*args)
+
+            monkeypatch.setattr(service, "_open_vector_store", open_vector_store_when_released)
+            previous = service.state
+            refreshing = asyncio.create_task(run_in_threadpool(service.refresh, SalesRepService(store.snapshot)))
+            assert await run_in_threadpool(opened.wait, 5)
+            in_flight = asyncio.create_task(_ask(client, OTHER_QUESTION))
+            await asyncio.sleep(0.05)
+            assert service.state is previous
+            release.set()
+            await refreshing
+            assert (await in_flight)["path"] == "llm"
+
+            assert service.snapshot_version == store.snapshot.version != previous.version
+            # Neither the answer cached before the refresh nor the one computed on the previous
+            # snapshot during it is served for the new data
+            assert (await _ask(client, QUESTION))["path"] == "llm"
+            assert (await _ask(client, OTHER_QUESTION))["path"] == "llm"
+            assert (await _ask(client, QUESTION))["path"] == "cache"
+
+
+def test_refresh_syncs_a_new_vector_collection(open_app: AppFactory, served_file: Path, monkeypatch):
+    with open_app("memory", served_file) as app:
+        service = app.state.rag_chatbot_service
+        first = service.state
+        indexed = first.vector_store.get(include=["metadatas"])
+
+        write_sales_data(served_file, REP_COUNT, DEAL_COUNT, seed=1)
+        service.refresh(SalesRepService(SalesDataSnapshot.load(served_file)))
+        second = service.state
+        assert second.vector_collection != first.vector_collection
+        # Requests still on the first state search the index it was published with
+        assert first.vector_store.get(include=["metadatas"]) == indexed
+        assert set(second.vector_store.get()["ids"]) == {document.id for document in second.documents}
+
+        # Only the renamed rep's documents are embedded, the others are copied
+        data = json.loads(served_file.read_text())
+        data["salesReps"][0]["name"] = "Renamed Rep"
+        served_file.write_text(json.dumps(data))
+        embedded = []
+        embed_documents = service.embeddings.embed_documents
+        monkeypatch.setattr(service.embeddings, "embed_documents", lambda texts: embedded.extend(texts) or embed_documents(texts))
+        service.refresh(SalesRepService(SalesDataSnapshot.load(served_file)))
+        third = service.state
+        assert embedded and all("Renamed Rep" in text for text in embedded)
+        assert set(third.vector_store.get()["ids"]) == {document.id for document in third.documents}
+        assert set(service._vector_collections()) == {second.vector_collection, third.vector_collection}
+
+
+@pytest.mark.anyio
+async def test_answer_cache_clear_waits_for_a_lookup_on_another_thread():
+    cache = AnswerCache(HashingEmbeddings(256), max_entries=8, ttl=60, semantic_threshold=0.5)
+    await cache.put("How is Rep 3 doing?", None, "v1", {"output": "fine"})
+    await cache.put("How is Rep 4 doing?", None, "v1", {"output": "fine"})
+    clearing = threading.Thread(target=cache.clear)
+
+    class ClearedWhileIterated(TTLCache):
+        def __iter__(self):
+            # The refresh clears the cache from its worker thread halfway through the scan
+            for key in super().__iter__():
+                if clearing.ident is None:
+                    clearing.start()
+                    clearing.join(0.2)
+                yield key
+
+    semantic = ClearedWhileIterated(maxsize=8, ttl=60)
+    semantic.update(cache._semantic)
+    cache._semantic = semantic
+    assert await cache.get("How is Rep 3 doing today?", None, "v1") == {"output": "fine"}
+    clearing.join()
+    assert cache.stats()["semantic_entries"] == 0
+
+
+@pytest.fixture(scope="module")
+def router(data_file: Path) -> QueryIntentRouter:
+    snapshot = SalesDataSnapshot.load(data_file)
+    return QueryIntentRouter(SalesAnalyticsTools(snapshot.data, snapshot.stats))
+
+
+@pytest.mark.parametrize("question, rep_context_id, tool, rep_ids", [
+    ("How is Rep 3 doing?", None, "get_rep_performance", [3]),
+    ("what's the win rate of rep 30", None, "get_rep_performance", [30]),
+    ("Compare Rep 3 and Rep 30", None, "compare_reps", [3, 30]),
+    ("rep 12 vs rep 1", None, "compare_reps", [12, 1]),
+    ("How many deals has Rep 12 won?", None, "count_deals_by_status", [12]),
+    ("How many in progress deals does rep 7 have", None, "count_deals_by_status", [7]),
+    ("How are they performing?", 5, "get_rep_performance", [5]),
+    ("Compare with Rep 2", 1, "compare_reps", [1, 2]),
+])
+def test_router_answers_lookups(router: QueryIntentRouter, question: str, rep_context_id: Optional[int], tool: str, rep_ids: List[int]):
+    match = router.route(question, rep_context_id)
+    assert match is not None
+    assert (match.tool, match.rep_ids) == (tool, rep_ids)
+
+
+@pytest.mark.parametrize("question, rep_context_id", [
+    ("Why is Rep 3 losing so many deals?", None),
+    ("How come Rep 3 has a low win rate?", None),
+    ("Explain Rep 3's performance", None),
+    ("What is the reason Rep 3 is performing worse than Rep 4?", None),
+    ("How should Rep 3 improve their win rate?", None),
+    ("What do you recommend for Rep 7's open deals?", None),
+    ("What if Rep 3 compared their pipeline to Rep 4?", None),
+    ("Should they focus on closing?", 5),
+    ("Who has the best win rate?", None),
+    ("How is Rep 300 doing?", None),
+    ("How are Rep 3 and Rep 4 doing?", None),
+    ("Compare Rep 3, Rep 4 and Rep 5", None),
+    ("How many deals has Rep 3 closed?", None),
+    ("Tell me about Rep 3", None),
+])
+def test_router_leaves_other_questions_to_the_llm(router: QueryIntentRouter, question: str, rep_context_id: Optional[int]):
+    assert router.route(question, rep_context_id) is None
+
+
+@pytest.mark.anyio
+async def test_open_ended_questions_reach_the_llm(client: httpx.AsyncClient):
+    assert (await _ask(client, "How is Rep 3 doing?"))["path"] == "tool"
+    assert (await _ask(client, "Why is Rep 3 doing badly?"))["path"] == "llm"
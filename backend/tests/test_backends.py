@@ -0,0 +1,60 @@
+"""
+Every storage backend serves the same responses for the same data file.
+"""
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.benchmarks.micro import STORAGE_BACKENDS
+from backend.benchmarks.synthetic import REGIONS, SKILLS, STATUSES
+from backend.data.schemas import AnalyticsGroupBy, LeaderboardMetric
+from .conftest import AppFactory, api_client
+
+pytestmark = pytest.mark.anyio
+
+PATHS = [
+    "/api/sales-reps/",
+    "/api/sales-reps/?limit=7",
+    "/api/sales-reps/?limit=5&fields=id,name,region",
+    "/api/sales-reps/stats",
+    "/api/sales-reps/1",
+    "/api/sales-reps/60",
+    "/api/sales-reps/61",
+    "/api/sales-reps/7/stats",
+    "/api/sales-reps/7/deals?limit=3",
+    "/api/sales-reps/7/clients?limit=2",
+    "/api/sales-reps/61/deals",
+    *[f"/api/sales-reps/region/{region}" for region in REGIONS],
+    "/api/sales-reps/region/north%20AMERICA",
+    "/api/sales-reps/region/America",
+    "/api/sales-reps/region/Antarctica",
+    *[f"/api/sales-reps/skill/{skill}" for skill in SKILLS],
+    *[f"/api/sales-reps/deals/status/{status}" for status in STATUSES],
+    "/api/sales-reps/deals/status/closed%20won",
+    *[f"/api/sales-reps/leaderboard/{metric.value}?k=5" for metric in LeaderboardMetric],
+    "/api/sales-reps/leaderboard/won_value?k=3&region=Europe",
+    *[f"/api/sales-reps/analytics?group_by={group_by.value}" for group_by in AnalyticsGroupBy],
+]
+
+
+async def _responses(app) -> Dict[str, Any]:
+    async with api_client(app) as client:
+        responses = {}
+        for path in PATHS:
+            response = await client.get(path)
+            responses[path] = (response.status_code, response.json())
+        return responses
+
+
+async def test_backends_serve_the_same_responses(open_app: AppFactory):
+    responses: List[Dict[str, Any]] = []
+    for backend in STORAGE_BACKENDS:
+        with open_app(backend) as app:
+            responses.append(await _responses(app))
+
+    reference = responses[0]
+    assert reference["/api/sales-reps/1"][0] == 200
+    assert reference["/api/sales-reps/61"][0] == 404
+    for backend, served in zip(STORAGE_BACKENDS[1:], responses[1:]):
+        for path in PATHS:
+            assert served[path] == reference[path], f"{backend} differs from {STORAGE_BACKENDS[0]} on {path}"
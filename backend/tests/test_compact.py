@@ -0,0 +1,45 @@
+"""
+Compact sales data: the columnar arrays give back the reps they were built from.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.data.compact import CompactSalesData, RepRecord
+from backend.data.schemas import SalesData
+
+
+@pytest.fixture(scope="module")
+def sales_data(data_file: Path) -> SalesData:
+    return SalesData.model_validate(json.loads(data_file.read_text()))
+
+
+@pytest.fixture(scope="module")
+def data(sales_data: SalesData) -> CompactSalesData:
+    return CompactSalesData.from_reps(sales_data.salesReps)
+
+
+def test_rep_records_iterate_every_rep(sales_data: SalesData, data: CompactSalesData):
+    records = list(data.reps)
+    assert len(records) == len(data.reps) == len(sales_data.salesReps)
+    for record, rep in zip(records, sales_data.salesReps):
+        assert (record.id, record.name, record.role, record.region, list(record.skills)) == (
+            rep.id, rep.name, rep.role, rep.region, rep.skills)
+        assert data.deals(range(record.deal_start, record.deal_end)) == rep.deals
+        assert data.clients(range(record.client_start, record.client_end)) == rep.clients
+    assert records[3] in data.reps
+    assert data.reps.index(records[3]) == 3
+    assert RepRecord(-1, "Nobody", "", "", (), 0, 0, 0, 0) not in data.reps
+
+
+def test_rep_records_index_like_a_sequence(data: CompactSalesData):
+    assert data.reps[-1] == data.reps[len(data.reps) - 1]
+    for position in (len(data.reps), -len(data.reps) - 1):
+        with pytest.raises(IndexError):
+            data.reps[position]
+
+
+def test_rep_models_round_trip(sales_data: SalesData, data: CompactSalesData):
+    assert data.to_model() == sales_data
+    assert data.rep_models([2, 0]) == [sales_data.salesReps[2], sales_data.salesReps[0]]
@@ -0,0 +1,76 @@
+"""
+The SQLite backend: the database follows the data file, and the AI service reads the
+same import as the data API.
+"""
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.concurrency import run_in_threadpool
+
+from backend.benchmarks.synthetic import write_sales_data
+from backend.data.database import SQLiteSalesRepService, import_sales_data, read_meta, sync_database
+from backend.data.service import SalesRepService, get_sales_data_store, get_sqlite_sales_rep_service
+from backend.data.snapshot import SalesDataSnapshot
+from .conftest import DEAL_COUNT, REP_COUNT, AppFactory, api_client
+
+
+def test_snapshot_from_database_matches_the_data_file(data_file: Path, tmp_path: Path):
+    database = tmp_path / "sales.db"
+    version = import_sales_data(data_file, database)
+    from_file = SalesDataSnapshot.load(data_file)
+    from_database = SalesDataSnapshot.from_database(database)
+    assert from_database.version == from_file.version == version
+    assert from_database.data.to_model() == from_file.data.to_model()
+    assert from_database.stats.records == from_file.stats.records
+
+
+def test_region_lookups_search_the_region_index(data_file: Path, tmp_path: Path, monkeypatch):
+    database = tmp_path / "sales.db"
+    import_sales_data(data_file, database)
+    service = SQLiteSalesRepService(database)
+    plans = []
+    query = service._query
+
+    def explain(sql: str, params=()):
+        plans.extend(detail for *_, detail in query(f"EXPLAIN QUERY PLAN {sql}", params))
+        return query(sql, params)
+
+    monkeypatch.setattr(service, "_query", explain)
+    assert service.get_sales_reps_by_region("america")
+    assert any(plan.startswith("SEARCH reps USING COVERING INDEX reps_region_key") for plan in plans)
+
+
+def test_sync_imports_only_changed_files(served_file: Path, tmp_path: Path):
+    database = tmp_path / "sales.db"
+    version = sync_database(served_file, database)
+    imported = os.stat(database).st_ino
+
+    assert sync_database(served_file, database) == version
+    # Touched but unchanged: hashed, not re-imported
+    os.utime(served_file, ns=(0, 0))
+    assert sync_database(served_file, database) == version
+    assert os.stat(database).st_ino == imported
+
+    write_sales_data(served_file, REP_COUNT, DEAL_COUNT, seed=1)
+    assert sync_database(served_file, database) != version
+    assert read_meta(database)["version"] == SalesDataSnapshot.load(served_file).version
+
+
+@pytest.mark.anyio
+async def test_data_file_changes_reach_the_database_and_the_ai_service(open_app: AppFactory, served_file: Path):
+    with open_app("sqlite", served_file) as app:
+        service = app.state.rag_chatbot_service
+        assert service.snapshot_version == get_sqlite_sales_rep_service().version
+        async with api_client(app) as client:
+            rep = (await client.get("/api/sales-reps/1")).json()
+
+            write_sales_data(served_file, REP_COUNT, DEAL_COUNT, seed=1)
+            store = get_sales_data_store()
+            assert await store.reload()
+            await run_in_threadpool(service.refresh, SalesRepService(store.snapshot))
+
+            changed = (await client.get("/api/sales-reps/1")).json()
+            assert changed != rep
+            assert changed == store.snapshot.data.rep_models([0])[0].model_dump()
+            assert service.snapshot_version == get_sqlite_sales_rep_service().version == store.snapshot.version
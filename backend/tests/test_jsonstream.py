@@ -0,0 +1,74 @@
+"""
+Streaming the reps of a data file: the same reps and hash as reading it whole, and the
+same rejection of malformed JSON, whatever the chunk boundaries.
+"""
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.data import jsonstream
+from backend.data.jsonstream import iter_sales_reps
+
+REP = '{"id": 1, "name": "Rep 1"}'
+OTHER_REP = '{"id": 2, "name": "Rep 2"}'
+
+
+@pytest.fixture(params=[1, 7, jsonstream.READ_CHUNK_SIZE])
+def chunk_size(request: pytest.FixtureRequest, monkeypatch) -> int:
+    monkeypatch.setattr(jsonstream, "READ_CHUNK_SIZE", request.param)
+    return request.param
+
+
+def _reps(text: str) -> list:
+    return list(iter_sales_reps(io.BytesIO(text.encode())))
+
+
+@pytest.mark.parametrize("text", [
+    f'{{"salesReps": [{REP}, {OTHER_REP}]}}',
+    f' \n{{ "salesReps" : [ {REP} ,\n{OTHER_REP} ] }} \n',
+    f'{{"version": 12345, "salesReps": [{REP}, {OTHER_REP}], "notes": {{"salesReps": []}}}}',
+    f'{{"salesReps": [], "more": [1, 2]}}',
+])
+def test_reps_match_the_json_module(chunk_size: int, text: str):
+    assert _reps(text) == json.loads(text)["salesReps"]
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    f'{{"salesReps": [{REP} {OTHER_REP}]}}',
+    f'{{"salesReps": [{REP},, {OTHER_REP}]}}',
+    f'{{"salesReps": [, {REP}]}}',
+    f'{{"salesReps": [{REP},]}}',
+    f'{{"salesReps": [{REP}]',
+    f'{{"salesReps": [{REP}',
+    f'{{"salesReps": [{REP}, {{"id": 2',
+    f'{{"salesReps": [{REP}]}}]',
+    f'{{"salesReps": [{REP}]}} {{}}',
+    f'{{"salesReps": [{REP}] "more": 1}}',
+    f'{{"salesReps": [{REP}],}}',
+    f'{{salesReps: [{REP}]}}',
+    f'garbage {{"salesReps": [{REP}]}}',
+])
+def test_malformed_json_is_rejected(chunk_size: int, text: str):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError):
+        _reps(text)
+
+
+@pytest.mark.parametrize("text", ["{}", '{"reps": []}', '{"salesReps": {}}', "[]", '"salesReps"'])
+def test_object_without_reps_is_rejected(text: str):
+    with pytest.raises(ValueError, match="No salesReps array"):
+        _reps(text)
+
+
+def test_hash_covers_the_whole_file(chunk_size: int, data_file: Path):
+    hasher = hashlib.sha256()
+    with open(data_file, "rb") as file:
+        reps = list(iter_sales_reps(file, hasher))
+    content = data_file.read_bytes()
+    assert reps == json.loads(content)["salesReps"]
+    assert hasher.hexdigest() == hashlib.sha256(content).hexdigest()
@@ -0,0 +1,18 @@
+"""
+The metrics middleware and endpoint follow the settings the app is built with.
+"""
+import pytest
+
+from .conftest import AppFactory, api_client
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("enabled", [True, False])
+async def test_metrics_follow_the_settings(open_app: AppFactory, enabled: bool):
+    with open_app(METRICS_ENABLED=str(enabled).lower()) as app:
+        async with api_client(app) as client:
+            response = await client.get("/api/sales-reps/1")
+            assert response.status_code == 200
+            assert ("server-timing" in response.headers) == enabled
+            assert (await client.get("/metrics")).status_code == (200 if enabled else 404)
+            assert (await client.get("/ready")).json() == {"status": "ready"}
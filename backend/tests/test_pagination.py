@@ -0,0 +1,86 @@
+"""
+Cursor encoding, and walking every paginated endpoint with the cursors it returns.
+"""
+import base64
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from backend.data.pagination import decode_cursor, encode_cursor
+from .conftest import REP_COUNT
+
+INVALID_CURSORS = [
+    "",
+    "!!!",
+    base64.urlsafe_b64encode(b"-1").decode(),
+    base64.urlsafe_b64encode(b"-3").decode().rstrip("="),
+    base64.urlsafe_b64encode(b"1.5").decode(),
+    base64.urlsafe_b64encode(b"abc").decode(),
+    base64.urlsafe_b64encode(b"1:").decode(),
+    base64.urlsafe_b64encode(b"1:x").decode(),
+    base64.urlsafe_b64encode(b" 1").decode(),
+    base64.urlsafe_b64encode("١".encode()).decode(),
+]
+
+
+@pytest.mark.parametrize("position, key", [(0, None), (7, None), (0, 1), (49, 50), (3, -2), (10 ** 12, 10 ** 12)])
+def test_cursor_round_trip(position: int, key: Optional[int]):
+    cursor = encode_cursor(position, key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (position, key)
+
+
+@pytest.mark.parametrize("cursor", INVALID_CURSORS)
+def test_decode_rejects_invalid_cursor(cursor: str):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_encode_rejects_negative_position():
+    with pytest.raises(ValueError):
+        encode_cursor(-1)
+
+
+async def _walk(client: httpx.AsyncClient, path: str, items_field: str, limit: int) -> List[dict]:
+    """Follow nextCursor from the first page to the last, checking every cursor on the way."""
+    items = []
+    cursor = None
+    while True:
+        params = {"limit": limit} if cursor is None else {"limit": limit, "cursor": cursor}
+        response = await client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page[items_field]) <= limit
+        items += page[items_field]
+        cursor = page.get("nextCursor")
+        if cursor is None:
+            return items
+        position, _ = decode_cursor(cursor)
+        assert position == len(items) - 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 7, REP_COUNT, 500])
+async def test_rep_pages_cover_every_rep_once(client: httpx.AsyncClient, limit: int):
+    reps = await _walk(client, "/api/sales-reps/", "salesReps", limit)
+    everything = (await client.get("/api/sales-reps/")).json()["salesReps"]
+    # Pages add each rep's stats to the fields of the full listing
+    assert all(rep.pop("stats") for rep in reps)
+    assert reps == everything
+
+
+@pytest.mark.anyio
+async def test_deal_and_client_pages_cover_the_rep(client: httpx.AsyncClient):
+    rep = (await client.get("/api/sales-reps/3")).json()
+    assert await _walk(client, "/api/sales-reps/3/deals", "deals", 4) == rep["deals"]
+    assert await _walk(client, "/api/sales-reps/3/clients", "clients", 1) == rep["clients"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/api/sales-reps/", "/api/sales-reps/3/deals", "/api/sales-reps/3/clients"])
+@pytest.mark.parametrize("cursor", INVALID_CURSORS[1:])
+async def test_invalid_cursor_is_a_bad_request(client: httpx.AsyncClient, path: str, cursor: str):
+    response = await client.get(path, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid cursor")
@@ -56,8 +56,10 @@ export default function AIChatRoom({ selectedRep }) {
         setInputValue('');
         setIsLoading(true);
 
+        const aiMessageId = Date.now() + 1;
+
         try {
-            const resp = await fetch('/api/ai', {
+            const resp = await fetch('/api/ai/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -70,16 +72,43 @@ export default function AIChatRoom({ selectedRep }) {
 
             if (!resp.ok) throw new Error(`Failed to fetch AI response ${resp.status}`);
 
-            const { answer } = await resp.json();
-
-            const aiMessage = {
-                id: Date.now() + 1,
-                sender: 'ai',
-                text: answer,
-                timestamp: new Date()
-            };
-
-            setMessages(prev => [...prev, aiMessage]);
+            // Server-Sent Events: append answer tokens to the AI message as they arrive
+            const reader = resp.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let started = false;
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+
+                for (const rawEvent of events) {
+                    const event = rawEvent.match(/^event: (.*)$/m)?.[1];
+                    const data = JSON.parse(rawEvent.match(/^data: (.*)$/m)?.[1] ?? 'null');
+
+                    if (event === 'error') throw new Error(data?.detail);
+                    if (event !== 'token') continue;
+
+                    if (!started) {
+                        started = true;
+                        setIsLoading(false);
+                        setMessages(prev => [...prev, {
+                            id: aiMessageId,
+                            sender: 'ai',
+                            text: data,
+                            timestamp: new Date()
+                        }]);
+                    } else {
+                        setMessages(prev => prev.map(msg =>
+                            msg.id === aiMessageId ? { ...msg, text: msg.text + data } : msg
+                        ));
+                    }
+                }
+            }
 
         } catch (err) {
             console.log('Error fetching AI response:', err);